@@ -5,12 +5,15 @@ Modern Compact UI
 
 import streamlit as st
 import asyncio
-import pandas as pd
-import plotly.graph_objects as go
+import hashlib
 from datetime import datetime
 from pathlib import Path
 
+import tracing
 from dominance import DominanceCalculator, DominanceResult
+from precompute import PeriodPrecomputer, compute_snapshot
+from ratelimit import PRIORITY_LOW
+from screener import DominanceScreener, ScreenerRow
 
 st.set_page_config(
     page_title="CEX Dominance",
@@ -19,8 +22,8 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# Compact Modern CSS
-st.markdown("""
+# Compact Modern CSS (전체 rerun 에서만 출력, fragment rerun 은 생략)
+CSS = """
 <style>
     @import url('https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;500;600;700&display=swap');
 
@@ -342,7 +345,7 @@ st.markdown("""
     .stMarkdown { margin-bottom: 0 !important; }
     div[data-testid="column"] { padding: 0 0.5rem !important; }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 
 @st.cache_resource
@@ -361,33 +364,77 @@ def load_config():
     }
 
 
+@st.cache_resource
+def init_tracing(_config):
+    """span 기록 설정 (프로세스당 1회, 매 rerun 마다 파일을 비우지 않도록)"""
+    tracing.configure(_config.get("tracing"))
+    return tracing.enabled()
+
+
 @st.cache_data(ttl=60)
 def fetch_all_data(_config, period: str = "24h"):
     """전체 마켓 + 주요 티커 데이터 조회"""
     async def _fetch():
-        calc = DominanceCalculator(_config)
+        calc = DominanceCalculator(_config, priority=PRIORITY_LOW)
         await calc.initialize()
+        # 전체 마켓 + 개별 티커 (같은 조회 결과로 합산)
+        data = await compute_snapshot(calc, period)
+        await calc.close()
+        return data
 
-        # 연결된 거래소 목록
-        connected = list(calc.exchanges.keys())
-
-        # 전체 마켓
-        total = await calc.calculate_total_market(["BTC/USDT", "ETH/USDT", "XRP/USDT", "SOL/USDT"], period)
+    return asyncio.run(_fetch())
 
-        # 개별 티커
-        btc = await calc.calculate("BTC/USDT", period)
-        eth = await calc.calculate("ETH/USDT", period)
 
+@st.cache_resource
+def get_precomputer(_config):
+    """기간별 결과 백그라운드 갱신 워커 (프로세스당 1개)"""
+    precompute_config = _config.get("precompute", {})
+    precomputer = PeriodPrecomputer(_config, cadence=precompute_config.get("cadence"))
+    precomputer.start(first="24h")
+    return precomputer
+
+
+def get_period_data(config: dict, period: str) -> dict:
+    """기간별 데이터: 백그라운드에서 미리 계산된 값, 아직 없으면 직접 조회"""
+    if config.get("precompute", {}).get("enabled", True):
+        precomputer = get_precomputer(config)
+        data = precomputer.get(period)
+        if data is not None:
+            return data
+        precomputer.request(period)
+    return fetch_all_data(config, period)
+
+
+def get_symbol_index(config: dict):
+    """상장 심볼 인덱스: 백그라운드 워커 계산기의 마켓 재사용 (없으면 직접 생성)
+
+    워커가 아직 마켓을 로드 중이면 기다리지 않고 None (검색은 자유 입력으로 동작).
+    """
+    if config.get("precompute", {}).get("enabled", True):
+        precomputer = get_precomputer(config)
+        if not precomputer.index_ready.is_set():
+            return None
+        if precomputer.symbol_index is not None:
+            return precomputer.symbol_index
+    return build_symbol_index(config)
+
+
+@st.cache_resource(ttl=3600)
+def build_symbol_index(_config):
+    """상장 심볼 인덱스 (마켓 정보 기준, 1시간 캐시)"""
+    async def _build():
+        calc = DominanceCalculator(_config, priority=PRIORITY_LOW)
+        await calc.initialize()
+        index = calc.build_symbol_index()
         await calc.close()
-        return {"total": total, "BTC": btc, "ETH": eth, "connected_exchanges": connected}
-
-    return asyncio.run(_fetch())
+        return index
+    return asyncio.run(_build())
 
 
 @st.cache_data(ttl=60)
 def fetch_ticker_data(_config, ticker: str, period: str = "24h"):
     async def _fetch():
-        calc = DominanceCalculator(_config)
+        calc = DominanceCalculator(_config, priority=PRIORITY_LOW)
         await calc.initialize()
         result = await calc.calculate(ticker, period)
         await calc.close()
@@ -395,6 +442,24 @@ def fetch_ticker_data(_config, ticker: str, period: str = "24h"):
     return asyncio.run(_fetch())
 
 
+@st.cache_data(ttl=60)
+def fetch_universe_data(_config):
+    """상장 자산 전체 24h 지배력 (거래소당 1회 일괄 조회)"""
+    async def _fetch():
+        calc = DominanceCalculator(_config, priority=PRIORITY_LOW)
+        await calc.initialize()
+        results = await calc.calculate_universe()
+        await calc.close()
+        return list(results.values())
+    return asyncio.run(_fetch())
+
+
+@st.cache_resource
+def get_screener(min_total_volume_usd: float):
+    """세션 공유 스크리너 (사이클 간 지배력 변화 추적)"""
+    return DominanceScreener(min_total_volume_usd)
+
+
 def format_volume(volume: float) -> str:
     if volume >= 1_000_000_000:
         return f"${volume / 1_000_000_000:.2f}B"
@@ -405,7 +470,34 @@ def format_volume(volume: float) -> str:
     return f"${volume:.0f}"
 
 
+def snapshot_key(result: DominanceResult) -> str:
+    """스냅샷 내용 해시 (거래량이 같으면 같은 키, 조회 시각은 제외)"""
+    content = (
+        result.ticker,
+        result.total_volume_usd,
+        result.korean_volume_usd,
+        result.global_volume_usd,
+        result.korean_dominance,
+        tuple((v.exchange, v.region, v.volume_usd) for v in result.exchanges),
+    )
+    return hashlib.blake2b(repr(content).encode(), digest_size=16).hexdigest()
+
+
+@st.cache_resource(max_entries=32)
+def donut_figure(key: str, _result: DominanceResult, height: int):
+    """내용 해시별 도넛 차트 (데이터가 같으면 figure 재사용)"""
+    return create_mini_donut(_result, height)
+
+
+@st.cache_resource(max_entries=32)
+def bar_figure(key: str, _result: DominanceResult, height: int):
+    """내용 해시별 막대 차트"""
+    return create_bar_comparison(_result, height)
+
+
 def create_mini_donut(result: DominanceResult, height: int = 250):
+    import plotly.graph_objects as go
+
     colors = ['#00d4ff', '#a855f7', '#ec4899', '#f59e0b', '#10b981']
     labels = [v.exchange.capitalize() for v in result.exchanges]
     values = [v.volume_usd for v in result.exchanges]
@@ -439,6 +531,8 @@ def create_mini_donut(result: DominanceResult, height: int = 250):
 
 
 def create_bar_comparison(result: DominanceResult, height: int = 280):
+    import plotly.graph_objects as go
+
     kr_pct = result.korean_volume_usd / result.total_volume_usd * 100 if result.total_volume_usd > 0 else 0
     gl_pct = result.global_volume_usd / result.total_volume_usd * 100 if result.total_volume_usd > 0 else 0
 
@@ -470,6 +564,13 @@ def create_bar_comparison(result: DominanceResult, height: int = 280):
 
 def render_ticker_card(result: DominanceResult, title: str):
     """티커 카드 렌더링"""
+    st.markdown(ticker_card_html(snapshot_key(result), result, title), unsafe_allow_html=True)
+
+
+@st.cache_data(max_entries=64)
+def ticker_card_html(key: str, _result: DominanceResult, title: str) -> str:
+    """내용 해시별 티커 카드 HTML"""
+    result = _result
     exchange_rows = []
     for i, v in enumerate(result.exchanges[:5], 1):
         share = v.volume_usd / result.total_volume_usd * 100 if result.total_volume_usd > 0 else 0
@@ -477,13 +578,110 @@ def render_ticker_card(result: DominanceResult, title: str):
         region_text = "KR" if v.region == "korean" else "GL"
         exchange_rows.append(f'<div class="exchange-mini-row"><span class="exchange-mini-rank">{i}</span><span class="exchange-mini-name">{v.exchange.capitalize()}</span><span class="exchange-mini-region {region_class}">{region_text}</span><span class="exchange-mini-volume">{format_volume(v.volume_usd)}</span><span class="exchange-mini-share">{share:.1f}%</span></div>')
 
-    html = f'''<div class="ticker-section"><div class="ticker-header"><span class="ticker-title">{title}</span><span class="ticker-dominance">{result.korean_dominance:.2f}%</span></div><div class="mini-stats"><div class="mini-stat"><div class="mini-stat-value" style="color: #00d4ff;">{format_volume(result.korean_volume_usd)}</div><div class="mini-stat-label">Korean</div></div><div class="mini-stat"><div class="mini-stat-value" style="color: #a855f7;">{format_volume(result.global_volume_usd)}</div><div class="mini-stat-label">Global</div></div><div class="mini-stat"><div class="mini-stat-value">{format_volume(result.total_volume_usd)}</div><div class="mini-stat-label">Total</div></div></div><div class="exchange-mini-list">{"".join(exchange_rows)}</div></div>'''
+    return f'''<div class="ticker-section"><div class="ticker-header"><span class="ticker-title">{title}</span><span class="ticker-dominance">{result.korean_dominance:.2f}%</span></div><div class="mini-stats"><div class="mini-stat"><div class="mini-stat-value" style="color: #00d4ff;">{format_volume(result.korean_volume_usd)}</div><div class="mini-stat-label">Korean</div></div><div class="mini-stat"><div class="mini-stat-value" style="color: #a855f7;">{format_volume(result.global_volume_usd)}</div><div class="mini-stat-label">Global</div></div><div class="mini-stat"><div class="mini-stat-value">{format_volume(result.total_volume_usd)}</div><div class="mini-stat-label">Total</div></div></div><div class="exchange-mini-list">{"".join(exchange_rows)}</div></div>'''
+
+
+@st.fragment
+def render_search(config: dict, period: str):
+    """티커 검색 카드 (입력/버튼은 이 fragment 만 다시 실행)"""
+    # Custom ticker search
+    st.markdown('<div class="ticker-section"><div class="ticker-header"><span class="ticker-title">🔍 Search Ticker</span></div>', unsafe_allow_html=True)
+
+    col_input, col_btn = st.columns([3, 1])
+    with col_input:
+        ticker_input = st.text_input("Search Ticker", value="SOL", placeholder="SOL, XRP...", label_visibility="collapsed", key="search")
+    with col_btn:
+        search = st.button("Go", width="stretch")
+
+    # 상장 심볼 인덱스로 자동완성/검증 (인덱스가 비면 자유 입력 허용)
+    index = get_symbol_index(config)
+    if index is None or len(index) == 0:
+        ticker = f"{ticker_input.upper()}/USDT" if "/" not in ticker_input else ticker_input.upper()
+        if index is None:
+            st.markdown('<p style="color:#666;font-size:0.7rem;margin:0.25rem 0;">Indexing listed symbols…</p>', unsafe_allow_html=True)
+    else:
+        ticker = index.normalize(ticker_input) if ticker_input else None
+        suggestions = index.complete(ticker_input, 6) if ticker_input else []
+        if suggestions:
+            chips = []
+            for base in suggestions:
+                venues = index.venues(base)
+                # 상장 거래소 이름 (지역 색상, 한국 거래소 먼저)
+                tags = "".join(
+                    f'<span style="color:{"#00d4ff" if region == "korean" else "#a855f7"};font-size:0.6rem;margin-left:0.25rem;">{exchange.capitalize()}</span>'
+                    for region in sorted(venues, key=lambda r: r != "korean")
+                    for exchange in sorted(venues[region])
+                )
+                chips.append(f'<span style="background:rgba(255,255,255,0.04);border-radius:6px;padding:0.15rem 0.4rem;margin-right:0.3rem;font-size:0.75rem;color:#fff;">{base}{tags}</span>')
+            st.markdown(f'<div style="margin:0.25rem 0;">{"".join(chips)}</div>', unsafe_allow_html=True)
+
+    if ticker_input and ticker is None:
+        st.markdown('<p style="color:#666;font-size:0.8rem;margin-top:1rem;">Not listed on any tracked exchange</p>', unsafe_allow_html=True)
+    elif ticker_input:
+        with tracing.span("fetch_ticker_data", ticker=ticker):
+            custom_result = fetch_ticker_data(config, ticker, period)
+        if custom_result and custom_result.total_volume_usd > 0:
+            st.markdown(search_card_html(snapshot_key(custom_result), custom_result, ticker), unsafe_allow_html=True)
+        else:
+            st.markdown('<p style="color:#666;font-size:0.8rem;margin-top:1rem;">No data found for this ticker</p>', unsafe_allow_html=True)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+@st.cache_data(max_entries=64)
+def search_card_html(key: str, _result: DominanceResult, ticker: str) -> str:
+    """내용 해시별 검색 결과 카드 HTML"""
+    custom_result = _result
+    kr_vol = custom_result.korean_volume_usd
+    kr_display = format_volume(kr_vol)
+    kr_pct = f"{custom_result.korean_dominance:.2f}%"
+
+    # Build exchange rows
+    ex_rows = []
+    for i, v in enumerate(custom_result.exchanges[:3], 1):
+        share = v.volume_usd / custom_result.total_volume_usd * 100 if custom_result.total_volume_usd > 0 else 0
+        region_class = "korean" if v.region == "korean" else "global"
+        ex_rows.append(f'<div class="exchange-mini-row"><span class="exchange-mini-rank">{i}</span><span class="exchange-mini-name">{v.exchange.capitalize()}</span><span class="exchange-mini-region {region_class}">{"KR" if v.region == "korean" else "GL"}</span><span class="exchange-mini-share">{share:.1f}%</span></div>')
+
+    return f'<div style="margin-top:0.5rem;"><div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:0.5rem;"><span style="color:#8b8b8b;font-size:0.8rem;">{ticker}</span><span class="ticker-dominance">{kr_pct}</span></div><div class="mini-stats"><div class="mini-stat"><div class="mini-stat-value" style="color:#00d4ff;">{kr_display}</div><div class="mini-stat-label">KR</div></div><div class="mini-stat"><div class="mini-stat-value" style="color:#a855f7;">{format_volume(custom_result.global_volume_usd)}</div><div class="mini-stat-label">GL</div></div></div>{"".join(ex_rows)}</div>'
+
+
+@st.fragment
+def render_screener(config: dict, screener_config: dict):
+    """상장 자산 전체 상위 N 테이블"""
+    st.markdown('<p class="chart-title" style="margin:1rem 0 0.5rem 0;">🚀 Top Movers (24h, All Listed)</p>', unsafe_allow_html=True)
 
-    st.markdown(html, unsafe_allow_html=True)
+    screener = get_screener(screener_config.get("min_total_volume_usd", 100_000))
+    screener.update_many(fetch_universe_data(config))
+
+    labels = {"change": "Rising", "dominance": "KR Dominance", "korean_volume": "KR Volume"}
+    metric = st.radio(
+        "Sort",
+        options=list(labels),
+        format_func=labels.get,
+        horizontal=True,
+        label_visibility="collapsed",
+        key="screener_metric",
+    )
+
+    rows: list[ScreenerRow] = screener.top(metric, screener_config.get("top_n", 10))
+    table_html = '<div style="background:rgba(255,255,255,0.02);border-radius:12px;padding:0.5rem 1rem;">'
+    for i, row in enumerate(rows, 1):
+        change_color = "#10b981" if row.change > 0 else "#ec4899" if row.change < 0 else "#666"
+        table_html += f'<div class="exchange-mini-row"><span class="exchange-mini-rank">{i}</span><span class="exchange-mini-name">{row.ticker.split("/")[0]}</span><span class="exchange-mini-volume">{format_volume(row.korean_volume_usd)}</span><span style="color:{change_color};font-size:0.75rem;width:4rem;text-align:right;">{row.change:+.1f}p</span><span class="exchange-mini-share">{row.korean_dominance:.1f}%</span></div>'
+    table_html += '</div>'
+    st.markdown(table_html, unsafe_allow_html=True)
 
 
 def main():
     config = load_config()
+    init_tracing(config)
+    with tracing.trace("app_run"):
+        render_page(config)
+
+
+def render_page(config: dict):
+    st.markdown(CSS, unsafe_allow_html=True)
 
     # Header with period selector
     header_col1, header_col2 = st.columns([4, 1])
@@ -509,8 +707,8 @@ def main():
         )
 
     # Fetch all data
-    with st.spinner(""):
-        data = fetch_all_data(config, period)
+    with st.spinner(""), tracing.span("fetch_all_data", period=period):
+        data = get_period_data(config, period)
 
     if not data.get("total"):
         st.error("Failed to fetch market data")
@@ -551,57 +749,31 @@ def main():
 
     with col1:
         if data.get("BTC"):
-            render_ticker_card(data["BTC"], "BTC/USDT")
+            with tracing.span("render_ticker_card", ticker="BTC/USDT"):
+                render_ticker_card(data["BTC"], "BTC/USDT")
 
     with col2:
         if data.get("ETH"):
-            render_ticker_card(data["ETH"], "ETH/USDT")
+            with tracing.span("render_ticker_card", ticker="ETH/USDT"):
+                render_ticker_card(data["ETH"], "ETH/USDT")
 
     with col3:
-        # Custom ticker search
-        st.markdown('<div class="ticker-section"><div class="ticker-header"><span class="ticker-title">🔍 Search Ticker</span></div>', unsafe_allow_html=True)
-
-        col_input, col_btn = st.columns([3, 1])
-        with col_input:
-            ticker_input = st.text_input("Search Ticker", value="SOL", placeholder="SOL, XRP...", label_visibility="collapsed", key="search")
-        with col_btn:
-            search = st.button("Go", width="stretch")
-
-        ticker = f"{ticker_input.upper()}/USDT" if "/" not in ticker_input else ticker_input.upper()
-
-        if ticker_input:
-            custom_result = fetch_ticker_data(config, ticker, period)
-            if custom_result and custom_result.total_volume_usd > 0:
-                kr_vol = custom_result.korean_volume_usd
-                kr_display = format_volume(kr_vol)
-                kr_pct = f"{custom_result.korean_dominance:.2f}%"
-
-                # Build exchange rows
-                ex_rows = []
-                for i, v in enumerate(custom_result.exchanges[:3], 1):
-                    share = v.volume_usd / custom_result.total_volume_usd * 100 if custom_result.total_volume_usd > 0 else 0
-                    region_class = "korean" if v.region == "korean" else "global"
-                    ex_rows.append(f'<div class="exchange-mini-row"><span class="exchange-mini-rank">{i}</span><span class="exchange-mini-name">{v.exchange.capitalize()}</span><span class="exchange-mini-region {region_class}">{"KR" if v.region == "korean" else "GL"}</span><span class="exchange-mini-share">{share:.1f}%</span></div>')
-
-                search_html = f'<div style="margin-top:0.5rem;"><div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:0.5rem;"><span style="color:#8b8b8b;font-size:0.8rem;">{ticker}</span><span class="ticker-dominance">{kr_pct}</span></div><div class="mini-stats"><div class="mini-stat"><div class="mini-stat-value" style="color:#00d4ff;">{kr_display}</div><div class="mini-stat-label">KR</div></div><div class="mini-stat"><div class="mini-stat-value" style="color:#a855f7;">{format_volume(custom_result.global_volume_usd)}</div><div class="mini-stat-label">GL</div></div></div>{"".join(ex_rows)}</div>'
-                st.markdown(search_html, unsafe_allow_html=True)
-            else:
-                st.markdown('<p style="color:#666;font-size:0.8rem;margin-top:1rem;">No data found for this ticker</p>', unsafe_allow_html=True)
-
-        st.markdown("</div>", unsafe_allow_html=True)
+        render_search(config, period)
 
     # Charts Row
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown('<p class="chart-title" style="margin:1rem 0 0.5rem 0;">📊 Total Market Distribution</p>', unsafe_allow_html=True)
-        fig = create_mini_donut(total, height=220)
-        st.plotly_chart(fig, width="stretch", config={'displayModeBar': False})
+        with tracing.span("render_chart", chart="donut"):
+            fig = donut_figure(snapshot_key(total), total, 220)
+            st.plotly_chart(fig, width="stretch", config={'displayModeBar': False})
 
     with col2:
         st.markdown('<p class="chart-title" style="margin:1rem 0 0.5rem 0;">📈 Korean vs Global Volume</p>', unsafe_allow_html=True)
-        fig = create_bar_comparison(total, height=220)
-        st.plotly_chart(fig, width="stretch", config={'displayModeBar': False})
+        with tracing.span("render_chart", chart="bar"):
+            fig = bar_figure(snapshot_key(total), total, 220)
+            st.plotly_chart(fig, width="stretch", config={'displayModeBar': False})
 
     # Exchange Rankings (Compact)
     st.markdown('<p class="chart-title" style="margin:1rem 0 0.5rem 0;">🏆 Exchange Rankings (Total Market)</p>', unsafe_allow_html=True)
@@ -614,6 +786,12 @@ def main():
     ranking_html += '</div>'
     st.markdown(ranking_html, unsafe_allow_html=True)
 
+    # Top Movers (Screener)
+    screener_config = config.get("screener", {})
+    if screener_config.get("enabled", False):
+        with tracing.span("render_screener"):
+            render_screener(config, screener_config)
+
     # Footer
     update_time = datetime.fromtimestamp(total.timestamp).strftime("%H:%M:%S")
     connected = data.get("connected_exchanges", [])
@@ -0,0 +1,49 @@
+"""
+Cross Rate Module
+같은 주기 티커 가격으로 통화별 USD 환산율 계산
+"""
+
+from collections import defaultdict, deque
+from typing import Iterable, Optional
+
+# USD 1:1 기준 통화
+USD_PEGGED = ("USD", "USDT", "USDC", "FDUSD", "BUSD", "TUSD", "DAI")
+
+
+class CrossRateGraph:
+    """통화 간 환율 그래프 (간선 = 현물 마켓 가격)"""
+
+    def __init__(self, anchors: Iterable[str] = USD_PEGGED):
+        self.anchors = tuple(anchors)
+        self._edges: dict[str, list[tuple[str, float]]] = defaultdict(list)
+
+    def add(self, base: str, quote: str, price: Optional[float]):
+        """1 base = price quote"""
+        if not price or price <= 0:
+            return
+        self._edges[base].append((quote, price))
+        self._edges[quote].append((base, 1 / price))
+
+    def add_tickers(self, tickers: dict):
+        """ccxt 티커 dict 추가 (파생상품 심볼 제외)"""
+        for symbol, data in tickers.items():
+            if ":" in symbol or "/" not in symbol:
+                continue
+            base, quote = symbol.split("/")
+            self.add(base, quote, data.get("last"))
+
+    def usd_rates(self, fallback: Optional[dict[str, float]] = None) -> dict[str, float]:
+        """통화 1단위의 USD 가치 (기준 통화에서 최단 경로 BFS)"""
+        rates = {anchor: 1.0 for anchor in self.anchors}
+        queue = deque(self.anchors)
+        while queue:
+            cur = queue.popleft()
+            for nbr, price in self._edges.get(cur, ()):
+                # 1 cur = price nbr -> 1 nbr = rates[cur] / price
+                if nbr not in rates:
+                    rates[nbr] = rates[cur] / price
+                    queue.append(nbr)
+        if fallback:
+            for currency, rate in fallback.items():
+                rates.setdefault(currency, rate)
+        return rates
@@ -4,11 +4,20 @@ CEX Dominance Module
 """
 
 import asyncio
-import ccxt.async_support as ccxt
-from dataclasses import dataclass
-from typing import Optional
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
 import logging
 
+import tracing
+from crossrate import USD_PEGGED, CrossRateGraph
+from lru import get_limit
+from ratelimit import PRIORITY_HIGH, get_rate_limiter
+
+if TYPE_CHECKING:
+    import ccxt.async_support as ccxt
+    from reload import ConfigDiff
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,7 +29,9 @@ class ExchangeVolume:
     volume_24h: float  # 24시간 거래량 (base currency)
     volume_usd: float  # USD 환산 거래량
     price: float       # 현재가
-    region: str        # korean / global
+    region: str        # korean / global / config.yaml 에 정의한 지역
+    base_volume: float = 0.0  # 기초 자산 거래량 (교차 검증용, 모르면 0)
+    flag: str = ""            # 검증 단계 이상치 표시
 
 
 @dataclass
@@ -33,72 +44,377 @@ class DominanceResult:
     korean_dominance: float  # 한국 지배력 (%)
     exchanges: list[ExchangeVolume]
     timestamp: float
+    region_volumes: dict[str, float] = field(default_factory=dict)  # 지역별 거래량 (USD)
+    dominance: dict[str, float] = field(default_factory=dict)       # 지역별 점유율 (%)
+    korean_depth_dominance: dict[str, float] = field(default_factory=dict)  # 호가 깊이 구간별 한국 점유율 (%)
+    perp_region_volumes: dict[str, float] = field(default_factory=dict)     # 지역별 무기한 선물 거래량 (USD)
+    korean_dominance_spot_perp: Optional[float] = None                      # 현물+무기한 한국 지배력 (%)
+
+
+# 전체 마켓 계산 기본 티커
+DEFAULT_MARKET_TICKERS = ["BTC/USDT", "ETH/USDT", "XRP/USDT", "SOL/USDT", "DOGE/USDT"]
+
+# 지역 기본 설정 (config.yaml 의 regions 로 덮어씀)
+DEFAULT_REGIONS = {
+    "korean": {
+        "label": "한국",
+        "fiat": "KRW",
+        "fx": {"exchange": "upbit", "symbol": "USDT/KRW", "default": 1350.0},
+    },
+    "global": {"label": "글로벌"},
+}
+
+
+def get_regions(config: dict) -> dict[str, dict]:
+    """지역 설정 (거래소 그룹 이름 = 지역 이름)"""
+    regions = config.get("regions") or {}
+    return {
+        name: {**DEFAULT_REGIONS.get(name, {}), **regions.get(name, {})}
+        for name in config["exchanges"]
+    }
+
+
+def enabled_exchanges(config: dict) -> list[tuple[str, str]]:
+    """활성화된 (거래소, 지역) 목록"""
+    return [
+        (ex["name"], region)
+        for region, exchanges in config["exchanges"].items()
+        for ex in exchanges
+        if ex.get("enabled", True)
+    ]
+
+
+def aggregate(ticker: str, volumes: list[ExchangeVolume]) -> DominanceResult:
+    """거래소별 거래량 -> 지역별 지배력 집계 (1회 순회)"""
+    region_volumes: dict[str, float] = {}
+    total_volume = 0.0
+    for v in volumes:
+        region_volumes[v.region] = region_volumes.get(v.region, 0.0) + v.volume_usd
+        total_volume += v.volume_usd
+
+    dominance = {
+        region: (volume / total_volume * 100) if total_volume > 0 else 0
+        for region, volume in region_volumes.items()
+    }
+    korean_volume = region_volumes.get("korean", 0.0)
+
+    return DominanceResult(
+        ticker=ticker,
+        total_volume_usd=total_volume,
+        korean_volume_usd=korean_volume,
+        global_volume_usd=total_volume - korean_volume,
+        korean_dominance=dominance.get("korean", 0),
+        exchanges=sorted(volumes, key=lambda x: x.volume_usd, reverse=True),
+        timestamp=time.time(),
+        region_volumes=region_volumes,
+        dominance=dominance,
+    )
+
+
+def apply_perp_volumes(result: DominanceResult, region_volumes: dict[str, float]):
+    """무기한 선물 거래량 반영 -> 현물+무기한 지배력 (현물 지배력은 그대로)"""
+    result.perp_region_volumes = region_volumes
+    total = result.total_volume_usd + sum(region_volumes.values())
+    korean = result.korean_volume_usd + region_volumes.get("korean", 0.0)
+    result.korean_dominance_spot_perp = korean / total * 100 if total > 0 else 0
+
+
+def merge_total(results: list[DominanceResult]) -> Optional[DominanceResult]:
+    """티커별 결과 -> 전체 마켓 결과 (거래소별 합산)"""
+    all_volumes = [v for r in results for v in r.exchanges]
+    if not all_volumes:
+        return None
+
+    # 거래소별 합산
+    exchange_totals: dict[str, ExchangeVolume] = {}
+    for v in all_volumes:
+        key = v.exchange
+        if key in exchange_totals:
+            exchange_totals[key] = ExchangeVolume(
+                exchange=v.exchange,
+                ticker="TOTAL",
+                volume_24h=exchange_totals[key].volume_24h + v.volume_24h,
+                volume_usd=exchange_totals[key].volume_usd + v.volume_usd,
+                price=0,
+                region=v.region,
+            )
+        else:
+            exchange_totals[key] = ExchangeVolume(
+                exchange=v.exchange,
+                ticker="TOTAL",
+                volume_24h=v.volume_24h,
+                volume_usd=v.volume_usd,
+                price=0,
+                region=v.region,
+            )
+
+    total = aggregate("TOTAL MARKET", list(exchange_totals.values()))
+
+    # 무기한 선물 거래량도 지역별 합산
+    perp: dict[str, float] = {}
+    for r in results:
+        for region, volume in r.perp_region_volumes.items():
+            perp[region] = perp.get(region, 0.0) + volume
+    if perp:
+        apply_perp_volumes(total, perp)
+    return total
+
+
+def aggregate_universe(regions: dict[str, dict], volumes: list[ExchangeVolume]) -> dict[str, DominanceResult]:
+    """전체 거래량 -> 법정화폐 지역에 상장된 티커별 지배력"""
+    fiat_regions = {name for name, region in regions.items() if region.get("fiat")}
+    by_ticker: dict[str, list[ExchangeVolume]] = {}
+    listed = set()
+    for v in volumes:
+        by_ticker.setdefault(v.ticker, []).append(v)
+        if v.region in fiat_regions:
+            listed.add(v.ticker)
+    return {ticker: aggregate(ticker, by_ticker[ticker]) for ticker in listed}
 
 
 class DominanceCalculator:
     """거래소 지배력 계산기"""
 
-    # 한국 거래소 목록 (KRW 페어 사용)
-    KOREAN_EXCHANGES = {"upbit", "bithumb"}
+    # 기간별 OHLCV 설정
+    PERIOD_CONFIG = {
+        "1h": ("1m", 60),      # 1분봉 60개
+        "4h": ("5m", 48),      # 5분봉 48개
+        "24h": ("1h", 24),     # 1시간봉 24개
+        "7d": ("4h", 42),      # 4시간봉 42개
+        "30d": ("1d", 30),     # 1일봉 30개
+    }
+
+    # 멀티 쿼트 집계 기본 대상 쿼트
+    DEFAULT_QUOTES = ["USDT", "USDC", "FDUSD", "USD", "KRW", "BTC"]
 
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, priority: int = PRIORITY_HIGH):
         self.config = config
-        self.exchanges: dict[str, ccxt.Exchange] = {}
-        self._krw_rate: Optional[float] = None
+        self.priority = priority
+        self.exchanges: dict[str, "ccxt.Exchange"] = {}
+        self.regions = get_regions(config)
+        self._exchange_region = {name: region for name, region in enabled_exchanges(config)}
+        # 법정화폐별 USD 환율 (예: KRW -> 1350.0)
+        self._fx_rates: dict[str, float] = {}
+        # 모든 인스턴스/프로세스가 공유하는 요청 제한기
+        self._limiter = get_rate_limiter(config.get("rate_limits"))
+        self._volume_engine = None
+        self._quote_markets: dict[tuple[str, str], list[str]] = {}
+        # 무기한 선물: (거래소, 자산) -> 심볼, 거래소 -> 이번 주기 티커
+        self._swap_markets: dict[tuple[str, str], list[str]] = {}
+        self._perp_tickers: dict[str, dict] = {}
+        self._perp_fetched = 0.0  # 마지막 일괄 조회 시도 시각 (거래소별 성공 여부와 무관)
+        self._perp_bases: set[str] = set()
+        self._validator = None
+        self._validation_ready = False
+        self.depth = None
+        # 응답 기록/재생 세션 (session.mode: record | replay)
+        self.session = None
+        if (config.get("session") or {}).get("mode"):
+            from replay import open_session
+            self.session = open_session(config["session"])
+
+    @property
+    def krw_rate(self) -> Optional[float]:
+        """현재 KRW/USD 환율"""
+        return self._fx_rates.get("KRW")
+
+    @property
+    def fx_rates(self) -> dict[str, float]:
+        """법정화폐별 USD 환율"""
+        return self._fx_rates
+
+    def _to_usd(self, region: str, volume: float) -> float:
+        """지역 법정화폐 거래대금 -> USD"""
+        fiat = self.regions.get(region, {}).get("fiat")
+        if not fiat:
+            return volume
+        rate = self._fx_rates.get(fiat)
+        return volume / rate if rate else 0
+
+    async def _throttle(self, exchange_name: str, endpoint: str):
+        """전역 요청 제한 토큰 확보"""
+        if self.session and self.session.replaying:
+            return
+        with tracing.span("rate_limit", exchange=exchange_name, endpoint=endpoint):
+            await self._limiter.acquire(exchange_name, endpoint, self.priority)
+
+    def _create_exchange(self, name: str) -> "ccxt.Exchange":
+        """거래소 클라이언트 생성 (ccxt 는 첫 연결 시점에 로드)"""
+        if self.session and self.session.replaying:
+            return self.session.exchange(name)
+
+        import ccxt.async_support as ccxt
+
+        exchange_class = getattr(ccxt, name)
+        exchange = exchange_class({
+            "enableRateLimit": True,
+            "timeout": 30000,
+        })
+        if self.session:
+            return self.session.wrap(name, exchange)
+        return exchange
 
     async def initialize(self):
         """거래소 연결 초기화"""
-        all_exchanges = (
-            self.config["exchanges"]["korean"] +
-            self.config["exchanges"]["global"]
+        for name, _ in enabled_exchanges(self.config):
+            await self._connect(name)
+
+        # 지역별 법정화폐 환율 조회 (예: 업비트 USDT/KRW 기준)
+        await self._fetch_fx_rates()
+
+    async def _connect(self, name: str):
+        """거래소 1개 연결 (마켓 정보 로드)"""
+        try:
+            exchange = self._create_exchange(name)
+            # 마켓 정보 로드
+            await self._throttle(name, "load_markets")
+            await exchange.load_markets()
+            self.exchanges[name] = exchange
+            logger.info(f"거래소 연결 성공: {name} ({len(exchange.markets)} markets)")
+        except Exception as e:
+            logger.warning(f"거래소 연결 실패 ({name}): {e}")
+
+    async def _disconnect(self, name: str):
+        """거래소 1개 연결 종료 + 해당 거래소 캐시 정리"""
+        exchange = self.exchanges.pop(name, None)
+        if exchange is not None:
+            try:
+                await exchange.close()
+            except Exception:
+                pass
+        for cache in (self._quote_markets, self._swap_markets):
+            for key in [key for key in cache if key[0] == name]:
+                del cache[key]
+        self._perp_tickers.pop(name, None)
+        if self.depth:
+            await self.depth.stop(exchange=name)
+        logger.info(f"거래소 연결 종료: {name}")
+
+    async def reconfigure(self, config: dict, diff: "ConfigDiff"):
+        """실행 중 설정 교체 (사이클 사이에 호출)
+
+        추가된 거래소만 연결하고 제거된 거래소만 닫는다. 나머지 거래소 연결과
+        마켓/환율/검증 상태는 그대로 유지.
+        """
+        for name in diff.exchanges_removed:
+            await self._disconnect(name)
+
+        self.config = config
+        self.regions = get_regions(config)
+        self._exchange_region = {name: region for name, region in enabled_exchanges(config)}
+        if "validation" in diff.sections:
+            self._validator = None
+            self._validation_ready = False
+        if "volume_engine" in diff.sections:
+            self._volume_engine = None
+        if "derivatives" in diff.sections:
+            self._swap_markets.clear()
+            self._perp_tickers.clear()
+            self._perp_fetched = 0.0
+        if "multi_quote" in diff.sections:
+            self._quote_markets.clear()
+
+        for name, _ in diff.exchanges_added:
+            await self._connect(name)
+        if "regions" in diff.sections:
+            # 환율 소스가 바뀌었을 수 있으므로 다시 조회
+            self._fx_rates.clear()
+        await self._fetch_fx_rates()
+
+        if self.depth:
+            for ticker in diff.tickers_removed:
+                await self.depth.stop(ticker=ticker)
+            added = {name for name, _ in diff.exchanges_added}
+            self.depth.start(
+                (name, region, self._get_ticker_for_exchange(name, ticker), ticker)
+                for ticker in config.get("tickers", [])
+                for name, region in enabled_exchanges(config)
+                if name in self.exchanges and (name in added or ticker in diff.tickers_added)
+            )
+
+    def build_symbol_index(self):
+        """로드된 마켓 정보로 상장 심볼 인덱스 생성 (네트워크 요청 없음)"""
+        from symbol_index import SymbolIndex
+
+        return SymbolIndex.from_markets(
+            {name: exchange.markets for name, exchange in self.exchanges.items()},
+            self._exchange_region,
+            self.regions,
         )
 
-        for ex_config in all_exchanges:
-            if not ex_config.get("enabled", True):
+    async def _fetch_fx_rates(self, refresh: bool = False):
+        """법정화폐/USD 환율 조회 (refresh: 환율 거래소가 연결돼 있으면 이미 있는 환율도 다시 조회)"""
+        for region in self.regions.values():
+            fiat = region.get("fiat")
+            fx = region.get("fx", {})
+            live = fx.get("exchange") in self.exchanges
+            if not fiat or (fiat in self._fx_rates and not (refresh and live)):
                 continue
 
-            name = ex_config["name"]
+            default = fx.get("default")
             try:
-                exchange_class = getattr(ccxt, name)
-                exchange = exchange_class({
-                    "enableRateLimit": True,
-                    "timeout": 30000,
-                })
-                # 마켓 정보 로드
-                await exchange.load_markets()
-                self.exchanges[name] = exchange
-                logger.info(f"거래소 연결 성공: {name} ({len(exchange.markets)} markets)")
+                if live:
+                    await self._throttle(fx["exchange"], "fetch_ticker")
+                    ticker = await self.exchanges[fx["exchange"]].fetch_ticker(fx["symbol"])
+                    first = fiat not in self._fx_rates
+                    self._fx_rates[fiat] = ticker["last"]
+                    if first:
+                        logger.info(f"{fiat} 환율: {self._fx_rates[fiat]:.2f}")
+                elif default:
+                    # 기본값 사용
+                    self._fx_rates[fiat] = default
+                    logger.warning(f"{fiat} 환율 기본값 사용: {default}")
             except Exception as e:
-                logger.warning(f"거래소 연결 실패 ({name}): {e}")
-
-        # KRW/USD 환율 조회 (업비트 USDT/KRW 기준)
-        await self._fetch_krw_rate()
-
-    async def _fetch_krw_rate(self):
-        """KRW/USD 환율 조회"""
-        try:
-            if "upbit" in self.exchanges:
-                ticker = await self.exchanges["upbit"].fetch_ticker("USDT/KRW")
-                self._krw_rate = ticker["last"]
-                logger.info(f"KRW 환율: {self._krw_rate:.2f}")
-            else:
-                # 기본값 사용
-                self._krw_rate = 1350.0
-                logger.warning(f"KRW 환율 기본값 사용: {self._krw_rate}")
-        except Exception as e:
-            self._krw_rate = 1350.0
-            logger.warning(f"KRW 환율 조회 실패, 기본값 사용: {e}")
+                if fiat in self._fx_rates:
+                    logger.warning(f"{fiat} 환율 갱신 실패, 직전 값 유지: {e}")
+                    continue
+                if default:
+                    self._fx_rates[fiat] = default
+                logger.warning(f"{fiat} 환율 조회 실패, 기본값 사용: {e}")
+
+    async def refresh_fx_rates(self):
+        """사이클마다 환율 갱신 (조회 실패 시 직전 값 유지)"""
+        await self._fetch_fx_rates(refresh=True)
+
+    def _update_fx_from_tickers(self, tickers_by_exchange: dict[str, dict]):
+        """같은 주기에 받은 환율 마켓 티커(예: 업비트 USDT/KRW)로 환율 갱신 (추가 요청 없음)"""
+        for region in self.regions.values():
+            fx = region.get("fx", {})
+            last = (tickers_by_exchange.get(fx.get("exchange")) or {}).get(fx.get("symbol"), {}).get("last")
+            if region.get("fiat") and last:
+                self._fx_rates[region["fiat"]] = last
 
     def _get_ticker_for_exchange(self, exchange: str, ticker: str) -> str:
-        """거래소별 티커 변환 (한국 거래소는 자동으로 KRW 페어로 변환)"""
-        if exchange in self.KOREAN_EXCHANGES:
+        """거래소별 티커 변환 (법정화폐 지역은 자동으로 원화 등 법정화폐 페어로 변환)"""
+        fiat = self.regions.get(self._exchange_region.get(exchange), {}).get("fiat")
+        if fiat:
             # X/USDT -> X/KRW 자동 변환
             if ticker.endswith("/USDT"):
-                return ticker.replace("/USDT", "/KRW")
+                return ticker.replace("/USDT", f"/{fiat}")
             elif ticker.endswith("/BUSD"):
-                return ticker.replace("/BUSD", "/KRW")
+                return ticker.replace("/BUSD", f"/{fiat}")
         return ticker
 
+    def _ticker_volume(self, exchange_name: str, ticker: str, region: str, data: dict) -> ExchangeVolume:
+        """ccxt 티커 -> ExchangeVolume"""
+        # 값이 None 으로 오는 거래소가 있어 get 기본값 대신 or 사용
+        price = data.get("last") or 0
+        base_volume = data.get("baseVolume") or 0
+        volume_24h = data.get("quoteVolume") or base_volume * price
+
+        # USD 환산
+        volume_usd = self._to_usd(region, volume_24h)
+
+        return ExchangeVolume(
+            exchange=exchange_name,
+            ticker=ticker,
+            volume_24h=volume_24h,
+            volume_usd=volume_usd,
+            price=price,
+            region=region,
+            base_volume=base_volume,
+        )
+
     async def _fetch_volume(
         self,
         exchange_name: str,
@@ -113,24 +429,13 @@ class DominanceCalculator:
         actual_ticker = self._get_ticker_for_exchange(exchange_name, ticker)
 
         try:
-            data = await exchange.fetch_ticker(actual_ticker)
-            volume_24h = data.get("quoteVolume") or data.get("baseVolume", 0) * data.get("last", 0)
-            price = data.get("last", 0)
-
-            # USD 환산
-            if region == "korean":
-                volume_usd = volume_24h / self._krw_rate if self._krw_rate else 0
-            else:
-                volume_usd = volume_24h
-
-            return ExchangeVolume(
-                exchange=exchange_name,
-                ticker=ticker,
-                volume_24h=volume_24h,
-                volume_usd=volume_usd,
-                price=price,
-                region=region,
-            )
+            with tracing.span("_fetch_volume", exchange=exchange_name, symbol=actual_ticker):
+                await self._throttle(exchange_name, "fetch_ticker")
+                # 네트워크 + JSON 파싱 (ccxt 내부)
+                with tracing.span("fetch_ticker", exchange=exchange_name):
+                    data = await exchange.fetch_ticker(actual_ticker)
+                with tracing.span("ticker_volume"):
+                    return self._ticker_volume(exchange_name, ticker, region, data)
 
         except Exception as e:
             logger.warning(f"거래량 조회 실패 ({exchange_name}/{actual_ticker}): {e}")
@@ -152,7 +457,9 @@ class DominanceCalculator:
         actual_ticker = self._get_ticker_for_exchange(exchange_name, ticker)
 
         try:
-            ohlcv = await exchange.fetch_ohlcv(actual_ticker, timeframe, limit=limit)
+            await self._throttle(exchange_name, "fetch_ohlcv")
+            with tracing.span("fetch_ohlcv", exchange=exchange_name, symbol=actual_ticker):
+                ohlcv = await exchange.fetch_ohlcv(actual_ticker, timeframe, limit=limit)
             if not ohlcv:
                 return None
 
@@ -164,10 +471,7 @@ class DominanceCalculator:
             volume_quote = sum(candle[5] * candle[4] for candle in ohlcv)
 
             # USD 환산
-            if region == "korean":
-                volume_usd = volume_quote / self._krw_rate if self._krw_rate else 0
-            else:
-                volume_usd = volume_quote
+            volume_usd = self._to_usd(region, volume_quote)
 
             return ExchangeVolume(
                 exchange=exchange_name,
@@ -176,134 +480,448 @@ class DominanceCalculator:
                 volume_usd=volume_usd,
                 price=last_price,
                 region=region,
+                base_volume=total_volume,
             )
 
         except Exception as e:
             logger.warning(f"OHLCV 조회 실패 ({exchange_name}/{actual_ticker}): {e}")
             return None
 
-    async def calculate(self, ticker: str, period: str = "24h") -> Optional[DominanceResult]:
-        """지배력 계산 (period: 1h, 4h, 24h, 7d)"""
-        import time
-
-        # 기간별 OHLCV 설정
-        period_config = {
-            "1h": ("1m", 60),      # 1분봉 60개
-            "4h": ("5m", 48),      # 5분봉 48개
-            "24h": ("1h", 24),     # 1시간봉 24개
-            "7d": ("4h", 42),      # 4시간봉 42개
-            "30d": ("1d", 30),     # 1일봉 30개
+    def _use_multi_quote(self, period: str) -> bool:
+        """멀티 쿼트 집계 사용 여부 (24h 티커 경로만 일괄 조회 가능)"""
+        return (
+            self.config.get("multi_quote", {}).get("enabled", False)
+            and period == "24h"
+            and self.config.get("volume_source", "ticker") == "ticker"
+        )
+
+    def _get_quote_markets(self, exchange_name: str, base: str) -> list[str]:
+        """자산의 모든 현물 마켓 + USD 환산용 브릿지 마켓"""
+        key = (exchange_name, base)
+        if key in self._quote_markets:
+            return self._quote_markets[key]
+
+        quotes = set(self.config.get("multi_quote", {}).get("quotes", self.DEFAULT_QUOTES))
+        markets = self.exchanges[exchange_name].markets or {}
+        spot = {
+            symbol: m for symbol, m in markets.items()
+            if m.get("spot", True) and m.get("active") is not False
         }
 
-        tasks = []
-        use_ohlcv = period != "24h"
-        timeframe, limit = period_config.get(period, ("1h", 24))
-
-        # 한국 거래소
-        for ex in self.config["exchanges"]["korean"]:
-            if ex.get("enabled", True):
-                if use_ohlcv:
-                    tasks.append(self._fetch_volume_ohlcv(ex["name"], ticker, "korean", timeframe, limit))
-                else:
-                    tasks.append(self._fetch_volume(ex["name"], ticker, "korean"))
-
-        # 글로벌 거래소
-        for ex in self.config["exchanges"]["global"]:
-            if ex.get("enabled", True):
-                if use_ohlcv:
-                    tasks.append(self._fetch_volume_ohlcv(ex["name"], ticker, "global", timeframe, limit))
-                else:
-                    tasks.append(self._fetch_volume(ex["name"], ticker, "global"))
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        symbols = {s for s, m in spot.items() if m.get("base") == base and m.get("quote") in quotes}
 
-        # 유효한 결과만 필터링
-        volumes: list[ExchangeVolume] = [
-            r for r in results
-            if isinstance(r, ExchangeVolume) and r.volume_usd > 0
+        # 쿼트 통화 -> USD 경로 (예: XRP/BTC 는 BTC/USDT, KRW 는 USDT/KRW)
+        anchors = set(USD_PEGGED)
+        for quote in {spot[s]["quote"] for s in symbols} - anchors:
+            symbols.update(
+                s for s, m in spot.items()
+                if (m.get("base") == quote and m.get("quote") in quotes)
+                or (m.get("quote") == quote and m.get("base") in anchors)
+            )
+
+        self._quote_markets[key] = sorted(symbols)
+        return self._quote_markets[key]
+
+    def _use_perps(self, period: str) -> bool:
+        """무기한 선물 거래량 포함 여부 (24h 티커 기준만 지원)"""
+        return period == "24h" and self.config.get("derivatives", {}).get("enabled", False)
+
+    def _get_swap_markets(self, exchange_name: str, base: str) -> list[str]:
+        """자산의 선형(USDT/USDC 정산) 무기한 선물 마켓"""
+        key = (exchange_name, base)
+        if key not in self._swap_markets:
+            settles = set(self.config.get("derivatives", {}).get("settle", ["USDT", "USDC"]))
+            markets = self.exchanges[exchange_name].markets or {}
+            self._swap_markets[key] = sorted(
+                symbol for symbol, m in markets.items()
+                if m.get("swap") and m.get("linear") and m.get("base") == base
+                and m.get("settle") in settles and m.get("active") is not False
+            )
+        return self._swap_markets[key]
+
+    async def prefetch_perps(self, tickers: list[str]):
+        """이번 주기 무기한 선물 티커 일괄 조회 (거래소당 fetch_tickers 1회)"""
+        bases = {t.split("/")[0] for t in tickers}
+        targets = {}
+        for name, _ in enabled_exchanges(self.config):
+            # fetchTickers 미지원 거래소는 심볼별 요청이 되므로 제외
+            if name not in self.exchanges or not self.exchanges[name].has.get("fetchTickers"):
+                continue
+            symbols = [s for base in sorted(bases) for s in self._get_swap_markets(name, base)]
+            if symbols:
+                targets[name] = symbols
+        self._perp_bases = bases
+        # 실패한 거래소가 있어도 시도 시각 기준으로 주기당 1회만 조회 (티커별 재조회 방지)
+        self._perp_fetched = time.time()
+        # 이번 주기에 받지 못한 거래소의 이전 값은 쓰지 않음
+        self._perp_tickers = {name: self._perp_tickers[name] for name in targets if name in self._perp_tickers}
+        if not targets:
+            return
+
+        fetched = await asyncio.gather(
+            *[self._fetch_tickers(name, symbols) for name, symbols in targets.items()],
+            return_exceptions=True,
+        )
+        for name, tickers_data in zip(targets, fetched):
+            if isinstance(tickers_data, Exception):
+                logger.warning(f"무기한 선물 조회 실패 ({name}): {tickers_data}")
+                self._perp_tickers.pop(name, None)
+                continue
+            self._perp_tickers[name] = tickers_data
+
+    def _perp_volumes(self, ticker: str) -> list[ExchangeVolume]:
+        """이번 주기에 받아 둔 무기한 선물 티커 -> 거래소별 거래량 (추가 요청 없음)"""
+        base = ticker.split("/")[0]
+        volumes = []
+        for name, region in enabled_exchanges(self.config):
+            tickers = self._perp_tickers.get(name)
+            if not tickers:
+                continue
+            markets = self.exchanges[name].markets or {}
+            volume_usd = 0.0
+            base_volume = 0.0
+            price = 0.0
+            for symbol in self._get_swap_markets(name, base):
+                data = tickers.get(symbol)
+                if not data:
+                    continue
+                if not data.get("quoteVolume"):
+                    # quoteVolume 이 없으면 baseVolume 은 계약 수 -> 계약 크기로 기초자산 수량 환산
+                    contract_size = markets.get(symbol, {}).get("contractSize") or 1
+                    data = {**data, "baseVolume": (data.get("baseVolume") or 0) * contract_size}
+                # 선형 계약은 USDT/USDC 기준 (USD 로 간주)
+                v = self._ticker_volume(name, ticker, "global", data)
+                volume_usd += v.volume_usd
+                base_volume += v.base_volume
+                price = price or v.price
+            if volume_usd > 0:
+                volumes.append(ExchangeVolume(
+                    exchange=name,
+                    ticker=ticker,
+                    volume_24h=volume_usd,
+                    volume_usd=volume_usd,
+                    price=price,
+                    region=region,
+                    base_volume=base_volume,
+                ))
+        return volumes
+
+    async def _fetch_tickers(self, exchange_name: str, symbols: list[str]) -> dict:
+        """여러 마켓 티커 일괄 조회 (fetchTickers 미지원 시 개별 조회)"""
+        exchange = self.exchanges[exchange_name]
+        if exchange.has.get("fetchTickers"):
+            await self._throttle(exchange_name, "fetch_tickers")
+            with tracing.span("fetch_tickers", exchange=exchange_name, symbols=len(symbols)):
+                return await exchange.fetch_tickers(symbols)
+
+        async def _one(symbol):
+            await self._throttle(exchange_name, "fetch_ticker")
+            return await exchange.fetch_ticker(symbol)
+
+        results = await asyncio.gather(*[_one(s) for s in symbols], return_exceptions=True)
+        return {s: r for s, r in zip(symbols, results) if isinstance(r, dict)}
+
+    async def _fetch_volumes_multi_quote(self, ticker: str) -> list:
+        """자산의 모든 쿼트 마켓 거래량 합산 (거래소당 1회 일괄 조회)"""
+        base = ticker.split("/")[0]
+        targets = [
+            (name, region)
+            for name, region in enabled_exchanges(self.config)
+            if name in self.exchanges
         ]
 
-        if not volumes:
-            logger.warning(f"유효한 거래량 데이터 없음: {ticker}")
+        async def _fetch(name):
+            symbols = self._get_quote_markets(name, base)
+            return await self._fetch_tickers(name, symbols) if symbols else {}
+
+        fetched = await asyncio.gather(*[_fetch(name) for name, _ in targets], return_exceptions=True)
+
+        # 같은 주기 티커로 환율 그래프 구성 (거래소 자체 환율 우선)
+        graph = CrossRateGraph()
+        for tickers in fetched:
+            if isinstance(tickers, dict):
+                graph.add_tickers(tickers)
+        fallback = graph.usd_rates()
+
+        # 같은 주기 환율 마켓(예: USDT/KRW)으로 환율 갱신 (추가 요청 없음)
+        self._update_fx_from_tickers({name: t for (name, _), t in zip(targets, fetched) if isinstance(t, dict)})
+
+        for fiat, rate in self._fx_rates.items():
+            fallback.setdefault(fiat, 1 / rate)
+
+        volumes = []
+        for (name, region), tickers in zip(targets, fetched):
+            if isinstance(tickers, Exception):
+                logger.warning(f"멀티 쿼트 조회 실패 ({name}/{base}): {tickers}")
+                continue
+            local = CrossRateGraph()
+            local.add_tickers(tickers)
+            rates = local.usd_rates(fallback)
+
+            base_volume = 0.0
+            volume_usd = 0.0
+            for symbol, data in tickers.items():
+                market_base, quote = symbol.split("/")
+                if market_base != base or quote not in rates:
+                    continue
+                last = data.get("last") or 0
+                quote_volume = data.get("quoteVolume") or (data.get("baseVolume") or 0) * last
+                base_volume += data.get("baseVolume") or 0
+                volume_usd += quote_volume * rates[quote]
+
+            primary_symbol = self._get_ticker_for_exchange(name, ticker)
+            primary = tickers.get(primary_symbol) or {}
+            # 다른 경로와 같이 volume_24h 는 대표 마켓 쿼트 통화 기준 (합산 USD 를 역환산)
+            primary_rate = rates.get(primary_symbol.split("/")[-1])
+            volumes.append(ExchangeVolume(
+                exchange=name,
+                ticker=ticker,
+                volume_24h=volume_usd / primary_rate if primary_rate else volume_usd,
+                volume_usd=volume_usd,
+                price=primary.get("last") or 0,
+                region=region,
+                base_volume=base_volume,
+            ))
+        return volumes
+
+    def _get_volume_engine(self):
+        """체결 기반 거래대금 엔진 (volume_source: trades 일 때만 생성)"""
+        if self._volume_engine is None:
+            from volume_engine import PERIOD_SECONDS, TradeVolumeEngine, ring_bytes
+
+            engine_config = self.config.get("volume_engine", {})
+            bucket_seconds = engine_config.get("bucket_seconds", 60)
+            horizon_seconds = PERIOD_SECONDS[engine_config.get("horizon", "30d")]
+            # 링 수 상한은 메모리 상한 / 링 1개 크기 (기간이 짧을수록 더 많은 심볼 유지)
+            max_bytes = get_limit(self.config, "volume_rings_mb") * 1024 * 1024
+            self._volume_engine = TradeVolumeEngine(
+                bucket_seconds=bucket_seconds,
+                horizon_seconds=horizon_seconds,
+                page_limit=engine_config.get("page_limit", 1000),
+                max_pages=engine_config.get("max_pages", 50),
+                max_keys=max(1, max_bytes // ring_bytes(bucket_seconds, horizon_seconds)),
+            )
+        return self._volume_engine
+
+    async def _fetch_volume_trades(
+        self,
+        exchange_name: str,
+        ticker: str,
+        region: str,
+        period: str,
+    ) -> Optional[ExchangeVolume]:
+        """체결 기반 거래량 조회 (모든 거래소 동일한 벽시계 윈도우)"""
+        if exchange_name not in self.exchanges:
             return None
 
-        # 지배력 계산
-        korean_volume = sum(v.volume_usd for v in volumes if v.region == "korean")
-        global_volume = sum(v.volume_usd for v in volumes if v.region == "global")
-        total_volume = korean_volume + global_volume
+        from volume_engine import PERIOD_SECONDS
 
-        korean_dominance = (korean_volume / total_volume * 100) if total_volume > 0 else 0
+        exchange = self.exchanges[exchange_name]
+        actual_ticker = self._get_ticker_for_exchange(exchange_name, ticker)
+        engine = self._get_volume_engine()
+        seconds = PERIOD_SECONDS.get(period, PERIOD_SECONDS["24h"])
 
-        return DominanceResult(
+        try:
+            await engine.sync(
+                exchange, exchange_name, actual_ticker, seconds,
+                throttle=lambda: self._throttle(exchange_name, "fetch_trades"),
+            )
+        except Exception as e:
+            logger.warning(f"체결 조회 실패 ({exchange_name}/{actual_ticker}): {e}")
+
+        volume_quote = engine.volume(exchange_name, actual_ticker, seconds)
+        if volume_quote is None:
+            # 윈도우 백필 미완료 -> 기존 방식으로 대체
+            logger.info(f"체결 윈도우 미완성, 기본 조회로 대체 ({exchange_name}/{actual_ticker} {period})")
+            if period == "24h":
+                return await self._fetch_volume(exchange_name, ticker, region)
+            timeframe, limit = self.PERIOD_CONFIG.get(period, ("1h", 24))
+            return await self._fetch_volume_ohlcv(exchange_name, ticker, region, timeframe, limit)
+
+        # USD 환산
+        volume_usd = self._to_usd(region, volume_quote)
+
+        return ExchangeVolume(
+            exchange=exchange_name,
             ticker=ticker,
-            total_volume_usd=total_volume,
-            korean_volume_usd=korean_volume,
-            global_volume_usd=global_volume,
-            korean_dominance=korean_dominance,
-            exchanges=sorted(volumes, key=lambda x: x.volume_usd, reverse=True),
-            timestamp=time.time(),
+            volume_24h=volume_quote,
+            volume_usd=volume_usd,
+            price=engine.last_price(exchange_name, actual_ticker),
+            region=region,
         )
 
+    async def _fetch_volumes(self, ticker: str, period: str) -> list:
+        """거래소별 거래량 조회 (마켓 1개씩)"""
+        tasks = []
+        use_trades = self.config.get("volume_source", "ticker") == "trades"
+        use_ohlcv = period != "24h"
+        timeframe, limit = self.PERIOD_CONFIG.get(period, ("1h", 24))
+
+        for name, region in enabled_exchanges(self.config):
+            if use_trades:
+                tasks.append(self._fetch_volume_trades(name, ticker, region, period))
+            elif use_ohlcv:
+                tasks.append(self._fetch_volume_ohlcv(name, ticker, region, timeframe, limit))
+            else:
+                tasks.append(self._fetch_volume(name, ticker, region))
+
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _get_validator(self):
+        """거래량 검증기 (validation.enabled 일 때만 생성)"""
+        if not self._validation_ready:
+            from validation import create_validator
+
+            self._validator = create_validator(
+                self.config.get("validation"),
+                max_keys=get_limit(self.config, "validator_keys"),
+            )
+            self._validation_ready = True
+        return self._validator
+
+    def validate(self, volumes: list[ExchangeVolume], period: str = "24h") -> list[ExchangeVolume]:
+        """집계 전 이상치 검증 (비활성 시 그대로)"""
+        validator = self._get_validator()
+        if validator is None:
+            return volumes
+        with tracing.span("validate", count=len(volumes)):
+            prices_usd = [self._to_usd(v.region, v.price) for v in volumes]
+            return validator.validate(volumes, prices_usd, period)
+
+    async def fetch_volumes(self, ticker: str, period: str = "24h") -> list[ExchangeVolume]:
+        """거래소별 유효 거래량 조회 (집계 전 단계)"""
+        if self._use_multi_quote(period):
+            results = await self._fetch_volumes_multi_quote(ticker)
+        else:
+            results = await self._fetch_volumes(ticker, period)
+
+        # 유효한 결과만 필터링
+        volumes = [
+            r for r in results
+            if isinstance(r, ExchangeVolume) and r.volume_usd > 0
+        ]
+        return self.validate(volumes, period)
+
+    async def calculate(self, ticker: str, period: str = "24h") -> Optional[DominanceResult]:
+        """지배력 계산 (period: 1h, 4h, 24h, 7d)"""
+        with tracing.span("calculate", ticker=ticker, period=period):
+            volumes = await self.fetch_volumes(ticker, period)
+            if not volumes:
+                logger.warning(f"유효한 거래량 데이터 없음: {ticker}")
+                return None
+            with tracing.span("aggregate"):
+                result = aggregate(ticker, volumes)
+            if self.depth:
+                result.korean_depth_dominance = self.depth.dominance(ticker, self._to_usd)
+            if self._use_perps(period):
+                await self._attach_perps(result)
+            return result
+
+    async def _attach_perps(self, result: DominanceResult):
+        """현물 결과에 무기한 선물 거래량 추가 (이번 주기 일괄 조회 결과 사용)"""
+        interval = self.config.get("update_interval", 60)
+        base = result.ticker.split("/")[0]
+        if time.time() - self._perp_fetched > interval or base not in self._perp_bases:
+            # calculate 단독 호출 (일괄 조회 전) 이면 이 티커만 조회
+            await self.prefetch_perps([result.ticker])
+        apply_perp_volumes(result, self.perp_region_volumes(result.ticker))
+
+    def perp_region_volumes(self, ticker: str) -> dict[str, float]:
+        """받아 둔 무기한 선물 티커 -> 지역별 거래량 (USD)"""
+        # 검증 상태는 현물과 분리 (같은 거래소·티커라도 분포가 다름)
+        perp = self.validate(self._perp_volumes(ticker), "perp")
+        region_volumes: dict[str, float] = {}
+        for v in perp:
+            region_volumes[v.region] = region_volumes.get(v.region, 0.0) + v.volume_usd
+        return region_volumes
+
+    async def calculate_many(self, tickers: list[str], period: str = "24h") -> dict[str, Optional[DominanceResult]]:
+        """여러 티커 동시 계산 (사이클 시작 시 환율 갱신)"""
+        if not self._use_multi_quote(period):
+            # 멀티 쿼트 경로는 같은 주기 티커로 환율을 갱신하므로 별도 조회 없음
+            await self.refresh_fx_rates()
+        if self._use_perps(period):
+            # 무기한 선물은 티커별이 아니라 거래소당 1회 일괄 조회
+            await self.prefetch_perps(tickers)
+        results = await asyncio.gather(*[self.calculate(t, period) for t in tickers])
+        return dict(zip(tickers, results))
+
+    async def fetch_universe_volumes(self) -> list[ExchangeVolume]:
+        """상장 자산 전체 24h 거래량 (거래소당 fetch_tickers 1회)
+
+        법정화폐 지역 거래소는 X/<fiat>, 그 외는 X/USDT 마켓을 사용한다.
+        """
+        targets = [(name, region) for name, region in enabled_exchanges(self.config) if name in self.exchanges]
+
+        async def _fetch(name):
+            await self._throttle(name, "fetch_tickers")
+            with tracing.span("fetch_tickers", exchange=name):
+                return await self.exchanges[name].fetch_tickers()
+
+        fetched = await asyncio.gather(*[_fetch(name) for name, _ in targets], return_exceptions=True)
+        # 전체 티커에 환율 마켓도 포함되므로 같은 주기 값으로 환율 갱신
+        self._update_fx_from_tickers({name: t for (name, _), t in zip(targets, fetched) if isinstance(t, dict)})
+
+        volumes = []
+        for (name, region), tickers in zip(targets, fetched):
+            if isinstance(tickers, Exception):
+                logger.warning(f"전체 티커 조회 실패 ({name}): {tickers}")
+                continue
+            quote = self.regions.get(region, {}).get("fiat") or "USDT"
+            for symbol, data in tickers.items():
+                base, _, market_quote = symbol.partition("/")
+                if market_quote != quote:
+                    continue
+                v = self._ticker_volume(name, f"{base}/USDT", region, data)
+                if v.volume_usd > 0:
+                    volumes.append(v)
+        # 검증 상태는 티커별 24h 경로와 분리 (조회 주기/마켓 선택이 달라 같은 키를 쓰면 서로 오염)
+        return self.validate(volumes, "universe")
+
+    async def calculate_universe(self) -> dict[str, DominanceResult]:
+        """법정화폐 지역(한국 등) 상장 자산 전체 24h 지배력"""
+        return aggregate_universe(self.regions, await self.fetch_universe_volumes())
+
     async def calculate_total_market(self, tickers: list[str] = None, period: str = "24h") -> Optional[DominanceResult]:
         """전체 마켓 지배력 계산 (여러 티커 합산)"""
-        import time
-
         if tickers is None:
-            tickers = ["BTC/USDT", "ETH/USDT", "XRP/USDT", "SOL/USDT", "DOGE/USDT"]
-
-        all_volumes: list[ExchangeVolume] = []
+            tickers = DEFAULT_MARKET_TICKERS
 
+        results = []
         for ticker in tickers:
             result = await self.calculate(ticker, period)
             if result:
-                all_volumes.extend(result.exchanges)
+                results.append(result)
 
-        if not all_volumes:
-            return None
+        return merge_total(results)
 
-        # 거래소별 합산
-        exchange_totals: dict[str, ExchangeVolume] = {}
-        for v in all_volumes:
-            key = v.exchange
-            if key in exchange_totals:
-                exchange_totals[key] = ExchangeVolume(
-                    exchange=v.exchange,
-                    ticker="TOTAL",
-                    volume_24h=exchange_totals[key].volume_24h + v.volume_24h,
-                    volume_usd=exchange_totals[key].volume_usd + v.volume_usd,
-                    price=0,
-                    region=v.region,
-                )
-            else:
-                exchange_totals[key] = ExchangeVolume(
-                    exchange=v.exchange,
-                    ticker="TOTAL",
-                    volume_24h=v.volume_24h,
-                    volume_usd=v.volume_usd,
-                    price=0,
-                    region=v.region,
-                )
-
-        volumes = list(exchange_totals.values())
-        korean_volume = sum(v.volume_usd for v in volumes if v.region == "korean")
-        global_volume = sum(v.volume_usd for v in volumes if v.region == "global")
-        total_volume = korean_volume + global_volume
-        korean_dominance = (korean_volume / total_volume * 100) if total_volume > 0 else 0
-
-        return DominanceResult(
-            ticker="TOTAL MARKET",
-            total_volume_usd=total_volume,
-            korean_volume_usd=korean_volume,
-            global_volume_usd=global_volume,
-            korean_dominance=korean_dominance,
-            exchanges=sorted(volumes, key=lambda x: x.volume_usd, reverse=True),
-            timestamp=time.time(),
+    def start_depth(self, tickers: list[str]):
+        """호가 깊이 구독 시작 (depth.enabled 일 때, 연결된 거래소만)"""
+        depth_config = self.config.get("depth", {})
+        if not depth_config.get("enabled", False) or self.depth:
+            return
+        from orderbook import DEFAULT_BANDS, DepthMonitor
+
+        self.depth = DepthMonitor(
+            bands=depth_config.get("bands", DEFAULT_BANDS),
+            limit=depth_config.get("limit", 100),
+            max_age=depth_config.get("max_age", 30),
+        )
+        self.depth.start(
+            (name, region, self._get_ticker_for_exchange(name, ticker), ticker)
+            for ticker in tickers
+            for name, region in enabled_exchanges(self.config)
+            if name in self.exchanges
         )
 
     async def close(self):
         """연결 종료"""
+        if self.depth:
+            await self.depth.close()
         for exchange in self.exchanges.values():
             try:
                 await exchange.close()
             except Exception:
                 pass
+        if self.session:
+            self.session.close()
@@ -0,0 +1,301 @@
+"""
+Export Module
+사이클별 결과를 날짜/티커 파티션 컬럼 파일로 스트리밍 저장 (Parquet / Arrow IPC / CSV)
+"""
+
+import csv
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from dominance import DominanceResult
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {"parquet": "parquet", "arrow": "arrow", "csv": "csv"}
+
+# 테이블별 컬럼 (이름, 타입)
+TABLES = {
+    "snapshots": [
+        ("timestamp", "float64"),
+        ("ticker", "string"),
+        ("total_volume_usd", "float64"),
+        ("korean_volume_usd", "float64"),
+        ("global_volume_usd", "float64"),
+        ("korean_dominance", "float64"),
+    ],
+    "exchanges": [
+        ("timestamp", "float64"),
+        ("ticker", "string"),
+        ("exchange", "string"),
+        ("region", "string"),
+        ("volume_24h", "float64"),
+        ("volume_usd", "float64"),
+        ("price", "float64"),
+    ],
+}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise RuntimeError("parquet/arrow 내보내기에는 pyarrow 가 필요합니다: pip install pyarrow")
+
+
+def _schema(table: str):
+    import pyarrow as pa
+
+    types = {"float64": pa.float64(), "string": pa.string()}
+    return pa.schema([(name, types[kind]) for name, kind in TABLES[table]])
+
+
+def _pair_key(ticker: str) -> str:
+    """파티션 디렉토리용 티커 (BTC/USDT -> BTC-USDT)"""
+    return ticker.replace("/", "-").replace(" ", "_")
+
+
+def _stamp() -> str:
+    """파일 이름용 시작 시각 (밀리초까지)"""
+    return datetime.now().strftime("%H%M%S%f")[:-3]
+
+
+class _PartitionWriter:
+    """파티션 1개 파일 writer (row group 단위로 기록)"""
+
+    def __init__(self, path: Path, table: str, fmt: str):
+        self.path = path
+        self.table = table
+        self.fmt = fmt
+        self.columns = [name for name, _ in TABLES[table]]
+        self.row_groups = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, _schema(table), compression="zstd")
+        elif fmt == "arrow":
+            import pyarrow as pa
+            self._sink = pa.OSFile(str(path), "wb")
+            self._writer = pa.ipc.new_file(self._sink, _schema(table))
+        else:
+            new_file = not path.exists()
+            self._file = open(path, "a", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            if new_file:
+                self._writer.writerow(self.columns)
+
+    def write_rows(self, rows: list[tuple]):
+        """행 묶음 1개 = row group / record batch 1개"""
+        self.row_groups += 1
+        if self.fmt == "csv":
+            self._writer.writerows(rows)
+            self._file.flush()
+            return
+
+        import pyarrow as pa
+
+        arrays = [pa.array(col) for col in zip(*rows)]
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=_schema(self.table)))
+
+    def close(self):
+        if self.fmt == "csv":
+            self._file.close()
+        else:
+            self._writer.close()
+            if self.fmt == "arrow":
+                self._sink.close()
+
+
+class SnapshotExporter:
+    """DominanceResult 스트리밍 내보내기
+
+    경로: {root}/{table}/date=YYYY-MM-DD/pair=BTC-USDT/part-{pid}-{시작시각}-{순번}.{ext}
+    파티션별로 row_group_size 행이 모이면 row group 하나로 기록한다.
+    Parquet/Arrow 는 닫혀서 footer 가 기록되어야 읽을 수 있으므로, 파일을
+    roll_row_groups 개 row group 마다, 그리고 roll_minutes 마다(날짜가 바뀔 때도)
+    닫고 새 파일로 넘어간다. 비정상 종료 시 잃는 범위는 열려 있던 파일뿐.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        fmt: str = "parquet",
+        row_group_size: int = 1024,
+        roll_row_groups: int = 16,
+        roll_minutes: float = 60,
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"지원하지 않는 내보내기 형식: {fmt}")
+        if fmt != "csv":
+            _require_pyarrow()
+        self.root = Path(root)
+        self.fmt = fmt
+        self.row_group_size = row_group_size
+        self.roll_row_groups = roll_row_groups
+        self.roll_seconds = roll_minutes * 60
+        self._buffers: dict[tuple[str, str, str], list[tuple]] = {}
+        self._writers: dict[tuple[str, str, str], _PartitionWriter] = {}
+        self._parts: dict[tuple[str, str, str], int] = {}  # 파티션별 파일 순번
+        self._date: Optional[str] = None
+        self._stamp = _stamp()
+        self._opened = time.monotonic()
+
+    def write(self, result: DominanceResult):
+        """결과 1건 버퍼링 (row group 단위로 파일 기록)"""
+        date = datetime.fromtimestamp(result.timestamp).strftime("%Y-%m-%d")
+        if date != self._date or time.monotonic() - self._opened >= self.roll_seconds:
+            self.close()
+            self._date = date
+            self._stamp = _stamp()
+            self._parts.clear()
+            self._opened = time.monotonic()
+
+        pair = _pair_key(result.ticker)
+        self._buffer(("snapshots", date, pair), (
+            result.timestamp,
+            result.ticker,
+            result.total_volume_usd,
+            result.korean_volume_usd,
+            result.global_volume_usd,
+            result.korean_dominance,
+        ))
+        for v in result.exchanges:
+            self._buffer(("exchanges", date, pair), (
+                result.timestamp,
+                result.ticker,
+                v.exchange,
+                v.region,
+                v.volume_24h,
+                v.volume_usd,
+                v.price,
+            ))
+
+    def _buffer(self, key: tuple[str, str, str], row: tuple):
+        rows = self._buffers.setdefault(key, [])
+        rows.append(row)
+        if len(rows) >= self.row_group_size:
+            self._flush_partition(key)
+
+    def _flush_partition(self, key: tuple[str, str, str]):
+        rows = self._buffers.pop(key, None)
+        if not rows:
+            return
+        writer = self._writers.get(key)
+        if writer is None:
+            table, date, pair = key
+            directory = self.root / table / f"date={date}" / f"pair={pair}"
+            # 같은 이름의 파일 (재시작/같은 시각 롤링) 은 덮어쓰지 않고 다음 순번
+            while True:
+                part = self._parts[key] = self._parts.get(key, -1) + 1
+                path = directory / f"part-{os.getpid()}-{self._stamp}-{part:04d}.{self.fmt}"
+                if not path.exists():
+                    break
+            writer = self._writers[key] = _PartitionWriter(path, table, self.fmt)
+        writer.write_rows(rows)
+        if writer.row_groups >= self.roll_row_groups:
+            # footer 기록 (여기까지는 비정상 종료에도 읽을 수 있음)
+            self._close_writer(self._writers.pop(key))
+
+    def flush(self):
+        """버퍼에 남은 행 기록"""
+        for key in list(self._buffers):
+            self._flush_partition(key)
+
+    def close(self):
+        """남은 행 기록 후 모든 파일 닫기"""
+        self.flush()
+        for writer in self._writers.values():
+            self._close_writer(writer)
+        self._writers.clear()
+
+    def _close_writer(self, writer: _PartitionWriter):
+        try:
+            writer.close()
+        except Exception as e:
+            logger.warning(f"내보내기 파일 닫기 실패 ({writer.path}): {e}")
+
+
+def _dataset(root: str, table: str, fmt: str):
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+
+    return ds.dataset(
+        str(Path(root) / table),
+        format="ipc" if fmt == "arrow" else fmt,
+        partitioning="hive",
+        # Arrow IPC 는 메모리 맵으로 읽어 복사 없이 접근
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def _filter(pairs: Optional[list[str]], start: Optional[str], end: Optional[str]):
+    import pyarrow.dataset as ds
+
+    expr = None
+    conditions = []
+    if pairs:
+        conditions.append(ds.field("pair").isin([_pair_key(p) for p in pairs]))
+    if start:
+        conditions.append(ds.field("date") >= start)
+    if end:
+        conditions.append(ds.field("date") <= end)
+    for cond in conditions:
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def iter_snapshots(
+    root: str,
+    table: str = "snapshots",
+    fmt: str = "parquet",
+    tickers: Optional[list[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+) -> Iterator:
+    """내보낸 데이터를 pandas DataFrame 묶음으로 순회 (전체를 메모리에 올리지 않음)
+
+    start/end 는 YYYY-MM-DD 날짜 파티션 기준.
+    """
+    if fmt == "csv":
+        import pandas as pd
+
+        for path in sorted((Path(root) / table).glob("date=*/pair=*/*.csv")):
+            date = path.parent.parent.name.split("=", 1)[1]
+            pair = path.parent.name.split("=", 1)[1]
+            if (start and date < start) or (end and date > end):
+                continue
+            if tickers and pair not in {_pair_key(t) for t in tickers}:
+                continue
+            yield from pd.read_csv(path, usecols=columns, chunksize=100_000)
+        return
+
+    _require_pyarrow()
+    dataset = _dataset(root, table, fmt)
+    for batch in dataset.to_batches(columns=columns, filter=_filter(tickers, start, end)):
+        yield batch.to_pandas()
+
+
+def load_snapshots(
+    root: str,
+    table: str = "snapshots",
+    fmt: str = "parquet",
+    tickers: Optional[list[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+):
+    """내보낸 데이터를 pandas DataFrame 으로 로드 (필요한 파티션/컬럼만 읽음)"""
+    import pandas as pd
+
+    if fmt == "csv":
+        frames = list(iter_snapshots(root, table, fmt, tickers, start, end, columns))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    _require_pyarrow()
+    dataset = _dataset(root, table, fmt)
+    return dataset.to_table(columns=columns, filter=_filter(tickers, start, end)).to_pandas()
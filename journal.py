@@ -0,0 +1,201 @@
+"""
+Journal Module
+스냅샷/알림 상태 append-only 저널 (재시작 시 복구)
+"""
+
+import logging
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+
+from dominance import DominanceResult
+from lru import LRUDict
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CDJ1"
+
+# 레코드: crc32(type+payload) | payload 길이 | type | payload
+_HEADER = struct.Struct("<IIB")
+_SNAPSHOT = struct.Struct("<ddddd")  # timestamp, korean_dominance, total, korean, global (+ ticker)
+_ALERT = struct.Struct("<d")         # timestamp (+ key)
+
+REC_SNAPSHOT = 1
+REC_ALERT = 2
+
+# Windows 에서 텍스트 모드 변환 방지
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+class SnapshotJournal:
+    """최근 스냅샷/알림 시각 저널
+
+    기록은 write() 즉시, fsync 는 fsync_interval 마다 묶어서 수행.
+    파일이 max_bytes 를 넘으면 현재 상태만 남기고 압축한다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 4 * 1024 * 1024,
+        fsync_interval: float = 1.0,
+        max_snapshots: int = 2000,
+        max_alerts: int = 10000,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.fsync_interval = fsync_interval
+        # 압축 후 남는 상태도 상한 유지 (오래 기록되지 않은 티커/알림 키부터 제거)
+        self.snapshots: LRUDict = LRUDict(max_snapshots)
+        self.alerts: LRUDict = LRUDict(max_alerts)
+        self._fd = None
+        self._size = 0
+        self._last_fsync = 0.0
+        self._dirty = False
+
+    # --- 복구 ---
+
+    def load(self) -> tuple[dict[str, DominanceResult], dict[str, float]]:
+        """저널 재생 -> (티커별 마지막 결과, 알림 시각)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = self.path.read_bytes() if self.path.exists() else b""
+
+        good = 0
+        if data[:len(MAGIC)] == MAGIC:
+            good = self._replay(data)
+        elif data:
+            logger.warning(f"저널 형식 불일치, 새로 시작: {self.path}")
+
+        self._open(truncate_to=good)
+        results = {
+            ticker: DominanceResult(
+                ticker=ticker,
+                total_volume_usd=total,
+                korean_volume_usd=korean,
+                global_volume_usd=global_,
+                korean_dominance=dominance,
+                exchanges=[],
+                timestamp=ts,
+            )
+            for ticker, (ts, dominance, total, korean, global_) in self.snapshots.items()
+        }
+        logger.info(f"저널 복구: 스냅샷 {len(results)}개, 알림 {len(self.alerts)}개")
+        return results, dict(self.alerts)
+
+    def _replay(self, data: bytes) -> int:
+        """레코드 적용 -> 마지막 정상 레코드 끝 오프셋 (손상된 꼬리는 버림)"""
+        offset = len(MAGIC)
+        while offset + _HEADER.size <= len(data):
+            crc, length, rec_type = _HEADER.unpack_from(data, offset)
+            start = offset + _HEADER.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(bytes([rec_type]) + payload) != crc:
+                logger.warning(f"저널 손상 레코드 이후 무시 (offset {offset})")
+                break
+            self._apply(rec_type, payload)
+            offset = start + length
+        return offset
+
+    def _apply(self, rec_type: int, payload: bytes):
+        if rec_type == REC_SNAPSHOT:
+            values = _SNAPSHOT.unpack_from(payload)
+            self.snapshots[payload[_SNAPSHOT.size:].decode()] = values
+        elif rec_type == REC_ALERT:
+            (ts,) = _ALERT.unpack_from(payload)
+            self.alerts[payload[_ALERT.size:].decode()] = ts
+
+    # --- 기록 ---
+
+    def _open(self, truncate_to: int):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | _O_BINARY, 0o644)
+        if truncate_to < len(MAGIC):
+            os.ftruncate(self._fd, 0)
+            os.write(self._fd, MAGIC)
+            truncate_to = len(MAGIC)
+        else:
+            os.ftruncate(self._fd, truncate_to)
+        os.lseek(self._fd, truncate_to, os.SEEK_SET)
+        self._size = truncate_to
+
+    @staticmethod
+    def _encode(rec_type: int, payload: bytes) -> bytes:
+        crc = zlib.crc32(bytes([rec_type]) + payload)
+        return _HEADER.pack(crc, len(payload), rec_type) + payload
+
+    def _append(self, rec_type: int, payload: bytes):
+        self._apply(rec_type, payload)
+        if self._fd is None:
+            return
+        record = self._encode(rec_type, payload)
+        os.write(self._fd, record)
+        self._size += len(record)
+        self._dirty = True
+
+        if self._size > self.max_bytes:
+            self.compact()
+        elif time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self.sync()
+
+    def record_snapshot(self, result: DominanceResult):
+        payload = _SNAPSHOT.pack(
+            result.timestamp,
+            result.korean_dominance,
+            result.total_volume_usd,
+            result.korean_volume_usd,
+            result.global_volume_usd,
+        ) + result.ticker.encode()
+        self._append(REC_SNAPSHOT, payload)
+
+    def record_alert(self, key: str, timestamp: float):
+        self._append(REC_ALERT, _ALERT.pack(timestamp) + key.encode())
+
+    def sync(self):
+        """쌓인 기록 fsync"""
+        if self._fd is not None and self._dirty:
+            os.fsync(self._fd)
+            self._dirty = False
+        self._last_fsync = time.monotonic()
+
+    def compact(self):
+        """현재 상태만 새 파일에 기록 후 원자적 교체"""
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        chunks = [MAGIC]
+        for ticker, values in self.snapshots.items():
+            chunks.append(self._encode(REC_SNAPSHOT, _SNAPSHOT.pack(*values) + ticker.encode()))
+        for key, ts in self.alerts.items():
+            chunks.append(self._encode(REC_ALERT, _ALERT.pack(ts) + key.encode()))
+        data = b"".join(chunks)
+
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if self._fd is not None:
+            os.close(self._fd)
+        os.replace(tmp, self.path)
+        _fsync_dir(self.path.parent)
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_APPEND | _O_BINARY)
+        self._size = len(data)
+        self._dirty = False
+        self._last_fsync = time.monotonic()
+        logger.debug(f"저널 압축: {self._size} bytes")
+
+    def close(self):
+        if self._fd is not None:
+            self.sync()
+            os.close(self._fd)
+            self._fd = None
+
+
+def _fsync_dir(directory: Path):
+    """디렉토리 fsync (교체한 파일 이름까지 디스크에 기록, Windows 는 미지원이라 생략)"""
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
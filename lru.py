@@ -0,0 +1,42 @@
+"""
+LRU Module
+크기 상한 dict (장기 실행 시 티커/키가 계속 늘어도 메모리 고정)
+"""
+
+from collections import OrderedDict
+
+# config.yaml limits 섹션 기본값
+DEFAULT_LIMITS = {
+    "results": 2000,          # 티커별 직전 결과 (급변 감지 기준)
+    "alert_times": 10000,     # 알림 쿨다운 시각 (구독자 x 티커)
+    "premium_stats": 2000,    # 티커별 프리미엄 이동 통계
+    "validator_keys": 20000,  # 거래량 검증 상태 (거래소 x 티커 x 기간)
+    "volume_rings_mb": 256,   # 체결 집계 링 버퍼 전체 크기 (MB, 링 수 = 이 값 / 링 1개 크기)
+}
+
+
+def get_limit(config: dict, name: str) -> int:
+    """config 의 limits 섹션 값 (없으면 기본값)"""
+    return (config.get("limits") or {}).get(name, DEFAULT_LIMITS[name])
+
+
+class LRUDict(OrderedDict):
+    """최대 maxsize 개 dict: 넘치면 가장 오래 기록되지 않은 키부터 제거
+
+    조회는 순서를 바꾸지 않고 기록(__setitem__)만 최신으로 올린다
+    (사이클마다 다시 기록되는 키는 남고, 더 이상 오지 않는 키가 밀려남).
+    """
+
+    def __init__(self, maxsize: int, *args, **kwargs):
+        self.maxsize = maxsize
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self.move_to_end(key)
+        super().__setitem__(key, value)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+    def __reduce__(self):
+        return self.__class__, (self.maxsize, list(self.items()))
@@ -7,27 +7,42 @@ CEX Dominance Bot
     python main.py              # 실시간 모니터링
     python main.py --once       # 1회 조회
     python main.py --ticker BTC # 특정 티커만
+    python main.py --workers 4  # 워커 프로세스 4개로 샤딩
+    python main.py --import-time # 시작 경로 import 시간 측정
+    python main.py --export data/export # 사이클 결과 Parquet 내보내기
+    python main.py --tui        # 터미널 대시보드 (전체 티커 표)
+    python main.py --record data/session.jsonl.gz        # 거래소 응답 기록
+    python main.py --replay data/session.jsonl.gz --profile # 기록 재생 + 단계별 프로파일
+    python main.py --watch-config # config.yaml 변경 시 재시작 없이 반영
+    python main.py --soak 1000000 # 가짜 거래소로 장기 실행 메모리 점검
 """
 
 import asyncio
 import argparse
+import copy
 import logging
 import os
+import signal
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 # Windows 콘솔 UTF-8 설정
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding='utf-8')
     sys.stderr.reconfigure(encoding='utf-8')
 
-import yaml
-
-from dominance import DominanceCalculator, DominanceResult
+import tracing
+from dominance import DominanceCalculator, DominanceResult, get_regions, merge_total
+from journal import SnapshotJournal
+from lru import LRUDict, get_limit
+from premium import PremiumSnapshot, PremiumTracker
+from screener import DominanceScreener, ScreenerRow
+from subscriptions import Subscription, create_registry
 
 # 로깅 설정
-def setup_logging(config: dict):
+def setup_logging(config: dict, console: bool = True):
     log_config = config.get("logging", {})
     level = getattr(logging, log_config.get("level", "INFO"))
 
@@ -36,9 +51,19 @@ def setup_logging(config: dict):
     if log_file:
         Path(log_file).parent.mkdir(parents=True, exist_ok=True)
 
-    handlers = [logging.StreamHandler()]
+    # TUI 모드에서는 화면이 깨지지 않도록 콘솔 로그 생략
+    handlers = [logging.StreamHandler()] if console else []
     if log_file:
-        handlers.append(logging.FileHandler(log_file, encoding="utf-8"))
+        # 장기 실행 시 로그 파일이 무한히 커지지 않도록 크기 기준 교체
+        from logging.handlers import RotatingFileHandler
+        handlers.append(RotatingFileHandler(
+            log_file,
+            maxBytes=log_config.get("max_bytes", 10 * 1024 * 1024),
+            backupCount=log_config.get("backup_count", 5),
+            encoding="utf-8",
+        ))
+    if not handlers:
+        handlers.append(logging.NullHandler())
 
     logging.basicConfig(
         level=level,
@@ -48,6 +73,47 @@ def setup_logging(config: dict):
     )
 
 
+def load_config(path: Path) -> dict:
+    """설정 파일 로드 (yaml 은 필요할 때만 import)"""
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def report_import_time(top: int = 15):
+    """--once 시작 경로의 모듈별 import 시간 출력 (python -X importtime)"""
+    import subprocess
+
+    code = "import main, dominance, yaml, ccxt.async_support"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).parent,
+    )
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        head, cumulative, name = line.split("|")
+        # 최상위 import 만 (들여쓰기 없는 모듈)
+        if name.startswith("  "):
+            continue
+        rows.append((int(cumulative), int(head.split(":")[1]), name.strip()))
+
+    if proc.returncode != 0:
+        print(proc.stderr.strip().splitlines()[-1])
+
+    total = sum(r[0] for r in rows)
+    print(f"\n  {'모듈':<40} {'누적(ms)':>10} {'자체(ms)':>10}")
+    print("  " + "-" * 62)
+    for cumulative, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {name:<40} {cumulative / 1000:>10.1f} {self_us / 1000:>10.1f}")
+    print(f"\n  전체 import 시간: {total / 1000:.1f}ms")
+
+
 def format_volume(volume: float) -> str:
     """거래량 포맷팅"""
     if volume >= 1_000_000_000:
@@ -59,7 +125,12 @@ def format_volume(volume: float) -> str:
     return f"${volume:.2f}"
 
 
-def print_result(result: DominanceResult):
+def region_label(region: str) -> str:
+    """지역 표시 이름"""
+    return {"korean": "한국", "global": "글로벌"}.get(region, region)
+
+
+def print_result(result: DominanceResult, premium: PremiumSnapshot = None):
     """결과 출력"""
     timestamp = datetime.fromtimestamp(result.timestamp).strftime("%Y-%m-%d %H:%M:%S")
 
@@ -77,26 +148,70 @@ def print_result(result: DominanceResult):
     print(f"  [{'█' * korean_bar}{'░' * global_bar}]")
     print(f"   한국 {format_volume(result.korean_volume_usd)} | 글로벌 {format_volume(result.global_volume_usd)}")
 
+    # 현물+무기한 선물 지배력
+    if result.korean_dominance_spot_perp is not None:
+        perp_total = sum(result.perp_region_volumes.values())
+        print(f"   현물+무기한 {result.korean_dominance_spot_perp:.2f}% (무기한 {format_volume(perp_total)})")
+
+    # 지역이 3개 이상이면 지역별 점유율
+    if len(result.dominance) > 2:
+        shares = " | ".join(
+            f"{region_label(r)} {d:.1f}%"
+            for r, d in sorted(result.dominance.items(), key=lambda x: x[1], reverse=True)
+        )
+        print(f"   {shares}")
+
+    # 호가 깊이 지배력
+    if result.korean_depth_dominance:
+        depth = " | ".join(f"±{band} {share:.1f}%" for band, share in result.korean_depth_dominance.items())
+        print(f"  호가 깊이 한국 점유율: {depth}")
+
+    # 한국 프리미엄
+    if premium:
+        zscore = f"{premium.zscore:+.2f}σ" if premium.zscore is not None else "-"
+        print(f"\n  한국 프리미엄: {premium.premium:+.2f}% (평균 {premium.mean:+.2f}%, z {zscore})")
+
     # 거래소별 상세
     print(f"\n  {'거래소':<12} {'지역':<8} {'거래량(USD)':<15} {'점유율':<10}")
     print("  " + "-" * 50)
 
     for vol in result.exchanges:
         share = vol.volume_usd / result.total_volume_usd * 100 if result.total_volume_usd > 0 else 0
-        region_kr = "한국" if vol.region == "korean" else "글로벌"
-        print(f"  {vol.exchange:<12} {region_kr:<8} {format_volume(vol.volume_usd):<15} {share:.1f}%")
+        region_kr = region_label(vol.region)
+        line = f"  {vol.exchange:<12} {region_kr:<8} {format_volume(vol.volume_usd):<15} {share:.1f}%"
+        if premium and vol.exchange in premium.exchange_premiums:
+            line += f"  (P {premium.exchange_premiums[vol.exchange]:+.2f}%)"
+        if vol.flag:
+            line += f"  ⚠ {vol.flag}"
+        print(line)
+
+    print("=" * 60)
 
+
+def print_screener(rows: list[ScreenerRow], metric: str):
+    """스크리너 상위 N 출력"""
+    titles = {"dominance": "한국 지배력", "change": "지배력 상승", "korean_volume": "한국 거래량"}
+    print("\n" + "=" * 60)
+    print(f"  TOP {len(rows)} - {titles.get(metric, metric)}")
+    print("=" * 60)
+    print(f"  {'티커':<14} {'지배력':>8} {'변화':>8} {'한국 거래량':>14}")
+    print("  " + "-" * 50)
+    for row in rows:
+        print(
+            f"  {row.ticker:<14} {row.korean_dominance:>7.1f}% {row.change:>+7.1f}p "
+            f"{format_volume(row.korean_volume_usd):>14}"
+        )
     print("=" * 60)
 
 
-async def send_telegram_alert(config: dict, result: DominanceResult, message: str):
-    """텔레그램 알림 전송"""
+async def send_telegram_alert(config: dict, result: DominanceResult, message: str, chat_id: str = None):
+    """텔레그램 알림 전송 (chat_id 없으면 설정의 기본 채팅방)"""
     telegram_config = config.get("telegram", {})
     if not telegram_config.get("enabled"):
         return
 
     bot_token = telegram_config.get("bot_token") or os.getenv("TELEGRAM_BOT_TOKEN")
-    chat_id = telegram_config.get("chat_id") or os.getenv("TELEGRAM_CHAT_ID")
+    chat_id = chat_id or telegram_config.get("chat_id") or os.getenv("TELEGRAM_CHAT_ID")
 
     if not bot_token or not chat_id:
         return
@@ -109,8 +224,9 @@ async def send_telegram_alert(config: dict, result: DominanceResult, message: st
             "text": message,
             "parse_mode": "HTML",
         }
-        async with aiohttp.ClientSession() as session:
-            await session.post(url, json=payload)
+        with tracing.span("send_telegram_alert"):
+            async with aiohttp.ClientSession() as session:
+                await session.post(url, json=payload)
     except Exception as e:
         logging.warning(f"텔레그램 전송 실패: {e}")
 
@@ -120,128 +236,561 @@ class DominanceBot:
 
     def __init__(self, config: dict):
         self.config = config
-        self.calculator = DominanceCalculator(config)
-        self.last_results: dict[str, DominanceResult] = {}
-        self.last_alert_time: dict[str, float] = {}
+        workers = config.get("sharding", {}).get("workers", 0)
+        if workers > 1:
+            from shard import ShardedCalculator
+            self.calculator = ShardedCalculator(config, workers)
+        else:
+            self.calculator = DominanceCalculator(config)
+        # 티커/알림 키가 계속 바뀌어도 상한 유지 (오래 갱신되지 않은 키부터 제거)
+        self.last_results: dict[str, DominanceResult] = LRUDict(get_limit(config, "results"))
+        self.last_alert_time: dict[str, float] = LRUDict(get_limit(config, "alert_times"))
+        self.subscriptions = create_registry(config)
+        self.dashboard = None
+        self.profiler = None
+
+        journal_config = config.get("journal", {})
+        self.journal: Optional[SnapshotJournal] = None
+        if journal_config.get("enabled", True):
+            self.journal = SnapshotJournal(
+                journal_config.get("path", "data/journal.bin"),
+                max_bytes=journal_config.get("max_bytes", 4 * 1024 * 1024),
+                fsync_interval=journal_config.get("fsync_interval", 1.0),
+                max_snapshots=get_limit(config, "results"),
+                max_alerts=get_limit(config, "alert_times"),
+            )
+
+        self.screener: Optional[DominanceScreener] = None
+        self._configure_screener(config)
+
+        export_config = config.get("export", {})
+        self.exporter = None
+        if export_config.get("enabled", False):
+            from export import SnapshotExporter
+            self.exporter = SnapshotExporter(
+                export_config.get("path", "data/export"),
+                fmt=export_config.get("format", "parquet"),
+                row_group_size=export_config.get("row_group_size", 1024),
+                roll_row_groups=export_config.get("roll_row_groups", 16),
+                roll_minutes=export_config.get("roll_minutes", 60),
+            )
+
+        self.premium: Optional[PremiumTracker] = None
+        self._configure_premium(config)
+
+        # 설정 파일 감시 (--watch-config), 비교 기준은 마지막으로 읽은 파일 내용
+        # (실행 중 설정은 상장 티커 필터/재시작 필요 섹션 유지로 파일과 다를 수 있음)
+        self.watcher = None
+        self._source_config = copy.deepcopy(config)
+
+    def _configure_screener(self, config: dict):
+        """스크리너 생성/해제 (이미 있으면 순위 상태 유지하고 값만 교체)"""
+        screener_config = config.get("screener", {})
+        if not screener_config.get("enabled", False):
+            self.screener = None
+        elif self.screener:
+            self.screener.min_total_volume_usd = screener_config.get("min_total_volume_usd", 100_000)
+        else:
+            self.screener = DominanceScreener(screener_config.get("min_total_volume_usd", 100_000))
+
+    def _configure_premium(self, config: dict):
+        """프리미엄 추적기 생성/해제 (이미 있으면 이동 통계 유지하고 값만 교체)"""
+        premium_config = config.get("premium", {})
+        usd_regions = [r for r, c in get_regions(config).items() if not c.get("fiat")]
+        if not premium_config.get("enabled", True):
+            self.premium = None
+        elif self.premium:
+            self.premium.halflife = premium_config.get("halflife", 60)
+            self.premium.min_samples = premium_config.get("min_samples", 10)
+            self.premium.usd_regions = set(usd_regions)
+        else:
+            self.premium = PremiumTracker(
+                halflife=premium_config.get("halflife", 60),
+                min_samples=premium_config.get("min_samples", 10),
+                usd_regions=usd_regions,
+                max_tickers=get_limit(config, "premium_stats"),
+            )
+
+    def listed_tickers(self, tickers: list[str]) -> list[str]:
+        """상장되지 않은 티커 제외 (연결된 거래소 마켓 기준, 네트워크 요청 없음)"""
+        if not isinstance(self.calculator, DominanceCalculator):
+            return tickers
+        index = self.calculator.build_symbol_index()
+        if len(index) == 0:
+            return tickers
+        valid = []
+        for ticker in tickers:
+            if index.normalize(ticker):
+                valid.append(ticker)
+            else:
+                hint = ", ".join(index.complete(ticker, 5)) or "없음"
+                print(f"상장되지 않은 티커 제외: {ticker} (추천: {hint})")
+        return valid
+
+    async def apply_config(self, config: dict):
+        """새 설정 반영: 바뀐 부분만 적용 (변경 없는 거래소 연결/캐시/알림 상태 유지)"""
+        from reload import diff_config
+
+        diff = diff_config(self._source_config, config)
+        if diff.empty:
+            return
+        self._source_config = copy.deepcopy(config)
+        # 계산기별 추가 제약 (샤딩: 워커 거래소 배치가 시작 시 고정)
+        restart = diff.restart_required | (diff.sections & getattr(self.calculator, "RESTART_SECTIONS", set()))
+        if "exchanges" in restart:
+            diff.exchanges_added, diff.exchanges_removed = [], []
+        if restart:
+            logging.warning(f"재시작 후 반영되는 설정 (현재 값 유지): {', '.join(sorted(restart))}")
+            for section in restart:
+                if section in self.config:
+                    config[section] = self.config[section]
+                else:
+                    config.pop(section, None)
+
+        diff.sections -= restart
+        if diff.empty:
+            return
+        await self.calculator.reconfigure(config, diff)
+        config["tickers"] = self.listed_tickers(config.get("tickers") or [])
+        if diff.sections & {"screener"}:
+            self._configure_screener(config)
+        if diff.sections & {"premium", "regions", "exchanges"}:
+            self._configure_premium(config)
+        subscriptions = self.subscriptions
+        if diff.sections & {"alerts", "subscriptions"}:
+            subscriptions = create_registry(config)
+
+        # 알림/주기/티커는 다음 사이클부터 새 값 사용 (한 번에 교체)
+        self.config, self.subscriptions = config, subscriptions
+        logging.info(f"설정 재로드: {diff.summary()}")
+        self.notify(f"설정 재로드: {diff.summary()}")
+
+    async def reload_config(self) -> bool:
+        """설정 파일이 바뀌었으면 반영 (반영 여부)"""
+        if not self.watcher:
+            return False
+        config = self.watcher.poll()
+        if config is None:
+            return False
+        try:
+            await self.apply_config(config)
+        except Exception as e:
+            logging.error(f"설정 반영 실패: {e}")
+            return False
+        return True
+
+    async def idle(self, started: float):
+        """다음 사이클까지 대기 (설정 감시 중이면 변경을 바로 반영, 주기도 새 값 기준)"""
+        import time
+
+        while True:
+            remaining = started + self.config.get("update_interval", 60) - time.monotonic()
+            if remaining <= 0:
+                return
+            if not self.watcher:
+                await asyncio.sleep(remaining)
+                return
+            await asyncio.sleep(min(remaining, self.watcher.interval))
+            await self.reload_config()
 
     async def start(self):
         """봇 시작"""
+        self.restore_state()
         await self.calculator.initialize()
+        if isinstance(self.calculator, DominanceCalculator):
+            self.calculator.start_depth(self.config.get("tickers", ["BTC/USDT"]))
 
     async def stop(self):
-        """봇 종료"""
+        """봇 종료 (파일부터 닫아 워커 종료 대기 중 강제 종료되어도 기록 보존)"""
+        if self.exporter:
+            self.exporter.close()
+        if self.journal:
+            self.journal.close()
         await self.calculator.close()
 
-    async def check_alerts(self, result: DominanceResult):
-        """알림 조건 체크"""
+    def stage(self, name: str, **args):
+        """프로파일 구간 (--profile 이 아니면 trace span, 둘 다 꺼져 있으면 no-op)"""
+        if self.profiler:
+            return self.profiler.stage(name)
+        return tracing.span(name, **args)
+
+    def notify(self, message: str):
+        """알림 콘솔 표시 (TUI 모드면 상태줄)"""
+        text = message.replace('<b>', '').replace('</b>', '')
+        if self.dashboard:
+            self.dashboard.notify(text.replace("\n", " · "))
+        else:
+            print(f"\n⚠️  알림: {text}")
+
+    def restore_state(self):
+        """저널에서 직전 스냅샷/알림 쿨다운 복구"""
+        if not self.journal:
+            return
         import time
 
-        alerts_config = self.config.get("alerts", {})
-        cooldown = alerts_config.get("cooldown_seconds", 300)
-        threshold = alerts_config.get("korean_dominance_threshold", 25.0)
-        change_threshold = alerts_config.get("dominance_change_threshold", 5.0)
+        results, alerts = self.journal.load()
+        max_age = self.config.get("journal", {}).get("restore_max_age", 3600)
+        now = time.time()
+        # 너무 오래된 스냅샷은 급변 감지 기준으로 쓰지 않음
+        self.last_results.update({t: r for t, r in results.items() if now - r.timestamp <= max_age})
+        self.last_alert_time.update(alerts)
+
+    def _joint_message(self, result: DominanceResult, premium: Optional[PremiumSnapshot]) -> Optional[str]:
+        """지배력 + 프리미엄 공동 신호 문구 (프리미엄 조건 미충족 시 None)"""
+        if not premium:
+            return None
+        premium_config = self.config.get("premium", {})
+        joint_premium = premium_config.get("joint_premium_threshold", 2.0)
+        joint_zscore = premium_config.get("joint_zscore_threshold", 2.0)
+        premium_spike = premium.zscore is not None and premium.zscore >= joint_zscore
+        if premium.premium < joint_premium and not premium_spike:
+            return None
+        zscore = f"{premium.zscore:+.1f}σ" if premium.zscore is not None else "-"
+        return (
+            f"🔥 <b>{result.ticker} 지배력 + 프리미엄 동시 급등</b>\n"
+            f"지배력 {result.korean_dominance:.1f}% · 프리미엄 {premium.premium:+.2f}% ({zscore})"
+        )
+
+    async def check_alerts(self, result: DominanceResult, premium: PremiumSnapshot = None):
+        """알림 조건 체크 (해당 티커 구독자만 평가, 구독자별 쿨다운)"""
+        import time
 
         ticker = result.ticker
         now = time.time()
+        prev = self.last_results.get(ticker)
+        change = result.korean_dominance - prev.korean_dominance if prev else None
+
+        self.subscriptions.refresh()
+        over, moved = self.subscriptions.match(ticker, result.korean_dominance, change)
+
+        # 구독자별 메시지 (같은 문구는 한 번만 생성)
+        pending: dict[str, tuple[Subscription, list[str]]] = {}
+        if over:
+            # 한국 지배력 임계값 초과 (+ 프리미엄 공동 신호)
+            joint = self._joint_message(result, premium)
+            threshold_messages: dict[float, str] = {}
+            for sub in over:
+                threshold = sub.korean_dominance_threshold
+                if threshold not in threshold_messages:
+                    threshold_messages[threshold] = (
+                        f"🇰🇷 <b>{ticker} 한국 지배력 {result.korean_dominance:.1f}%</b>\n"
+                        f"임계값 {threshold}% 초과!"
+                    )
+                messages = pending.setdefault(sub.id, (sub, []))[1]
+                messages.append(threshold_messages[threshold])
+                if joint:
+                    messages.append(joint)
+
+        if moved:
+            # 지배력 급변 감지
+            direction = "📈" if change > 0 else "📉"
+            change_message = (
+                f"{direction} <b>{ticker} 지배력 급변</b>\n"
+                f"{prev.korean_dominance:.1f}% → {result.korean_dominance:.1f}% "
+                f"({change:+.1f}%)"
+            )
+            for sub in moved:
+                pending.setdefault(sub.id, (sub, []))[1].append(change_message)
+
+        # 알림 전송 (콘솔은 문구당 1번, 텔레그램은 구독자별)
+        shown = set()
+        sends = []
+        for sub, messages in pending.values():
+            key = sub.cooldown_key(ticker)
+            if now - self.last_alert_time.get(key, 0) < sub.cooldown_seconds:
+                continue
+            for msg in messages:
+                if msg not in shown:
+                    shown.add(msg)
+                    self.notify(msg)
+                sends.append(send_telegram_alert(self.config, result, msg, sub.chat_id))
+            self.last_alert_time[key] = now
+            if self.journal:
+                self.journal.record_alert(key, now)
+        if sends:
+            await asyncio.gather(*sends)
 
-        # 쿨다운 체크
-        if ticker in self.last_alert_time:
-            if now - self.last_alert_time[ticker] < cooldown:
-                return
+        self.last_results[ticker] = result
+        if self.journal:
+            self.journal.record_snapshot(result)
 
-        messages = []
+    async def check_screener_alerts(self):
+        """스크리너 급등 알림 (직전 사이클 대비 지배력 상승)
 
-        # 한국 지배력 임계값 초과
-        if result.korean_dominance >= threshold:
-            messages.append(
-                f"🇰🇷 <b>{ticker} 한국 지배력 {result.korean_dominance:.1f}%</b>\n"
-                f"임계값 {threshold}% 초과!"
-            )
+        screener.alert_change_threshold 를 넘은 자산을 구독 레지스트리로 보낸다:
+        해당 티커(또는 전체)를 구독하고 급변 임계값이 상승폭 이하인 구독자만, 구독자별 쿨다운.
+        """
+        import time
 
-        # 지배력 급변 감지
-        if ticker in self.last_results:
-            prev = self.last_results[ticker]
-            change = abs(result.korean_dominance - prev.korean_dominance)
-            if change >= change_threshold:
-                direction = "📈" if result.korean_dominance > prev.korean_dominance else "📉"
-                messages.append(
-                    f"{direction} <b>{ticker} 지배력 급변</b>\n"
-                    f"{prev.korean_dominance:.1f}% → {result.korean_dominance:.1f}% "
-                    f"({'+' if change > 0 else ''}{change:.1f}%)"
-                )
-
-        # 알림 전송
-        for msg in messages:
-            print(f"\n⚠️  알림: {msg.replace('<b>', '').replace('</b>', '')}")
-            await send_telegram_alert(self.config, result, msg)
-            self.last_alert_time[ticker] = now
+        screener_config = self.config.get("screener", {})
+        change_threshold = screener_config.get("alert_change_threshold", 10.0)
+        now = time.time()
 
-        self.last_results[ticker] = result
+        self.subscriptions.refresh()
+        sends = []
+        for row in self.screener.top("change", screener_config.get("top_n", 10)):
+            if row.change < change_threshold:
+                break
+            _, moved = self.subscriptions.match(row.ticker, row.korean_dominance, row.change)
+            msg = (
+                f"🚀 <b>{row.ticker} 한국 지배력 급등</b>\n"
+                f"{row.korean_dominance - row.change:.1f}% → {row.korean_dominance:.1f}% "
+                f"(+{row.change:.1f}%p) · 한국 거래량 {format_volume(row.korean_volume_usd)}"
+            )
+            shown = False
+            for sub in moved:
+                key = sub.cooldown_key(f"screener:{row.ticker}")
+                if now - self.last_alert_time.get(key, 0) < sub.cooldown_seconds:
+                    continue
+                if not shown:
+                    shown = True
+                    self.notify(msg)
+                sends.append(send_telegram_alert(self.config, None, msg, sub.chat_id))
+                self.last_alert_time[key] = now
+                if self.journal:
+                    self.journal.record_alert(key, now)
+        if sends:
+            await asyncio.gather(*sends)
+
+    async def run_screener(self):
+        """상장 자산 전체 스크리닝 (거래소당 1회 일괄 조회)"""
+        screener_config = self.config.get("screener", {})
+        results = await self.calculator.calculate_universe()
+        if self.screener.update_many(results.values()):
+            metric = screener_config.get("sort", "change")
+            if not self.dashboard:
+                print_screener(self.screener.top(metric, screener_config.get("top_n", 10)), metric)
+            await self.check_screener_alerts()
 
     async def run_once(self, tickers: list[str] = None):
         """1회 조회"""
         tickers = tickers or self.config.get("tickers", ["BTC/USDT"])
+        with tracing.trace("run_once", tickers=len(tickers)):
+            await self._run_cycle(tickers)
 
+    async def _run_cycle(self, tickers: list[str]):
+        with self.stage("calculate", tickers=len(tickers)):
+            results = await self.calculator.calculate_many(tickers)
         for ticker in tickers:
-            result = await self.calculator.calculate(ticker)
+            result = results.get(ticker)
             if result:
-                print_result(result)
-                await self.check_alerts(result)
+                premium = None
+                if self.premium:
+                    premium = self.premium.update(result, self.calculator.krw_rate)
+                if self.dashboard:
+                    self.dashboard.update(result, premium)
+                else:
+                    print_result(result, premium)
+                with self.stage("check_alerts", ticker=ticker):
+                    await self.check_alerts(result, premium)
+                if self.exporter:
+                    self.exporter.write(result)
+
+        if self.dashboard:
+            self.dashboard.retain(ticker for ticker in tickers if results.get(ticker))
+
+        if self.profiler:
+            with self.stage("calculate_total_market"):
+                merge_total([r for r in results.values() if r])
+
+        if self.screener:
+            with self.stage("screener"):
+                await self.run_screener()
 
     async def run_loop(self):
-        """실시간 모니터링 루프"""
+        """실시간 모니터링 루프 (티커/주기는 사이클마다 현재 설정에서 읽음)"""
+        import time
+
         interval = self.config.get("update_interval", 60)
         tickers = self.config.get("tickers", ["BTC/USDT"])
 
+        if self.dashboard:
+            await self.run_dashboard()
+            return
+
         print(f"\n🚀 CEX Dominance Bot 시작")
         print(f"   티커: {', '.join(tickers)}")
         print(f"   업데이트 주기: {interval}초")
+        if self.watcher:
+            print(f"   설정 감시: {self.watcher.path.name}")
         print(f"   종료: Ctrl+C\n")
 
         try:
             while True:
-                await self.run_once(tickers)
-                await asyncio.sleep(interval)
+                started = time.monotonic()
+                await self.run_once()
+                await self.idle(started)
         except KeyboardInterrupt:
             print("\n\n👋 봇 종료")
 
+    async def run_replay(self, max_cycles: int = 0):
+        """기록된 세션을 소진할 때까지 사이클 재생"""
+        session = self.calculator.session
+        cycles = 0
+        while not session.exhausted:
+            await self.run_once()
+            cycles += 1
+            if max_cycles and cycles >= max_cycles:
+                break
+        print(f"\n재생 완료: {cycles}사이클 ({session.speed} 속도)")
+
+    async def run_dashboard(self):
+        """TUI 모드: 조회 루프와 화면 갱신을 별도 태스크로 실행 (q 로 종료)"""
+        import time
+
+        async def fetch_loop():
+            while True:
+                started = time.monotonic()
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logging.error(f"조회 실패: {e}")
+                    self.dashboard.notify(f"조회 실패: {e}")
+                await self.idle(started)
+
+        fetch = asyncio.create_task(fetch_loop())
+        try:
+            await self.dashboard.run()
+        finally:
+            fetch.cancel()
+            try:
+                await fetch
+            except asyncio.CancelledError:
+                pass
+
+
+def apply_overrides(config: dict, args) -> dict:
+    """CLI 인자로 설정 덮어쓰기 (설정 재로드 시에도 같은 인자 적용)"""
+    # 티커 오버라이드
+    if args.ticker:
+        ticker = args.ticker.upper()
+        if "/" not in ticker:
+            ticker = f"{ticker}/USDT"
+        config["tickers"] = [ticker]
+
+    if args.workers is not None:
+        config.setdefault("sharding", {})["workers"] = args.workers
+
+    if args.record or args.replay:
+        # 세션은 프로세스 1개 기준 (샤딩 워커 응답은 기록하지 않음)
+        config.setdefault("sharding", {})["workers"] = 0
+        if args.record:
+            config["session"] = {"mode": "record", "path": args.record}
+        else:
+            config["session"] = {"mode": "replay", "path": args.replay, "speed": args.speed}
+            # 재생은 실제 알림 전송/상태 저장 없이
+            config.setdefault("telegram", {})["enabled"] = False
+            config.setdefault("journal", {})["enabled"] = False
+
+    if args.export or args.export_format:
+        export_config = config.setdefault("export", {})
+        export_config["enabled"] = True
+        if args.export:
+            export_config["path"] = args.export
+        if args.export_format:
+            export_config["format"] = args.export_format
+    return config
+
 
 async def main():
     parser = argparse.ArgumentParser(description="CEX Dominance Bot")
     parser.add_argument("--once", action="store_true", help="1회만 조회")
     parser.add_argument("--ticker", type=str, help="특정 티커만 조회 (예: BTC)")
     parser.add_argument("--config", type=str, default="config.yaml", help="설정 파일 경로")
+    parser.add_argument("--workers", type=int, help="샤딩 워커 프로세스 수 (1 이하: 단일 프로세스)")
+    parser.add_argument("--import-time", action="store_true", help="시작 경로 import 시간 측정")
+    parser.add_argument("--export", type=str, metavar="DIR", help="사이클 결과 내보내기 경로")
+    parser.add_argument("--export-format", choices=["parquet", "arrow", "csv"], help="내보내기 형식")
+    parser.add_argument("--tui", action="store_true", help="터미널 대시보드 모드")
+    parser.add_argument("--record", type=str, metavar="PATH", help="거래소 응답을 세션 파일로 기록")
+    parser.add_argument("--replay", type=str, metavar="PATH", help="기록된 세션 재생 (네트워크 요청 없음)")
+    parser.add_argument("--speed", choices=["original", "max"], default="max", help="재생 속도")
+    parser.add_argument("--cycles", type=int, default=0, help="재생할 최대 사이클 수 (0: 세션 끝까지)")
+    parser.add_argument("--profile", action="store_true", help="단계별 cProfile/tracemalloc 요약 출력")
+    parser.add_argument("--watch-config", action="store_true", help="설정 파일 변경 시 재시작 없이 반영")
+    parser.add_argument("--soak", type=int, metavar="CYCLES", help="가짜 거래소로 지정 사이클 실행 + 메모리 추이 점검")
     args = parser.parse_args()
 
+    if args.import_time:
+        report_import_time()
+        return
+
     # 설정 로드
     config_path = Path(__file__).parent / args.config
     if not config_path.exists():
         print(f"설정 파일 없음: {config_path}")
         sys.exit(1)
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
-
-    setup_logging(config)
+    config = apply_overrides(load_config(config_path), args)
+    if args.soak:
+        from soak import prepare_config
+        config = prepare_config(config)
 
-    # 티커 오버라이드
-    if args.ticker:
-        ticker = args.ticker.upper()
-        if "/" not in ticker:
-            ticker = f"{ticker}/USDT"
-        config["tickers"] = [ticker]
+    setup_logging(config, console=not args.tui)
+    tracing.configure(config.get("tracing"))
 
     # 봇 실행
     bot = DominanceBot(config)
+    if args.tui and not args.once:
+        from tui import TerminalDashboard
+
+        tui_config = config.get("tui", {})
+        bot.dashboard = TerminalDashboard(
+            fps=tui_config.get("fps", 4),
+            sort=tui_config.get("sort", "dominance"),
+        )
+    if args.profile:
+        from replay import StageProfiler
+        bot.profiler = StageProfiler()
     await bot.start()
 
+    # 상장되지 않은 티커는 조회 전에 제외
+    config["tickers"] = bot.listed_tickers(config.get("tickers", []))
+
+    reload_config = config.get("reload", {})
+    if (args.watch_config or reload_config.get("enabled", False)) and not (args.once or args.replay or args.soak):
+        from reload import ConfigWatcher
+        bot.watcher = ConfigWatcher(
+            config_path,
+            lambda: apply_overrides(load_config(config_path), args),
+            interval=reload_config.get("interval", 5),
+        )
+
+    # SIGTERM (서비스 중지) 도 Ctrl+C 처럼 아래 finally 로 정리 (내보내기 파일 footer 기록)
+    terminated = False
+
+    def on_sigterm():
+        nonlocal terminated
+        terminated = True
+        main_task.cancel()
+
+    main_task = asyncio.current_task()
     try:
-        if args.once:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, on_sigterm)
+    except (NotImplementedError, RuntimeError):
+        pass  # Windows: 이벤트 루프 시그널 핸들러 미지원
+
+    ok = True
+    try:
+        if args.soak:
+            from soak import run_soak
+            ok = await run_soak(bot, args.soak, config.get("soak"))
+        elif args.replay:
+            await bot.run_replay(args.cycles)
+        elif args.once:
             await bot.run_once()
         else:
             await bot.run_loop()
+    except asyncio.CancelledError:
+        if not terminated:
+            raise
+        print("\n\n👋 봇 종료 (SIGTERM)")
     finally:
         await bot.stop()
+        if bot.profiler:
+            print(bot.profiler.report())
+    if not ok:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
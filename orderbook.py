@@ -0,0 +1,177 @@
+"""
+Order Book Module
+호가 구독 및 호가 깊이 지배력 계산
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 기본 깊이 구간 (중간가 대비 ±비율)
+DEFAULT_BANDS = (0.005, 0.02)
+
+
+def band_label(band: float) -> str:
+    """0.005 -> "0.5%" """
+    return f"{band * 100:g}%"
+
+
+def _side_depths(levels, mid: float, bands: tuple[float, ...], sign: int) -> list[float]:
+    """한쪽 호가 (최우선 호가부터 정렬) -> 구간별 누적 호가 금액 (구간 밖 레벨에서 중단)
+
+    sign: 매수 -1 / 매도 +1 (중간가에서 멀어지는 방향)
+    """
+    totals = [0.0] * len(bands)
+    k = 0  # 현재 레벨이 들어가는 가장 좁은 구간
+    for level in levels:
+        price = level[0]
+        while k < len(bands) and sign * (price - mid) > mid * bands[k]:
+            k += 1
+        if k == len(bands):
+            break
+        notional = price * level[1]
+        for i in range(k, len(bands)):
+            totals[i] += notional
+    return totals
+
+
+class LocalOrderBook:
+    """심볼 1개 호가 깊이 (수신할 때마다 구간별 합계만 보관)"""
+
+    __slots__ = ("symbol", "mid", "depths", "updated_at")
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.mid: Optional[float] = None
+        self.depths: dict[float, float] = {}
+        self.updated_at = 0.0
+
+    def update(self, bids, asks, bands: tuple[float, ...]):
+        """ccxt 호가 [[price, size], ...] -> 중간가 ±band 이내 매수+매도 호가 금액 (호가 통화)"""
+        if not bids or not asks or bids[0][0] >= asks[0][0]:
+            return  # 빈 호가 / 교차된 호가 (갱신 누락): 직전 값 유지
+        mid = (bids[0][0] + asks[0][0]) / 2
+        bid_depths = _side_depths(bids, mid, bands, -1)
+        ask_depths = _side_depths(asks, mid, bands, 1)
+        self.mid = mid
+        self.depths = {band: b + a for band, b, a in zip(bands, bid_depths, ask_depths)}
+        self.updated_at = time.time()
+
+    def depth(self, band: float) -> float:
+        """중간가 ±band 이내 매수+매도 호가 금액 (호가 통화)"""
+        return self.depths.get(band, 0.0)
+
+
+class DepthMonitor:
+    """거래소별 호가 깊이 + 지역별 깊이 점유율
+
+    ccxt.pro watch_order_book 으로 구독 (거래소 WebSocket 스냅샷/증분은 ccxt.pro 가 병합),
+    수신할 때마다 ccxt 호가창에서 가장 넓은 구간 안의 레벨만 훑어 구간별 합계를 갱신한다.
+    """
+
+    def __init__(self, bands: Iterable[float] = DEFAULT_BANDS, limit: int = 100, max_age: float = 30.0):
+        self.bands = tuple(sorted(bands))
+        self.limit = limit
+        self.max_age = max_age
+        # ticker -> [(exchange, region, book)]
+        self.books: dict[str, list[tuple[str, str, LocalOrderBook]]] = {}
+        self._clients: dict[str, object] = {}
+        self._tasks: dict[tuple[str, str], asyncio.Task] = {}  # (exchange, ticker) -> 구독 태스크
+
+    def _create_client(self, name: str):
+        import ccxt.pro as ccxtpro
+
+        client = self._clients.get(name)
+        if client is None:
+            client = self._clients[name] = getattr(ccxtpro, name)({"enableRateLimit": True})
+        return client
+
+    def start(self, targets: Iterable[tuple[str, str, str, str]]):
+        """구독 시작 targets: (exchange, region, 거래소 심볼, 조회 티커)"""
+        for name, region, symbol, ticker in targets:
+            try:
+                client = self._create_client(name)
+            except Exception as e:
+                logger.warning(f"호가 구독 불가 ({name}): {e}")
+                continue
+            if not client.has.get("watchOrderBook"):
+                logger.info(f"호가 구독 미지원 거래소: {name}")
+                continue
+            if (name, ticker) in self._tasks:
+                continue
+            book = LocalOrderBook(symbol)
+            self.books.setdefault(ticker, []).append((name, region, book))
+            self._tasks[(name, ticker)] = asyncio.create_task(self._watch(name, client, book))
+
+    async def stop(self, exchange: Optional[str] = None, ticker: Optional[str] = None):
+        """일부 구독 중단 (거래소 또는 티커 단위, 나머지 호가창은 유지)"""
+        stopped = [
+            key for key in self._tasks
+            if (exchange is None or key[0] == exchange) and (ticker is None or key[1] == ticker)
+        ]
+        tasks = [self._tasks.pop(key) for key in stopped]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        for t in {t for _, t in stopped}:
+            remaining = [entry for entry in self.books.get(t, []) if (entry[0], t) in self._tasks]
+            if remaining:
+                self.books[t] = remaining
+            else:
+                self.books.pop(t, None)
+        if exchange is not None and not any(key[0] == exchange for key in self._tasks):
+            client = self._clients.pop(exchange, None)
+            if client is not None:
+                try:
+                    await client.close()
+                except Exception:
+                    pass
+
+    async def _watch(self, name: str, client, book: LocalOrderBook):
+        backoff = 1.0
+        while True:
+            try:
+                ob = await client.watch_order_book(book.symbol, self.limit)
+                book.update(ob["bids"], ob["asks"], self.bands)
+                backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"호가 구독 오류 ({name}/{book.symbol}): {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    def dominance(self, ticker: str, to_usd: Callable[[str, float], float]) -> dict[str, float]:
+        """구간별 한국 호가 깊이 점유율 (%) - 최근 갱신된 호가창만 사용"""
+        now = time.time()
+        korean = {band: 0.0 for band in self.bands}
+        total = {band: 0.0 for band in self.bands}
+        for _, region, book in self.books.get(ticker, []):
+            if now - book.updated_at > self.max_age:
+                continue
+            for band in self.bands:
+                usd = to_usd(region, book.depth(band))
+                total[band] += usd
+                if region == "korean":
+                    korean[band] += usd
+        return {
+            band_label(band): korean[band] / total[band] * 100
+            for band in self.bands
+            if total[band] > 0
+        }
+
+    async def close(self):
+        for task in self._tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks.clear()
+        for client in self._clients.values():
+            try:
+                await client.close()
+            except Exception:
+                pass
+
@@ -0,0 +1,116 @@
+"""
+Precompute Module
+대시보드용 기간별 결과 백그라운드 갱신 (기간 전환 시 메모리에서 바로 읽음)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+from dominance import DominanceCalculator, merge_total
+from ratelimit import PRIORITY_LOW
+
+logger = logging.getLogger(__name__)
+
+PERIODS = ["1h", "4h", "24h", "7d", "30d"]
+
+# 대시보드 전체 마켓 티커
+MARKET_TICKERS = ["BTC/USDT", "ETH/USDT", "XRP/USDT", "SOL/USDT"]
+
+_TIMEFRAME_SECONDS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600, "4h": 4 * 3600, "1d": 86400}
+
+
+async def compute_snapshot(calc: DominanceCalculator, period: str) -> dict:
+    """전체 마켓 + 주요 티커 결과"""
+    results = await calc.calculate_many(MARKET_TICKERS, period)
+    return {
+        "total": merge_total([r for r in results.values() if r]),
+        "BTC": results.get("BTC/USDT"),
+        "ETH": results.get("ETH/USDT"),
+        "connected_exchanges": list(calc.exchanges.keys()),
+        "period": period,
+        "computed_at": time.time(),
+    }
+
+
+def default_cadence(period: str, max_cadence: float = 3600) -> float:
+    """기간별 갱신 주기: 사용하는 봉 단위 (24h 는 티커 기준 60초)"""
+    if period == "24h":
+        return 60
+    timeframe, _ = DominanceCalculator.PERIOD_CONFIG.get(period, ("1h", 24))
+    return min(max(_TIMEFRAME_SECONDS.get(timeframe, 3600), 60), max_cadence)
+
+
+class PeriodPrecomputer:
+    """기간별 스냅샷을 주기적으로 갱신하는 백그라운드 스레드
+
+    계산기는 한 번만 초기화해 재사용하고 (load_markets 반복 없음),
+    스냅샷은 통째로 교체하므로 읽는 쪽은 잠금 없이 dict 조회만 한다.
+    """
+
+    def __init__(self, config: dict, periods: list[str] = None, cadence: Optional[dict] = None):
+        self.config = config
+        self.periods = periods or PERIODS
+        cadence = cadence or {}
+        max_cadence = cadence.get("max", 3600)
+        self.cadence = {p: cadence.get(p, default_cadence(p, max_cadence)) for p in self.periods}
+        self.snapshots: dict[str, dict] = {}
+        # 워커 계산기가 로드한 마켓으로 만든 상장 심볼 인덱스 (검색용, 별도 초기화 없이 재사용)
+        self.symbol_index = None
+        self.index_ready = threading.Event()
+        self._next_due = {p: 0.0 for p in self.periods}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, first: str = "24h"):
+        """워커 시작 (first 기간을 가장 먼저 계산)"""
+        if self._thread and self._thread.is_alive():
+            return
+        if first in self._next_due:
+            self._next_due[first] = -1.0
+        self._thread = threading.Thread(target=self._run, name="period-precompute", daemon=True)
+        self._thread.start()
+
+    def get(self, period: str) -> Optional[dict]:
+        """미리 계산된 스냅샷 (아직 없으면 None)"""
+        return self.snapshots.get(period)
+
+    def request(self, period: str):
+        """다음 순서에 해당 기간을 우선 갱신"""
+        if period in self._next_due:
+            self._next_due[period] = -1.0
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        asyncio.run(self._loop())
+
+    async def _loop(self):
+        calc = DominanceCalculator(self.config, priority=PRIORITY_LOW)
+        try:
+            await calc.initialize()
+            self.symbol_index = calc.build_symbol_index()
+        finally:
+            # 초기화 실패 시에도 기다리는 쪽이 멈추지 않도록
+            self.index_ready.set()
+        try:
+            while not self._stop.is_set():
+                now = time.time()
+                due = min(self.periods, key=lambda p: self._next_due[p])
+                wait = self._next_due[due] - now
+                if wait > 0:
+                    await asyncio.sleep(min(wait, 1.0))
+                    continue
+
+                try:
+                    snapshot = await compute_snapshot(calc, due)
+                    self.snapshots[due] = snapshot
+                    logger.debug(f"기간 스냅샷 갱신: {due}")
+                except Exception as e:
+                    logger.warning(f"기간 스냅샷 갱신 실패 ({due}): {e}")
+                self._next_due[due] = time.time() + self.cadence[due]
+        finally:
+            await calc.close()
@@ -0,0 +1,121 @@
+"""
+Premium Module
+한국 프리미엄(김치 프리미엄) 및 가격 괴리 추적
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from dominance import DominanceResult
+from lru import LRUDict
+
+
+@dataclass
+class PremiumSnapshot:
+    """프리미엄 계산 결과"""
+    ticker: str
+    global_price_usd: float        # 글로벌 거래량 가중 USD 가격
+    exchange_premiums: dict[str, float]  # 한국 거래소별 프리미엄 (%)
+    premium: float                 # 한국 거래량 가중 프리미엄 (%)
+    mean: float                    # 지수이동평균 (%)
+    std: float                     # 지수이동표준편차 (%)
+    zscore: Optional[float]        # 표본 부족 시 None
+    timestamp: float
+
+
+class RollingStats:
+    """지수가중 이동 평균/분산 (O(1) 갱신)"""
+
+    def __init__(self, halflife: float):
+        self.alpha = 1 - math.exp(math.log(0.5) / halflife)
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+
+    def update(self, x: float):
+        if self.count == 0:
+            self.mean = x
+        else:
+            diff = x - self.mean
+            incr = self.alpha * diff
+            self.mean += incr
+            self.var = (1 - self.alpha) * (self.var + diff * incr)
+        self.count += 1
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+
+class PremiumTracker:
+    """사이클별 프리미엄 계산 + 티커별 이동 통계
+
+    이미 조회한 ExchangeVolume.price 와 환율만 사용 (추가 요청 없음).
+    """
+
+    def __init__(
+        self,
+        halflife: float = 60,
+        min_samples: int = 10,
+        usd_regions: Iterable[str] = ("global",),
+        max_tickers: int = 2000,
+    ):
+        self.halflife = halflife
+        self.min_samples = min_samples
+        self.usd_regions = set(usd_regions)  # USD 가격 기준 지역
+        # 티커별 이동 통계 (더 이상 조회하지 않는 티커부터 제거)
+        self._stats: LRUDict = LRUDict(max_tickers)
+
+    def update(self, result: DominanceResult, krw_rate: Optional[float]) -> Optional[PremiumSnapshot]:
+        """결과 1건 반영 -> 프리미엄 (가격 정보 부족 시 None)"""
+        if not krw_rate:
+            return None
+
+        # 글로벌 거래량 가중 가격 (USD)
+        weighted = 0.0
+        weight = 0.0
+        for v in result.exchanges:
+            if v.region in self.usd_regions and v.price > 0:
+                weighted += v.price * v.volume_usd
+                weight += v.volume_usd
+        if weight <= 0:
+            return None
+        global_price = weighted / weight
+        fair_krw = global_price * krw_rate
+
+        # 한국 거래소별 프리미엄
+        premiums = {}
+        weighted = 0.0
+        weight = 0.0
+        for v in result.exchanges:
+            if v.region == "korean" and v.price > 0:
+                premium = (v.price / fair_krw - 1) * 100
+                premiums[v.exchange] = premium
+                weighted += premium * v.volume_usd
+                weight += v.volume_usd
+        if weight <= 0:
+            return None
+        premium = weighted / weight
+
+        stats = self._stats.get(result.ticker)
+        if stats is None:
+            stats = RollingStats(self.halflife)
+        self._stats[result.ticker] = stats
+        # z-score 는 갱신 전 분포 기준
+        zscore = None
+        if stats.count >= self.min_samples and stats.std > 0:
+            zscore = (premium - stats.mean) / stats.std
+        stats.update(premium)
+
+        return PremiumSnapshot(
+            ticker=result.ticker,
+            global_price_usd=global_price,
+            exchange_premiums=premiums,
+            premium=premium,
+            mean=stats.mean,
+            std=stats.std,
+            zscore=zscore,
+            timestamp=time.time(),
+        )
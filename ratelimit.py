@@ -0,0 +1,211 @@
+"""
+Rate Limit Module
+거래소별 토큰 버킷 요청 제한 (인스턴스/프로세스 간 공유)
+"""
+
+import asyncio
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 요청 우선순위 (작을수록 우선)
+PRIORITY_HIGH = 0  # 알림 루프 (main.py)
+PRIORITY_LOW = 1   # 대시보드 갱신 (app.py)
+
+# 거래소별 기본 한도 (공개 API 기준, 보수적으로 설정)
+DEFAULT_LIMITS = {
+    # Binance: IP당 REQUEST_WEIGHT 6000/분
+    "binance": {
+        "capacity": 6000,
+        "refill_per_sec": 100,
+        "weights": {
+            "load_markets": 20,
+            "fetch_ticker": 2,
+            "fetch_tickers": 80,
+            "fetch_ohlcv": 2,
+            "fetch_trades": 2,
+            "fetch_order_book": 5,
+        },
+    },
+    # Upbit: 시세 조회 초당 10회
+    "upbit": {"capacity": 10, "refill_per_sec": 10},
+    # Bithumb: 공개 API 초당 135회 (여유 있게 20회)
+    "bithumb": {"capacity": 20, "refill_per_sec": 20},
+    # Bybit: IP당 5초 600회 (여유 있게 초당 20회)
+    "bybit": {"capacity": 50, "refill_per_sec": 20},
+    # OKX: 시세 조회 2초당 20회
+    "okx": {"capacity": 20, "refill_per_sec": 10},
+    # Coinbase: 공개 API 초당 10회
+    "coinbase": {"capacity": 10, "refill_per_sec": 10},
+    # Kraken: 공개 API 초당 1회
+    "kraken": {"capacity": 15, "refill_per_sec": 1},
+}
+
+# 목록에 없는 거래소 기본값
+FALLBACK_LIMIT = {"capacity": 10, "refill_per_sec": 5}
+
+_STATE = struct.Struct("<dd")  # tokens, updated_at
+
+
+@dataclass
+class BucketSpec:
+    """토큰 버킷 설정"""
+    capacity: float        # 최대 토큰 (burst)
+    refill_per_sec: float  # 초당 충전량
+    weights: dict[str, float] = field(default_factory=dict)  # 엔드포인트별 가중치
+
+    def weight(self, endpoint: str) -> float:
+        return min(self.weights.get(endpoint, 1.0), self.capacity)
+
+
+class MemoryBackend:
+    """프로세스 내 공유 버킷 (스레드 안전)"""
+
+    blocking = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: dict[str, tuple[float, float]] = {}
+
+    def take(self, name: str, spec: BucketSpec, weight: float, floor: float) -> float:
+        with self._lock:
+            now = time.time()
+            tokens, updated = self._state.get(name, (spec.capacity, now))
+            tokens, wait = _take(tokens, updated, now, spec, weight, floor)
+            self._state[name] = (tokens, now)
+            return wait
+
+
+class FileBackend:
+    """파일 잠금 기반 버킷 (같은 호스트의 모든 프로세스 공유)
+
+    take 는 다른 프로세스가 잠금을 쥐고 있으면 flock 에서 블로킹되므로
+    이벤트 루프 스레드가 아닌 executor 에서 호출한다 (RateLimiter.acquire).
+    """
+
+    blocking = True
+
+    def __init__(self, state_dir: str):
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+
+    def take(self, name: str, spec: BucketSpec, weight: float, floor: float) -> float:
+        path = self.state_dir / f"{name}.bucket"
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            now = time.time()
+            raw = os.pread(fd, _STATE.size, 0)
+            if len(raw) == _STATE.size:
+                tokens, updated = _STATE.unpack(raw)
+            else:
+                tokens, updated = spec.capacity, now
+            tokens, wait = _take(tokens, updated, now, spec, weight, floor)
+            os.pwrite(fd, _STATE.pack(tokens, now), 0)
+            return wait
+        finally:
+            os.close(fd)  # 닫으면 잠금 해제
+
+
+def _take(
+    tokens: float,
+    updated: float,
+    now: float,
+    spec: BucketSpec,
+    weight: float,
+    floor: float,
+) -> tuple[float, float]:
+    """토큰 차감 시도 -> (남은 토큰, 대기 시간). 대기 시간 0이면 성공"""
+    tokens = min(spec.capacity, tokens + max(0.0, now - updated) * spec.refill_per_sec)
+    if tokens - weight >= floor:
+        return tokens - weight, 0.0
+    return tokens, (weight + floor - tokens) / spec.refill_per_sec
+
+
+class RateLimiter:
+    """거래소별 전역 토큰 버킷 요청 제한기"""
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or {}
+        self.reserve = config.get("low_priority_reserve", 0.2)
+        self._overrides = config.get("exchanges", {}) or {}
+        self._specs: dict[str, BucketSpec] = {}
+
+        backend = config.get("backend", "file")
+        if backend == "file" and fcntl is None:
+            logger.warning("파일 잠금 미지원 플랫폼, 프로세스 내 요청 제한만 사용")
+            backend = "memory"
+
+        if backend == "file":
+            state_dir = config.get("state_dir") or os.path.join(
+                tempfile.gettempdir(), "cex-dominance-ratelimit"
+            )
+            self.backend = FileBackend(state_dir)
+        else:
+            self.backend = MemoryBackend()
+
+    def spec(self, exchange: str) -> BucketSpec:
+        """거래소 버킷 설정 (기본값 + config 오버라이드)"""
+        if exchange not in self._specs:
+            base = DEFAULT_LIMITS.get(exchange, FALLBACK_LIMIT)
+            override = self._overrides.get(exchange, {})
+            weights = {**base.get("weights", {}), **override.get("weights", {})}
+            self._specs[exchange] = BucketSpec(
+                capacity=override.get("capacity", base["capacity"]),
+                refill_per_sec=override.get("refill_per_sec", base["refill_per_sec"]),
+                weights=weights,
+            )
+        return self._specs[exchange]
+
+    async def acquire(
+        self,
+        exchange: str,
+        endpoint: str = "default",
+        priority: int = PRIORITY_HIGH,
+        weight: Optional[float] = None,
+    ):
+        """토큰 확보까지 대기 (낮은 우선순위는 예약분을 남겨둠)"""
+        spec = self.spec(exchange)
+        weight = spec.weight(endpoint) if weight is None else min(weight, spec.capacity)
+        floor = 0.0
+        if priority > PRIORITY_HIGH:
+            # 예약분 + 가중치가 버킷보다 크면 영원히 확보할 수 없으므로 floor 상한 = capacity - weight
+            floor = min(spec.capacity * self.reserve, spec.capacity - weight)
+
+        loop = asyncio.get_running_loop()
+        while True:
+            if self.backend.blocking:
+                wait = await loop.run_in_executor(None, self.backend.take, exchange, spec, weight, floor)
+            else:
+                wait = self.backend.take(exchange, spec, weight, floor)
+            if wait <= 0:
+                return
+            logger.debug(f"요청 제한 대기 ({exchange}/{endpoint}): {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+
+_limiters: dict[tuple, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(config: Optional[dict] = None) -> RateLimiter:
+    """프로세스 공유 RateLimiter (같은 backend 설정이면 같은 인스턴스)"""
+    config = config or {}
+    key = (config.get("backend", "file"), config.get("state_dir"))
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter(config)
+        return _limiters[key]
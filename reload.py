@@ -0,0 +1,109 @@
+"""
+Reload Module
+설정 파일 변경 감지 + 실행 중인 설정과의 차이 계산 (바뀐 부분만 반영)
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from dominance import enabled_exchanges
+
+logger = logging.getLogger(__name__)
+
+# 실행 중 교체할 수 없는 섹션 (프로세스/파일 핸들/전역 상태/캐시 상한을 시작 시 한 번 만듦)
+RESTART_SECTIONS = {
+    "sharding", "journal", "export", "logging", "tracing", "session", "rate_limits", "tui", "depth", "limits",
+}
+
+
+@dataclass
+class ConfigDiff:
+    """실행 중 설정 -> 새 설정 차이"""
+    sections: set[str] = field(default_factory=set)                        # 값이 바뀐 최상위 섹션
+    exchanges_added: list[tuple[str, str]] = field(default_factory=list)   # (거래소, 지역)
+    exchanges_removed: list[str] = field(default_factory=list)
+    tickers_added: list[str] = field(default_factory=list)
+    tickers_removed: list[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not self.sections
+
+    @property
+    def restart_required(self) -> set[str]:
+        return self.sections & RESTART_SECTIONS
+
+    def summary(self) -> str:
+        parts = []
+        if self.exchanges_added:
+            parts.append(f"거래소 +{','.join(name for name, _ in self.exchanges_added)}")
+        if self.exchanges_removed:
+            parts.append(f"거래소 -{','.join(self.exchanges_removed)}")
+        if self.tickers_added:
+            parts.append(f"티커 +{','.join(self.tickers_added)}")
+        if self.tickers_removed:
+            parts.append(f"티커 -{','.join(self.tickers_removed)}")
+        others = self.sections - {"exchanges", "tickers"}
+        if others:
+            parts.append(f"섹션 {','.join(sorted(others))}")
+        return " | ".join(parts)
+
+
+def diff_config(old: dict, new: dict) -> ConfigDiff:
+    """최상위 섹션 단위 비교 + 거래소/티커는 항목 단위 비교"""
+    diff = ConfigDiff(sections={key for key in old.keys() | new.keys() if old.get(key) != new.get(key)})
+
+    if "exchanges" in diff.sections:
+        old_names = {name for name, _ in enabled_exchanges(old)}
+        new_exchanges = enabled_exchanges(new)
+        new_names = {name for name, _ in new_exchanges}
+        diff.exchanges_added = [(name, region) for name, region in new_exchanges if name not in old_names]
+        diff.exchanges_removed = sorted(old_names - new_names)
+
+    if "tickers" in diff.sections:
+        old_tickers = old.get("tickers") or []
+        new_tickers = new.get("tickers") or []
+        diff.tickers_added = [t for t in new_tickers if t not in old_tickers]
+        diff.tickers_removed = [t for t in old_tickers if t not in new_tickers]
+
+    return diff
+
+
+class ConfigWatcher:
+    """설정 파일 수정 시각 폴링
+
+    loader 는 파일을 읽어 CLI 오버라이드까지 적용한 설정을 돌려준다
+    (재로드 후에도 --ticker 등 실행 인자가 유지되도록).
+    """
+
+    def __init__(self, path: Path, loader: Callable[[], dict], interval: float = 5.0):
+        self.path = Path(path)
+        self.loader = loader
+        self.interval = interval
+        self._mtime = self._stat()
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def poll(self) -> Optional[dict]:
+        """파일이 바뀌었으면 새 설정 (읽기 실패/변경 없음: None)"""
+        mtime = self._stat()
+        if mtime is None or mtime == self._mtime:
+            return None
+        self._mtime = mtime
+        try:
+            config = self.loader()
+        except Exception as e:
+            # 저장 도중 읽었거나 문법 오류: 실행 중 설정 유지
+            logger.warning(f"설정 재로드 실패, 기존 설정 유지: {e}")
+            return None
+        if not isinstance(config, dict) or not config.get("exchanges"):
+            logger.warning("설정 재로드 실패, 기존 설정 유지: exchanges 섹션 없음")
+            return None
+        return config
@@ -0,0 +1,267 @@
+"""
+Replay Module
+거래소 응답 기록/재생 (gzip JSON lines 세션 파일) + 단계별 프로파일러
+"""
+
+import asyncio
+import cProfile
+import gzip
+import io
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+SESSION_VERSION = 1
+
+# 기록 대상 ccxt 메서드
+RECORDED_METHODS = ("load_markets", "fetch_ticker", "fetch_tickers", "fetch_ohlcv", "fetch_trades", "fetch_order_book")
+
+
+def _call_key(method: str, args: tuple, kwargs: dict) -> str:
+    return json.dumps([method, list(args), kwargs], sort_keys=True, default=str)
+
+
+class ReplayError(Exception):
+    """재생 중 기록된 예외 / 기록 없는 호출"""
+
+
+class _RecordingExchange:
+    """ccxt 클라이언트 프록시: 기록 대상 메서드 호출 결과를 세션에 기록"""
+
+    def __init__(self, name: str, exchange, recorder: "SessionRecorder"):
+        self._name = name
+        self._exchange = exchange
+        self._recorder = recorder
+
+    def __getattr__(self, attr):
+        value = getattr(self._exchange, attr)
+        if attr not in RECORDED_METHODS:
+            return value
+
+        async def call(*args, **kwargs):
+            started = time.monotonic()
+            try:
+                result = await value(*args, **kwargs)
+            except Exception as e:
+                self._recorder.write(self._name, attr, args, kwargs, started, error=e)
+                raise
+            self._recorder.write(self._name, attr, args, kwargs, started, result=result)
+            return result
+
+        return call
+
+
+class SessionRecorder:
+    """거래소 응답 기록기 (호출 시각/소요 시간 포함)"""
+
+    replaying = False
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._start = time.monotonic()
+        self._count = 0
+        self._file.write(json.dumps({"version": SESSION_VERSION, "started": time.time()}) + "\n")
+
+    def wrap(self, name: str, exchange):
+        has = {k: v for k, v in (getattr(exchange, "has", None) or {}).items() if isinstance(v, (bool, str))}
+        self._file.write(json.dumps({"ex": name, "has": has}) + "\n")
+        return _RecordingExchange(name, exchange, self)
+
+    def write(self, name: str, method: str, args: tuple, kwargs: dict, started: float,
+              result=None, error: Optional[Exception] = None):
+        record = {
+            "t": round(started - self._start, 6),
+            "d": round(time.monotonic() - started, 6),
+            "ex": name,
+            "m": method,
+            "k": _call_key(method, args, kwargs),
+        }
+        if error is not None:
+            record["e"] = f"{type(error).__name__}: {error}"
+        else:
+            record["r"] = result
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._count += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+            logger.info(f"세션 기록 완료: {self.path} ({self._count}개 응답)")
+
+
+class _ReplayExchange:
+    """기록된 응답을 순서대로 돌려주는 가짜 거래소 클라이언트"""
+
+    def __init__(self, name: str, player: "SessionPlayer"):
+        self.id = name
+        self.has = player.has.get(name, {})
+        self.markets = {}
+        self._name = name
+        self._player = player
+
+    def __getattr__(self, attr):
+        if attr not in RECORDED_METHODS:
+            raise AttributeError(attr)
+
+        async def call(*args, **kwargs):
+            result = await self._player.respond(self._name, _call_key(attr, args, kwargs))
+            if attr == "load_markets":
+                self.markets = result or {}
+            return result
+
+        return call
+
+    async def close(self):
+        pass
+
+
+class SessionPlayer:
+    """세션 재생기
+
+    같은 (거래소, 메서드, 인자) 호출에는 기록 순서대로 응답하고,
+    모두 소진되면 exhausted 를 세운 뒤 마지막 응답을 반복한다.
+    speed: "original" 이면 기록된 호출 시각/소요 시간대로 대기, "max" 면 대기 없음.
+    """
+
+    replaying = True
+
+    def __init__(self, path: str, speed: str = "max"):
+        self.path = path
+        self.speed = speed
+        self.has: dict[str, dict] = {}
+        self.exhausted = False
+        self._responses: dict[tuple[str, str], list[dict]] = {}
+        self._cursor: dict[tuple[str, str], int] = {}
+        self._start: Optional[float] = None
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != SESSION_VERSION:
+                raise ValueError(f"지원하지 않는 세션 버전: {header.get('version')}")
+            count = 0
+            for line in f:
+                record = json.loads(line)
+                if "m" not in record:
+                    self.has[record["ex"]] = record.get("has", {})
+                    continue
+                self._responses.setdefault((record["ex"], record["k"]), []).append(record)
+                count += 1
+        logger.info(f"세션 로드: {path} ({count}개 응답)")
+
+    def exchange(self, name: str):
+        return _ReplayExchange(name, self)
+
+    async def respond(self, name: str, key: str):
+        records = self._responses.get((name, key))
+        if not records:
+            raise ReplayError(f"기록 없는 호출: {name} {key}")
+
+        index = self._cursor.get((name, key), 0)
+        if index >= len(records):
+            self.exhausted = True
+            index = len(records) - 1
+        else:
+            self._cursor[(name, key)] = index + 1
+        record = records[index]
+
+        if self.speed == "original":
+            if self._start is None:
+                self._start = time.monotonic() - record["t"]
+            delay = self._start + record["t"] + record["d"] - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        else:
+            await asyncio.sleep(0)
+
+        if "e" in record:
+            raise ReplayError(record["e"])
+        return record["r"]
+
+    def close(self):
+        pass
+
+
+def open_session(config: Optional[dict]):
+    """config 의 session 섹션 -> 기록기/재생기/가짜 거래소 (mode 없으면 None)"""
+    config = config or {}
+    mode = config.get("mode")
+    if mode == "record":
+        return SessionRecorder(config["path"])
+    if mode == "replay":
+        return SessionPlayer(config["path"], config.get("speed", "max"))
+    if mode == "fake":
+        from soak import FakeSession
+        return FakeSession(config.get("universe", 5000), config.get("seed", 0), config.get("fx"))
+    return None
+
+
+# 할당 집계에서 제외 (프로파일러 자체 / import 기계)
+_SKIP_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>")
+
+
+class StageProfiler:
+    """단계별 cProfile + tracemalloc 누적 (stage 컨텍스트로 구간 지정)"""
+
+    def __init__(self, top: int = 15):
+        self.top = top
+        self._profiles: dict[str, cProfile.Profile] = {}
+        self._times: dict[str, list[float]] = {}
+        self._memory: dict[str, list[int]] = {}  # [순증가 합, 최대 peak]
+        # 단계별 할당 위치 (파일, 줄) -> [크기 증가 합, 개수 증가 합] (진입/종료 스냅샷 차이 누적)
+        self._allocations: dict[str, dict[tuple[str, int], list[int]]] = {}
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+    @contextmanager
+    def stage(self, name: str):
+        profile = self._profiles.setdefault(name, cProfile.Profile())
+        entry = tracemalloc.take_snapshot()
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            current, peak = tracemalloc.get_traced_memory()
+            times = self._times.setdefault(name, [0, 0.0])
+            times[0] += 1
+            times[1] += elapsed
+            memory = self._memory.setdefault(name, [0, 0])
+            memory[0] += current - before
+            memory[1] = max(memory[1], peak - before)
+            allocations = self._allocations.setdefault(name, {})
+            for stat in tracemalloc.take_snapshot().compare_to(entry, "lineno"):
+                frame = stat.traceback[0]
+                if frame.filename in _SKIP_FILES or not (stat.size_diff or stat.count_diff):
+                    continue
+                total = allocations.setdefault((frame.filename, frame.lineno), [0, 0])
+                total[0] += stat.size_diff
+                total[1] += stat.count_diff
+
+    def report(self) -> str:
+        out = io.StringIO()
+        for name, (count, total) in self._times.items():
+            growth, peak = self._memory[name]
+            out.write(
+                f"\n=== {name}: {count}회, 평균 {total / count * 1000:.1f}ms, "
+                f"메모리 순증가 {growth / 1024:.1f}KiB, 최대 peak {peak / 1024:.1f}KiB ===\n"
+            )
+            stats = pstats.Stats(self._profiles[name], stream=out)
+            stats.sort_stats("cumulative").print_stats(self.top)
+
+            out.write(f"--- {name} 단계 내 순할당 상위 (누적) ---\n")
+            allocations = sorted(self._allocations[name].items(), key=lambda item: -abs(item[1][0]))
+            for (filename, lineno), (size, count) in allocations[:5]:
+                out.write(f"  {filename}:{lineno}: size={size / 1024:+.1f} KiB, count={count:+d}\n")
+        return out.getvalue()
@@ -0,0 +1,130 @@
+"""
+Screener Module
+상장 자산 전체 지배력 순위 (상위 N 조회)
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import Iterable
+
+from dominance import DominanceResult
+
+# 정렬 기준
+METRICS = ("dominance", "change", "korean_volume")
+
+
+@dataclass
+class ScreenerRow:
+    """스크리너 행"""
+    ticker: str
+    korean_dominance: float   # 한국 지배력 (%)
+    change: float             # 직전 사이클 대비 지배력 변화 (%p)
+    korean_volume_usd: float
+    total_volume_usd: float
+    timestamp: float
+
+    def metric(self, name: str) -> float:
+        if name == "dominance":
+            return self.korean_dominance
+        if name == "change":
+            return self.change
+        return self.korean_volume_usd
+
+
+class RankIndex:
+    """값 내림차순 상위 N 조회용 힙 (지연 삭제)
+
+    갱신은 O(log n) push, 이전 항목은 조회 시점에 버린다.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, str]] = []  # (-value, seq, key)
+        self._current: dict[str, tuple[float, int]] = {}  # key -> (value, seq)
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def update(self, key: str, value: float):
+        self._seq += 1
+        self._current[key] = (value, self._seq)
+        heapq.heappush(self._heap, (-value, self._seq, key))
+        # 이전 항목이 너무 많이 쌓이면 재구성
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self._heap = [(-v, seq, k) for k, (v, seq) in self._current.items()]
+            heapq.heapify(self._heap)
+
+    def remove(self, key: str):
+        self._current.pop(key, None)
+
+    def top(self, n: int) -> list[tuple[str, float]]:
+        """상위 n개 (key, value)"""
+        result = []
+        valid = []
+        while self._heap and len(result) < n:
+            item = heapq.heappop(self._heap)
+            neg_value, seq, key = item
+            current = self._current.get(key)
+            if current is None or current[1] != seq:
+                continue  # 이전 값: 버림
+            result.append((key, -neg_value))
+            valid.append(item)
+        for item in valid:
+            heapq.heappush(self._heap, item)
+        return result
+
+
+class DominanceScreener:
+    """티커별 지배력/변화/한국 거래량 순위 인덱스"""
+
+    def __init__(self, min_total_volume_usd: float = 0.0):
+        self.min_total_volume_usd = min_total_volume_usd
+        self.rows: dict[str, ScreenerRow] = {}
+        self.updated_at = 0.0
+        self._indexes = {metric: RankIndex() for metric in METRICS}
+
+    def update(self, result: DominanceResult):
+        """결과 1건 반영 (O(log n))"""
+        if result.total_volume_usd < self.min_total_volume_usd:
+            self.remove(result.ticker)
+            return
+
+        prev = self.rows.get(result.ticker)
+        row = ScreenerRow(
+            ticker=result.ticker,
+            korean_dominance=result.korean_dominance,
+            change=result.korean_dominance - prev.korean_dominance if prev else 0.0,
+            korean_volume_usd=result.korean_volume_usd,
+            total_volume_usd=result.total_volume_usd,
+            timestamp=result.timestamp,
+        )
+        self.rows[result.ticker] = row
+        for metric, index in self._indexes.items():
+            index.update(result.ticker, row.metric(metric))
+
+    def update_many(self, results: Iterable[DominanceResult]) -> bool:
+        """한 사이클 결과 반영 (이미 반영한 사이클이면 무시, 빠진 티커는 제거)"""
+        results = list(results)
+        if not results:
+            return False
+        timestamp = max(r.timestamp for r in results)
+        if timestamp <= self.updated_at:
+            return False
+
+        seen = set()
+        for result in results:
+            self.update(result)
+            seen.add(result.ticker)
+        for ticker in set(self.rows) - seen:
+            self.remove(ticker)
+        self.updated_at = timestamp
+        return True
+
+    def remove(self, ticker: str):
+        self.rows.pop(ticker, None)
+        for index in self._indexes.values():
+            index.remove(ticker)
+
+    def top(self, metric: str = "dominance", n: int = 10) -> list[ScreenerRow]:
+        """기준별 상위 n개"""
+        return [self.rows[key] for key, _ in self._indexes[metric].top(n)]
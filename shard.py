@@ -0,0 +1,310 @@
+"""
+Shard Module
+거래소/심볼 범위를 워커 프로세스로 분산하는 지배력 계산기
+"""
+
+import asyncio
+import copy
+import dataclasses
+import logging
+import multiprocessing as mp
+from typing import Optional
+
+from dominance import (
+    DEFAULT_MARKET_TICKERS,
+    DominanceResult,
+    ExchangeVolume,
+    aggregate,
+    aggregate_universe,
+    apply_perp_volumes,
+    enabled_exchanges,
+    get_regions,
+    merge_total,
+)
+from ratelimit import PRIORITY_HIGH
+
+logger = logging.getLogger(__name__)
+
+# 워커 -> 코디네이터 전송 단위: (ticker, exchange, volume_24h, volume_usd, price, region, base_volume, flag)
+VolumeRow = tuple[str, str, float, float, float, str, float, str]
+
+
+def _to_row(ticker: str, v: ExchangeVolume) -> VolumeRow:
+    return (ticker, v.exchange, v.volume_24h, v.volume_usd, v.price, v.region, v.base_volume, v.flag)
+
+
+def _from_row(row: VolumeRow) -> ExchangeVolume:
+    ticker, exchange, volume_24h, volume_usd, price, region, base_volume, flag = row
+    return ExchangeVolume(
+        exchange=exchange,
+        ticker=ticker,
+        volume_24h=volume_24h,
+        volume_usd=volume_usd,
+        price=price,
+        region=region,
+        base_volume=base_volume,
+        flag=flag,
+    )
+
+
+def _shard_config(config: dict, exchange_names: set[str]) -> dict:
+    """담당 거래소만 활성화한 설정 복사본"""
+    shard = copy.deepcopy(config)
+    for region in shard["exchanges"].values():
+        for ex in region:
+            if ex["name"] not in exchange_names:
+                ex["enabled"] = False
+    return shard
+
+
+def _worker_main(conn, config: dict, exchange_names: list[str], priority: int):
+    """워커 프로세스 진입점 (자체 이벤트 루프 + ccxt 클라이언트)"""
+    import tracing
+    from dominance import DominanceCalculator
+
+    logging.basicConfig(
+        level=config.get("logging", {}).get("level", "INFO"),
+        format="%(asctime)s | %(levelname)s | %(message)s",
+        datefmt="%H:%M:%S",
+    )
+    # 코디네이터와 같은 trace 파일에 이어서 기록 (pid 로 구분)
+    tracing.configure(config.get("tracing"), shared=True)
+
+    async def _run():
+        calc = DominanceCalculator(_shard_config(config, set(exchange_names)), priority)
+        await calc.initialize()
+        # 환율 마켓 거래소를 맡은 워커가 그 환율의 기준 (직접 조회한 값만 보고)
+        owned = {
+            region["fiat"]
+            for region in calc.regions.values()
+            if region.get("fiat") and region.get("fx", {}).get("exchange") in calc.exchanges
+        }
+
+        def owned_rates() -> dict[str, float]:
+            return {fiat: rate for fiat, rate in calc.fx_rates.items() if fiat in owned}
+
+        def merge_rates(fx_rates: dict[str, float]):
+            # 코디네이터 값은 직전 사이클 값이므로 직접 조회하는 환율은 덮어쓰지 않음
+            calc.fx_rates.update({fiat: rate for fiat, rate in fx_rates.items() if fiat not in owned})
+
+        conn.send(("ready", list(calc.exchanges), owned_rates()))
+
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                message = await loop.run_in_executor(None, conn.recv)
+                if message[0] == "close":
+                    break
+
+                if message[0] == "reconfigure":
+                    # 담당 거래소 배치는 유지한 채 나머지 설정 교체
+                    _, new_config, diff = message
+                    try:
+                        await calc.reconfigure(_shard_config(new_config, set(exchange_names)), diff)
+                    except Exception as e:
+                        logger.error(f"워커 설정 반영 실패: {e}")
+                    conn.send(("reconfigured",))
+                    continue
+
+                if message[0] == "universe":
+                    merge_rates(message[1])
+                    try:
+                        volumes = await calc.fetch_universe_volumes()
+                    except Exception as e:
+                        logger.warning(f"전체 티커 조회 실패: {e}")
+                        volumes = []
+                    conn.send(([_to_row(v.ticker, v) for v in volumes], owned_rates(), {}))
+                    continue
+
+                _, tickers, period, fx_rates = message
+                merge_rates(fx_rates)
+                if owned and not calc._use_multi_quote(period):
+                    # 사이클마다 환율 갱신 (멀티 쿼트 경로는 같은 주기 티커로 갱신)
+                    await calc.refresh_fx_rates()
+                with tracing.trace("shard_fetch", tickers=len(tickers)):
+                    batches = await asyncio.gather(
+                        *[calc.fetch_volumes(t, period) for t in tickers],
+                        return_exceptions=True,
+                    )
+                rows: list[VolumeRow] = [
+                    _to_row(t, v)
+                    for t, batch in zip(tickers, batches)
+                    if isinstance(batch, list)
+                    for v in batch
+                ]
+                # 무기한 선물: 담당 거래소분 지역별 합계 (거래소당 일괄 조회 1회)
+                perps: dict[str, dict[str, float]] = {}
+                if calc._use_perps(period):
+                    await calc.prefetch_perps(tickers)
+                    perps = {t: calc.perp_region_volumes(t) for t in tickers}
+                conn.send((rows, owned_rates(), perps))
+        finally:
+            await calc.close()
+            conn.close()
+
+    asyncio.run(_run())
+
+
+class ShardedCalculator:
+    """워커 프로세스 샤딩 지배력 계산기 (DominanceCalculator 호환 인터페이스)
+
+    거래소 그룹 x 심볼 범위로 워커를 배치한다. 워커 수가 거래소 수보다
+    많으면 같은 거래소 그룹을 여러 워커가 심볼 범위로 나눠 맡는다.
+    """
+
+    # 실행 중 설정 재로드로 바꿀 수 없는 섹션 (워커 거래소/환율 배치는 시작 시 고정)
+    RESTART_SECTIONS = {"exchanges", "regions"}
+
+    def __init__(self, config: dict, workers: int, priority: int = PRIORITY_HIGH):
+        self.config = config
+        self.workers = workers
+        self.priority = priority
+        self.exchanges: dict[str, None] = {}
+        self._fx_rates: dict[str, float] = {}
+        self._perps: dict[str, dict[str, float]] = {}  # 이번 주기 티커별 무기한 선물 지역별 거래량
+        self._procs: list[mp.Process] = []
+        self._conns: list = []
+        self._plan: list[tuple[list[str], int]] = []  # (거래소 그룹, 심볼 범위 번호)
+        self._symbol_groups = 1
+
+    def _make_plan(self) -> list[tuple[list[str], int]]:
+        names = [name for name, _ in enabled_exchanges(self.config)]
+        exchange_groups = max(1, min(self.workers, len(names)))
+        self._symbol_groups = max(1, self.workers // exchange_groups)
+        groups = [names[i::exchange_groups] for i in range(exchange_groups)]
+        return [(group, j) for group in groups for j in range(self._symbol_groups)]
+
+    async def initialize(self):
+        """워커 프로세스 시작 및 거래소 연결"""
+        ctx = mp.get_context("spawn")
+        self._plan = self._make_plan()
+        for group, _ in self._plan:
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(
+                target=_worker_main,
+                args=(child, self.config, group, self.priority),
+                daemon=True,
+            )
+            proc.start()
+            child.close()
+            self._procs.append(proc)
+            self._conns.append(parent)
+
+        readies = await asyncio.gather(*[self._recv(c) for c in self._conns])
+        for _, connected, fx_rates in readies:
+            self.exchanges.update(dict.fromkeys(connected))
+            self._fx_rates.update(fx_rates)
+        # 환율 기준 거래소를 가진 워커가 없으면 설정 기본값 사용
+        for region in get_regions(self.config).values():
+            fiat = region.get("fiat")
+            default = region.get("fx", {}).get("default")
+            if fiat and fiat not in self._fx_rates and default:
+                self._fx_rates[fiat] = default
+                logger.warning(f"{fiat} 환율 기본값 사용: {default}")
+        logger.info(f"샤딩 워커 {len(self._procs)}개 시작 (심볼 범위 {self._symbol_groups}개)")
+
+    @property
+    def krw_rate(self) -> Optional[float]:
+        """현재 KRW/USD 환율"""
+        return self._fx_rates.get("KRW")
+
+    @property
+    def fx_rates(self) -> dict[str, float]:
+        """법정화폐별 USD 환율"""
+        return self._fx_rates
+
+    async def _recv(self, conn):
+        return await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+
+    async def _fetch_rows(self, tickers: list[str], period: str) -> list[VolumeRow]:
+        """모든 워커에 요청 분배 후 거래량 행 수집"""
+        slices = [tickers[j::self._symbol_groups] for j in range(self._symbol_groups)]
+        active = []
+        for conn, (_, j) in zip(self._conns, self._plan):
+            if slices[j]:
+                conn.send(("fetch", slices[j], period, self._fx_rates))
+                active.append(conn)
+        replies = await asyncio.gather(*[self._recv(c) for c in active])
+        return [row for batch in self._merge_replies(replies) for row in batch]
+
+    def _merge_replies(self, replies: list[tuple[list, dict, dict]]) -> list[list]:
+        """워커 응답 (행, 담당 환율, 무기한 선물) -> 행 목록
+
+        환율 마켓을 맡은 워커의 최신 환율을 반영하고, 무기한 선물 지역별 거래량은
+        거래소 그룹별 워커 값을 합쳐 self._perps 에 둔다.
+        """
+        batches = []
+        self._perps = {}
+        for rows, fx_rates, perps in replies:
+            self._fx_rates.update(fx_rates)
+            batches.append(rows)
+            for ticker, region_volumes in perps.items():
+                merged = self._perps.setdefault(ticker, {})
+                for region, volume in region_volumes.items():
+                    merged[region] = merged.get(region, 0.0) + volume
+        return batches
+
+    async def calculate_many(self, tickers: list[str], period: str = "24h") -> dict[str, Optional[DominanceResult]]:
+        """여러 티커 동시 계산 (코디네이터에서 집계)"""
+        by_ticker: dict[str, list[ExchangeVolume]] = {t: [] for t in tickers}
+        for row in await self._fetch_rows(tickers, period):
+            volume = _from_row(row)
+            by_ticker[volume.ticker].append(volume)
+
+        results = {}
+        for ticker, volumes in by_ticker.items():
+            if not volumes:
+                logger.warning(f"유효한 거래량 데이터 없음: {ticker}")
+            results[ticker] = aggregate(ticker, volumes) if volumes else None
+            if results[ticker] and ticker in self._perps:
+                apply_perp_volumes(results[ticker], self._perps[ticker])
+        return results
+
+    async def calculate(self, ticker: str, period: str = "24h") -> Optional[DominanceResult]:
+        return (await self.calculate_many([ticker], period))[ticker]
+
+    async def calculate_universe(self) -> dict[str, DominanceResult]:
+        """상장 자산 전체 지배력 (거래소 그룹별 워커 1개가 일괄 조회)"""
+        active = [conn for conn, (_, j) in zip(self._conns, self._plan) if j == 0]
+        for conn in active:
+            conn.send(("universe", self._fx_rates))
+        batches = self._merge_replies(await asyncio.gather(*[self._recv(c) for c in active]))
+        volumes = [_from_row(row) for batch in batches for row in batch]
+        return aggregate_universe(get_regions(self.config), volumes)
+
+    async def calculate_total_market(self, tickers: list[str] = None, period: str = "24h") -> Optional[DominanceResult]:
+        results = await self.calculate_many(tickers or DEFAULT_MARKET_TICKERS, period)
+        return merge_total([r for r in results.values() if r])
+
+    async def reconfigure(self, config: dict, diff):
+        """실행 중 설정 교체 (워커 거래소 배치는 시작 시 고정, 거래소/지역 변경은 재시작 필요)
+
+        나머지 섹션 (검증/멀티 쿼트/무기한 선물/거래량 소스 등) 은 모든 워커에 보내
+        각 워커 계산기에서 반영한다.
+        """
+        if diff.exchanges_added or diff.exchanges_removed or "regions" in diff.sections:
+            logger.warning("샤딩 모드에서는 거래소/지역 변경을 재시작 후 반영")
+        self.config = {**config, "exchanges": self.config["exchanges"], "regions": self.config.get("regions")}
+        worker_diff = dataclasses.replace(
+            diff,
+            sections=diff.sections - {"exchanges", "regions"},
+            exchanges_added=[],
+            exchanges_removed=[],
+        )
+        for conn in self._conns:
+            conn.send(("reconfigure", self.config, worker_diff))
+        await asyncio.gather(*[self._recv(c) for c in self._conns])
+
+    async def close(self):
+        """워커 종료"""
+        for conn in self._conns:
+            try:
+                conn.send(("close",))
+            except Exception:
+                pass
+        for proc in self._procs:
+            await asyncio.get_running_loop().run_in_executor(None, proc.join, 10)
+            if proc.is_alive():
+                proc.terminate()
+        self._procs.clear()
+        self._conns.clear()
@@ -0,0 +1,262 @@
+"""
+Soak Module
+로컬 가짜 거래소로 모니터링 루프 장기 실행 + 메모리 추이 점검 (RSS / tracemalloc 상위 할당)
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from contextlib import redirect_stdout
+from typing import Optional
+
+from dominance import enabled_exchanges, get_regions
+
+logger = logging.getLogger(__name__)
+
+
+def _coin(i: int) -> str:
+    return f"C{i:05d}"
+
+
+class FakeExchange:
+    """결정적 난수로 티커/OHLCV 를 만드는 가짜 거래소 (네트워크 없음)
+
+    자산 C00000.. 을 USDT 와 지역 법정화폐 마켓에 상장하고, 거래량은
+    자산별 기준값에 매 호출 로그정규 변동을 곱해 만든다 (가끔 급등).
+    """
+
+    has = {"fetchTickers": True, "fetchOHLCV": True}
+
+    def __init__(self, name: str, universe: int, fx: dict[str, float], seed: int = 0):
+        self.id = name
+        self.markets: dict[str, dict] = {}
+        self._universe = universe
+        self._fx = fx
+        self._rng = random.Random(zlib.crc32(name.encode()) ^ seed)
+
+    async def load_markets(self):
+        markets = {}
+        for quote in ["USDT", *self._fx]:
+            for i in range(self._universe):
+                base = _coin(i)
+                markets[f"{base}/{quote}"] = {"base": base, "quote": quote, "spot": True, "active": True}
+        for fiat in self._fx:
+            markets[f"USDT/{fiat}"] = {"base": "USDT", "quote": fiat, "spot": True, "active": True}
+        self.markets = markets
+        return markets
+
+    def _ticker(self, symbol: str) -> dict:
+        base, quote = symbol.split("/")
+        rate = self._fx.get(quote, 1.0)
+        if base == "USDT":
+            return {"symbol": symbol, "last": rate, "baseVolume": 1e6, "quoteVolume": 1e6 * rate}
+        i = int(base[1:])
+        price = (1 + i % 97) * rate
+        base_volume = 1e4 * (1 + (i * 7919) % 31) * self._rng.lognormvariate(0, 0.3)
+        if self._rng.random() < 0.01:
+            base_volume *= 20
+        return {"symbol": symbol, "last": price, "baseVolume": base_volume, "quoteVolume": base_volume * price}
+
+    async def fetch_ticker(self, symbol: str):
+        await asyncio.sleep(0)
+        if symbol not in self.markets:
+            raise KeyError(f"{self.id} does not have market symbol {symbol}")
+        return self._ticker(symbol)
+
+    async def fetch_tickers(self, symbols: Optional[list[str]] = None):
+        await asyncio.sleep(0)
+        return {s: self._ticker(s) for s in (symbols or self.markets) if s in self.markets}
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = "1h", since=None, limit: int = 24):
+        await asyncio.sleep(0)
+        now = int(time.time() // 3600 * 3600 * 1000)
+        rows = []
+        for k in range(limit or 24):
+            t = self._ticker(symbol)
+            rows.append([now - (limit - k) * 3600_000, t["last"], t["last"], t["last"], t["last"], t["baseVolume"] / 24])
+        return rows
+
+    async def close(self):
+        pass
+
+
+class FakeSession:
+    """DominanceCalculator 세션 자리에 끼우는 가짜 거래소 공급자 (재생 모드와 같은 경로)"""
+
+    replaying = True
+    exhausted = False
+    speed = "max"
+
+    def __init__(self, universe: int = 5000, seed: int = 0, fx: Optional[dict[str, float]] = None):
+        self.universe = universe
+        self.seed = seed
+        self.fx = fx or {}
+
+    def exchange(self, name: str) -> FakeExchange:
+        return FakeExchange(name, self.universe, self.fx, self.seed)
+
+    def close(self):
+        pass
+
+
+def prepare_config(config: dict) -> dict:
+    """soak 실행용 설정: 가짜 거래소 세션, 외부 전송/WebSocket/프로세스 분리 없음, 저널은 임시 경로"""
+    soak_config = config.setdefault("soak", {})
+    fx = {
+        region["fiat"]: (region.get("fx") or {}).get("default", 1000.0)
+        for region in get_regions(config).values()
+        if region.get("fiat")
+    }
+    config["session"] = {
+        "mode": "fake",
+        "universe": soak_config.get("universe", 5000),
+        "seed": soak_config.get("seed", 0),
+        "fx": fx,
+    }
+    config.setdefault("sharding", {})["workers"] = 0
+    config.setdefault("telegram", {})["enabled"] = False
+    config.setdefault("depth", {})["enabled"] = False
+    config.setdefault("export", {})["enabled"] = False
+    config.setdefault("tracing", {})["enabled"] = False
+    journal_config = config.setdefault("journal", {})
+    if journal_config.get("enabled", True):
+        journal_config["path"] = os.path.join(tempfile.mkdtemp(prefix="soak-"), "journal.bin")
+    return config
+
+
+def rss_bytes() -> int:
+    """현재 RSS (Linux: /proc, 그 외: 최대 RSS 로 대체)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def cache_sizes(bot) -> dict[str, int]:
+    """프로세스 내 캐시 항목 수"""
+    sizes = {
+        "results": len(bot.last_results),
+        "alert_times": len(bot.last_alert_time),
+    }
+    if bot.premium:
+        sizes["premium_stats"] = len(bot.premium._stats)
+    calculator = bot.calculator
+    validator = getattr(calculator, "_validator", None)
+    if validator is not None:
+        sizes["validator_keys"] = len(validator)
+    engine = getattr(calculator, "_volume_engine", None)
+    if engine is not None:
+        sizes["volume_rings"] = len(engine._rings)
+    if bot.journal:
+        sizes["journal"] = len(bot.journal.snapshots) + len(bot.journal.alerts)
+    if bot.screener:
+        sizes["screener"] = len(bot.screener.rows)
+    return sizes
+
+
+class MemoryProbe:
+    """RSS / tracemalloc 추이 기록 (기준 시점 대비 증가량, 증가 상위 할당 위치)"""
+
+    def __init__(self, frames: int = 1):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.samples: list[tuple[int, int, int]] = []  # (사이클, RSS, traced)
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+
+    def sample(self, cycle: int) -> tuple[int, int, int]:
+        traced, _ = tracemalloc.get_traced_memory()
+        sample = (cycle, rss_bytes(), traced)
+        self.samples.append(sample)
+        return sample
+
+    def mark_baseline(self):
+        self.baseline = tracemalloc.take_snapshot()
+
+    def top_growth(self, n: int = 10) -> list:
+        """기준 시점 대비 증가 상위 할당 위치"""
+        if self.baseline is None:
+            return []
+        # 추적 항목 전체에 필터를 거는 대신 집계된 통계에서 제외 (수백만 할당에서도 빠름)
+        stats = tracemalloc.take_snapshot().compare_to(self.baseline, "lineno")
+        skip = (tracemalloc.__file__, "<frozen importlib._bootstrap>", "<unknown>")
+        return [
+            s for s in stats
+            if s.size_diff > 0 and s.traceback[0].filename not in skip
+        ][:n]
+
+
+async def run_soak(bot, cycles: int, config: Optional[dict] = None, out=None) -> bool:
+    """가짜 거래소로 사이클 반복 -> 메모리 증가가 허용치 이내면 True
+
+    티커 창을 매 사이클 밀어 가며 universe 전체를 순환하므로, 상한 없는 캐시가
+    있으면 티커 수만큼 계속 커진다. 캐시가 상한까지 차는 워밍업(기본: universe 2바퀴)
+    이후 첫 보고 시점을 기준으로 증가량을 본다.
+    """
+    config = config or {}
+    out = out or sys.stdout
+    universe = bot.calculator.session.universe
+    per_cycle = config.get("tickers_per_cycle", 4)
+    report_every = config.get("report_every", 10000)
+    max_growth = config.get("max_growth_mb", 16) * 1024 * 1024
+    warmup = config.get("warmup", 2 * universe // per_cycle)
+    probe = MemoryProbe()
+
+    print(
+        f"\n🧪 soak 시작: {cycles:,}사이클, 자산 {universe:,}개, 사이클당 {per_cycle}개, "
+        f"거래소 {len(enabled_exchanges(bot.config))}곳",
+        file=out,
+    )
+    started = time.monotonic()
+    last_report = started
+    baseline = None
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        for cycle in range(1, cycles + 1):
+            first = (cycle * per_cycle) % universe
+            tickers = [f"{_coin((first + k) % universe)}/USDT" for k in range(per_cycle)]
+            with redirect_stdout(devnull):
+                await bot.run_once(tickers)
+
+            if cycle % report_every == 0 or cycle == cycles:
+                now = time.monotonic()
+                _, rss, traced = probe.sample(cycle)
+                if probe.baseline is None and cycle >= warmup:
+                    probe.mark_baseline()
+                    # 보관한 스냅샷 자체가 차지하는 메모리까지 포함한 뒤 기준 측정
+                    _, rss, traced = baseline = probe.sample(cycle)
+                sizes = " ".join(f"{k}={v}" for k, v in cache_sizes(bot).items())
+                rate = report_every / (now - last_report) if now > last_report else 0
+                last_report = now
+                print(
+                    f"  {cycle:>10,} | {rate:7.0f}/s | RSS {rss / 2**20:7.1f}MiB | "
+                    f"traced {traced / 2**20:7.1f}MiB | {sizes}{' (기준)' if probe.samples[-1] is baseline else ''}",
+                    file=out,
+                )
+
+    if probe.baseline is None or probe.samples[-1] is baseline:
+        print(f"  워밍업({warmup:,}사이클) 이후 보고가 없어 증가량 판정 생략 (--soak 값을 더 크게)", file=out)
+        return True
+
+    _, base_rss, base_traced = baseline
+    _, end_rss, end_traced = probe.samples[-1]
+    print(f"\n  기준 대비 증가: RSS {(end_rss - base_rss) / 2**20:+.1f}MiB, traced {(end_traced - base_traced) / 2**20:+.1f}MiB", file=out)
+    print("  증가 상위 할당 위치:", file=out)
+    for stat in probe.top_growth():
+        print(f"    {stat}", file=out)
+
+    ok = end_traced - base_traced <= max_growth and end_rss - base_rss <= max_growth
+    elapsed = time.monotonic() - started
+    print(f"\n{'✅' if ok else '❌'} soak {'통과' if ok else '실패'} ({elapsed:.0f}초, 허용 증가 {max_growth / 2**20:.0f}MiB)", file=out)
+    return ok
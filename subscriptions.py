@@ -0,0 +1,147 @@
+"""
+Subscriptions Module
+알림 구독자 레지스트리 (티커 역색인 + 임계값 정렬 색인)
+"""
+
+import json
+import logging
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# 모든 티커 구독
+WILDCARD = "*"
+
+# config.yaml alerts / telegram 설정으로 만드는 기본 구독자
+DEFAULT_ID = "default"
+
+
+@dataclass
+class Subscription:
+    """구독자 1명 (데스크/채팅방)"""
+    id: str
+    chat_id: Optional[str] = None     # None: config.yaml telegram.chat_id
+    tickers: list[str] = field(default_factory=lambda: [WILDCARD])
+    korean_dominance_threshold: float = 25.0
+    dominance_change_threshold: float = 5.0
+    cooldown_seconds: float = 300
+
+    def cooldown_key(self, ticker: str) -> str:
+        """알림 시각 저장 키 (기본 구독자는 기존 티커 키 유지)"""
+        return ticker if self.id == DEFAULT_ID else f"{self.id}:{ticker}"
+
+
+class ThresholdIndex:
+    """임계값 오름차순 배열: 값 이상으로 넘긴 구독만 bisect 로 잘라냄"""
+
+    def __init__(self, items: list[tuple[float, Subscription]]):
+        items = sorted(items, key=lambda item: item[0])
+        self._thresholds = [threshold for threshold, _ in items]
+        self._subs = [sub for _, sub in items]
+
+    def matching(self, value: float) -> list[Subscription]:
+        """threshold <= value 인 구독"""
+        return self._subs[:bisect_right(self._thresholds, value)]
+
+
+class SubscriptionRegistry:
+    """JSON 파일 구독 레지스트리
+
+    티커 -> (지배력 임계값 색인, 급변 임계값 색인) 역색인을 미리 만들어 두므로
+    스냅샷 1건 평가 비용은 구독자 수와 무관하게 O(log n + 조건 충족 구독 수).
+    파일이 바뀌면 refresh() 에서 다시 읽는다.
+    """
+
+    def __init__(self, path: Optional[str] = None, default: Optional[Subscription] = None):
+        self.path = Path(path) if path else None
+        self.default = default
+        self.subscriptions: dict[str, Subscription] = {}
+        self._index: dict[str, tuple[ThresholdIndex, ThresholdIndex]] = {}
+        self._wildcard = (ThresholdIndex([]), ThresholdIndex([]))
+        self._mtime: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.subscriptions)
+
+    def load(self):
+        """파일에서 구독 목록 로드 후 색인 재구성"""
+        subscriptions = {}
+        if self.default:
+            subscriptions[self.default.id] = self.default
+        if self.path and self.path.exists():
+            try:
+                # 읽기 전에 기록: 파싱 실패해도 파일이 다시 바뀔 때까지 재시도/경고 반복 안 함
+                self._mtime = self.path.stat().st_mtime
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                for item in data.get("subscribers", []):
+                    sub = Subscription(**item)
+                    subscriptions[sub.id] = sub
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"구독 파일 로드 실패, 이전 목록 유지 ({self.path}): {e}")
+                return
+        self.subscriptions = subscriptions
+        self._build()
+        logger.info(f"알림 구독자 {len(subscriptions)}명")
+
+    def refresh(self):
+        """파일 수정 시각이 바뀌었으면 다시 로드"""
+        if not self.path:
+            return
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.load()
+
+    def _build(self):
+        by_ticker: dict[str, list[Subscription]] = {}
+        wildcard: list[Subscription] = []
+        for sub in self.subscriptions.values():
+            if WILDCARD in sub.tickers:
+                wildcard.append(sub)
+                continue
+            for ticker in sub.tickers:
+                by_ticker.setdefault(_normalize(ticker), []).append(sub)
+
+        def _indexes(subs: list[Subscription]) -> tuple[ThresholdIndex, ThresholdIndex]:
+            return (
+                ThresholdIndex([(s.korean_dominance_threshold, s) for s in subs]),
+                ThresholdIndex([(s.dominance_change_threshold, s) for s in subs]),
+            )
+
+        # 전체 구독은 티커별 색인에도 합쳐서 조회 1번으로 끝나게
+        self._index = {ticker: _indexes(subs + wildcard) for ticker, subs in by_ticker.items()}
+        self._wildcard = _indexes(wildcard)
+
+    def match(self, ticker: str, dominance: float, change: Optional[float]) -> tuple[list[Subscription], list[Subscription]]:
+        """(지배력 임계값 초과 구독, 급변 임계값 초과 구독)"""
+        threshold_index, change_index = self._index.get(ticker, self._wildcard)
+        over = threshold_index.matching(dominance)
+        moved = change_index.matching(abs(change)) if change is not None else []
+        return over, moved
+
+
+def _normalize(ticker: str) -> str:
+    ticker = ticker.strip().upper()
+    return ticker if "/" in ticker else f"{ticker}/USDT"
+
+
+def create_registry(config: dict) -> SubscriptionRegistry:
+    """config 로 레지스트리 생성 (alerts/telegram 설정은 기본 구독자)"""
+    alerts_config = config.get("alerts", {})
+    sub_config = config.get("subscriptions", {})
+    default = None
+    if sub_config.get("include_default", True):
+        default = Subscription(
+            id=DEFAULT_ID,
+            korean_dominance_threshold=alerts_config.get("korean_dominance_threshold", 25.0),
+            dominance_change_threshold=alerts_config.get("dominance_change_threshold", 5.0),
+            cooldown_seconds=alerts_config.get("cooldown_seconds", 300),
+        )
+    registry = SubscriptionRegistry(sub_config.get("path"), default)
+    registry.load()
+    return registry
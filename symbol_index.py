@@ -0,0 +1,75 @@
+"""
+Symbol Index Module
+상장 자산 접두사 검색 인덱스 (자동완성 / 티커 검증)
+"""
+
+from bisect import bisect_left
+from typing import Optional
+
+
+class SymbolIndex:
+    """기초 자산 정렬 배열 + 거래소별 상장 정보
+
+    접두사 검색은 bisect 로 O(log n + k).
+    """
+
+    def __init__(self):
+        self._bases: list[str] = []
+        # base -> {exchange: (market symbol, region)}
+        self._listings: dict[str, dict[str, tuple[str, str]]] = {}
+
+    @classmethod
+    def from_markets(
+        cls,
+        markets: dict[str, dict],
+        exchange_region: dict[str, str],
+        regions: dict[str, dict],
+    ) -> "SymbolIndex":
+        """로드된 마켓 정보로 인덱스 구성 (네트워크 요청 없음)
+
+        법정화폐 지역 거래소는 X/<fiat>, 그 외는 X/USDT 마켓 기준.
+        """
+        index = cls()
+        for exchange, exchange_markets in markets.items():
+            region = exchange_region.get(exchange, "global")
+            quote = regions.get(region, {}).get("fiat") or "USDT"
+            for symbol, market in (exchange_markets or {}).items():
+                if market.get("quote") != quote or not market.get("spot", True):
+                    continue
+                if market.get("active") is False:
+                    continue
+                index._listings.setdefault(market["base"], {})[exchange] = (symbol, region)
+        index._bases = sorted(index._listings)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._bases)
+
+    def __contains__(self, base: str) -> bool:
+        return base.upper() in self._listings
+
+    def complete(self, prefix: str, limit: int = 10) -> list[str]:
+        """접두사로 시작하는 자산 (사전순)"""
+        prefix = prefix.strip().upper().split("/")[0]
+        if not prefix:
+            return []
+        result = []
+        i = bisect_left(self._bases, prefix)
+        while i < len(self._bases) and len(result) < limit and self._bases[i].startswith(prefix):
+            result.append(self._bases[i])
+            i += 1
+        return result
+
+    def venues(self, base: str) -> dict[str, list[str]]:
+        """자산이 상장된 지역별 거래소 목록"""
+        by_region: dict[str, list[str]] = {}
+        for exchange, (_, region) in self._listings.get(base.upper(), {}).items():
+            by_region.setdefault(region, []).append(exchange)
+        return by_region
+
+    def normalize(self, text: str) -> Optional[str]:
+        """입력 -> 조회용 티커 (X/USDT), 상장되지 않았으면 None"""
+        base = text.strip().upper().split("/")[0]
+        if base not in self._listings:
+            return None
+        return f"{base}/USDT"
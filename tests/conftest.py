@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 저장소 루트의 최상위 모듈 import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,72 @@
+import asyncio
+import time
+from bisect import bisect_left
+
+from volume_engine import QuoteVolumeRing, TradeVolumeEngine
+
+
+class FakeTradesClient:
+    """1초마다 체결 1건 (cost 1) 을 돌려주는 fetch_trades"""
+
+    def __init__(self, hours: float, now_ms: int):
+        start = now_ms - int(hours * 3600 * 1000)
+        self.timestamps = list(range(start - start % 1000, now_ms, 1000))
+        self.calls = 0
+
+    async def fetch_trades(self, symbol, since=None, limit=1000):
+        self.calls += 1
+        i = bisect_left(self.timestamps, since or 0)
+        return [
+            {"id": str(ts), "timestamp": ts, "price": 1.0, "amount": 1.0, "cost": 1.0}
+            for ts in self.timestamps[i:i + limit]
+        ]
+
+
+def test_partial_backfill_is_not_reported_as_complete():
+    now_ms = int(time.time() * 1000)
+    client = FakeTradesClient(hours=25, now_ms=now_ms)
+    engine = TradeVolumeEngine(page_limit=1000, max_pages=50)
+    window = 24 * 3600
+
+    # 1회차: 50 페이지 (50,000건) 에서 멈춤 -> 윈도우 미완성
+    asyncio.run(engine.sync(client, "ex", "BTC/USDT", window))
+    assert client.calls == 50
+    assert engine.volume("ex", "BTC/USDT", window) is None
+
+    # 2회차: 커서부터 이어서 끝까지 수집 -> 윈도우 전체 합계
+    asyncio.run(engine.sync(client, "ex", "BTC/USDT", window))
+    volume = engine.volume("ex", "BTC/USDT", window)
+    assert volume is not None
+    assert abs(volume - window) <= 120
+
+
+def test_short_history_is_not_reported_as_complete():
+    now_ms = int(time.time() * 1000)
+    client = FakeTradesClient(hours=1, now_ms=now_ms)
+    engine = TradeVolumeEngine(page_limit=1000, max_pages=50)
+
+    asyncio.run(engine.sync(client, "ex", "BTC/USDT", 24 * 3600))
+    # 수집은 따라잡았지만 첫 체결이 윈도우 시작보다 늦음
+    assert engine.volume("ex", "BTC/USDT", 24 * 3600) is None
+    assert abs(engine.volume("ex", "BTC/USDT", 1800) - 1800) <= 120
+
+
+def test_window_after_ring_wraps():
+    ring = QuoteVolumeRing(bucket_seconds=60, horizon_seconds=600)
+    for minute in range(30):
+        ring.add(minute * 60_000, 1.0)
+    # 링(11 버킷)이 여러 바퀴 돈 뒤에도 윈도우 합계만 (생성 이후 전체가 아님)
+    assert ring.window(600, 29 * 60_000 + 1) == 10.0
+    assert ring.window(300, 29 * 60_000 + 1) == 5.0
+    assert ring.covers(19 * 60_000)
+    assert not ring.covers(18 * 60_000)
+
+
+def test_quiet_market_is_covered_from_backfill_start():
+    now_ms = int(time.time() * 1000)
+    # 10분 동안만 체결 (첫 페이지가 가득 차지 않음) -> 그 이전은 체결 없음으로 집계
+    client = FakeTradesClient(hours=10 / 60, now_ms=now_ms)
+    engine = TradeVolumeEngine(page_limit=1000, max_pages=50)
+
+    asyncio.run(engine.sync(client, "ex", "BTC/USDT", 3600))
+    assert abs(engine.volume("ex", "BTC/USDT", 3600) - 600) <= 120
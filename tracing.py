@@ -0,0 +1,145 @@
+"""
+Tracing Module
+사이클 단계별 지연 시간 span 기록 (Chrome trace JSON, chrome://tracing / Perfetto 에서 열기)
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Optional
+
+# 비활성 시 span() 이 돌려주는 공용 no-op 컨텍스트
+_NOOP = nullcontext()
+
+# 현재 컨텍스트의 루트 trace 가 샘플링되었는지 (asyncio 태스크에 자동 전파)
+_sampled: ContextVar[bool] = ContextVar("trace_sampled", default=False)
+
+_tracer: Optional["Tracer"] = None
+
+
+class Tracer:
+    """Chrome trace 이벤트 기록기
+
+    파일은 JSON 배열 형식으로 이벤트마다 한 줄씩 추가한다 (닫는 ] 는 생략 가능한 형식이라
+    중간에 종료돼도 읽을 수 있음). 같은 파일을 샤딩 워커도 append 로 공유한다.
+    """
+
+    def __init__(self, path: str, sample_rate: float = 1.0, truncate: bool = True):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.pid = os.getpid()
+        self._buffer: list[str] = []
+        self._lock = threading.Lock()
+        self._tids: dict[int, int] = {}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if truncate or not os.path.exists(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("[\n")
+
+    def _tid(self) -> int:
+        """asyncio 태스크별 트랙 (동시 조회 span 이 겹치지 않게)"""
+        try:
+            key = id(asyncio.current_task())
+        except RuntimeError:
+            key = threading.get_ident()
+        tid = self._tids.get(key)
+        if tid is None:
+            if len(self._tids) >= 1024:
+                self._tids.clear()
+            tid = self._tids[key] = len(self._tids) + 1
+        return tid
+
+    def emit(self, name: str, start: float, end: float, tid: int, args: dict):
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": round(start * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": self.pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self._buffer.append(json.dumps(event, ensure_ascii=False, default=str) + ",\n")
+
+    def flush(self):
+        with self._lock:
+            if not self._buffer:
+                return
+            data = "".join(self._buffer)
+            self._buffer.clear()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data)
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "root", "start", "tid", "token")
+
+    def __init__(self, tracer: Tracer, name: str, args: dict, root: bool):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.root = root
+        self.token = None
+
+    def __enter__(self):
+        if self.root:
+            self.token = _sampled.set(True)
+        self.tid = self.tracer._tid()
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer.emit(self.name, self.start, time.time(), self.tid, self.args)
+        if self.token is not None:
+            _sampled.reset(self.token)
+            self.tracer.flush()
+        return False
+
+
+def configure(config: Optional[dict], shared: bool = False):
+    """config 의 tracing 섹션 적용 (shared: 이미 있는 파일에 이어서 기록, 샤딩 워커용)"""
+    global _tracer
+    config = config or {}
+    if not config.get("enabled", False):
+        _tracer = None
+        return
+    _tracer = Tracer(
+        config.get("path", "logs/trace.json"),
+        sample_rate=config.get("sample_rate", 1.0),
+        truncate=not shared,
+    )
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def trace(name: str, **args):
+    """루트 span (샘플링 여부 결정, 하위 span 은 같은 결정을 따름)"""
+    tracer = _tracer
+    if tracer is None or random.random() >= tracer.sample_rate:
+        return _NOOP
+    return _Span(tracer, name, args, root=True)
+
+
+def span(name: str, **args):
+    """하위 span (샘플링된 trace 안에서만 기록)"""
+    tracer = _tracer
+    if tracer is None or not _sampled.get():
+        return _NOOP
+    return _Span(tracer, name, args, root=False)
+
+
+def flush():
+    if _tracer is not None:
+        _tracer.flush()
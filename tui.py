@@ -0,0 +1,379 @@
+"""
+TUI Module
+터미널 대시보드 (정렬 가능한 전체 티커 표, 바뀐 셀만 다시 그림)
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import time
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from dominance import DominanceResult
+from premium import PremiumSnapshot
+
+
+def _width(text: str) -> int:
+    """터미널 표시 폭 (한글 등 전각 문자는 2칸)"""
+    return sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in text)
+
+
+def _fit(text: str, width: int, align: str = "<") -> str:
+    """표시 폭 기준 자르기/채우기"""
+    if _width(text) > width:
+        out, used = [], 0
+        for c in text:
+            w = _width(c)
+            if used + w > width - 1:
+                break
+            out.append(c)
+            used += w
+        text = "".join(out) + "…"
+    pad = " " * (width - _width(text))
+    return text + pad if align == "<" else pad + text
+
+
+def _volume(volume: float) -> str:
+    if volume >= 1_000_000_000:
+        return f"${volume / 1_000_000_000:.2f}B"
+    if volume >= 1_000_000:
+        return f"${volume / 1_000_000:.2f}M"
+    if volume >= 1_000:
+        return f"${volume / 1_000:.2f}K"
+    return f"${volume:.2f}"
+
+
+@dataclass
+class Column:
+    """표 컬럼 (key: 정렬 키)"""
+    key: str
+    title: str
+    width: int
+    align: str = ">"
+
+
+COLUMNS = [
+    Column("ticker", "티커", 14, "<"),
+    Column("dominance", "한국%", 8),
+    Column("change", "변화", 8),
+    Column("korean_volume", "한국 거래량", 12),
+    Column("total_volume", "전체 거래량", 12),
+    Column("premium", "프리미엄", 9),
+    Column("zscore", "z", 7),
+    Column("updated", "갱신", 9),
+]
+
+
+@dataclass
+class TableRow:
+    """티커 1개 행 (정렬 값)"""
+    ticker: str
+    dominance: float
+    change: float
+    korean_volume: float
+    total_volume: float
+    premium: Optional[float]
+    zscore: Optional[float]
+    updated: float
+
+    def cells(self) -> list[str]:
+        return [
+            self.ticker,
+            f"{self.dominance:.2f}%",
+            f"{self.change:+.2f}p",
+            _volume(self.korean_volume),
+            _volume(self.total_volume),
+            f"{self.premium:+.2f}%" if self.premium is not None else "-",
+            f"{self.zscore:+.2f}" if self.zscore is not None else "-",
+            datetime.fromtimestamp(self.updated).strftime("%H:%M:%S"),
+        ]
+
+    def sort_value(self, key: str):
+        value = getattr(self, key)
+        if value is None:
+            return float("-inf")
+        return value
+
+
+class CellRenderer:
+    """이전 프레임과 셀 단위로 비교해 바뀐 셀만 출력 (ANSI 커서 이동)"""
+
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        self._cells: dict[tuple[int, int], str] = {}
+        self._rows = 0
+        self._size: Optional[os.terminal_size] = None
+
+    def render(self, frame: list[list[tuple[int, str]]]) -> int:
+        """frame: 줄별 (열 위치, 텍스트) 목록 -> 출력한 셀 수"""
+        size = shutil.get_terminal_size()
+        chunks = []
+        if size != self._size:
+            # 창 크기가 바뀌면 전체 다시 그림
+            chunks.append("\x1b[2J")
+            self._cells.clear()
+            self._size = size
+
+        cells: dict[tuple[int, int], str] = {}
+        for y, line in enumerate(frame[:size.lines]):
+            for x, text in line:
+                if x >= size.columns:
+                    continue
+                if x + _width(text) > size.columns:
+                    text = _fit(text, size.columns - x)
+                cells[(y, x)] = text
+                if self._cells.get((y, x)) != text:
+                    chunks.append(f"\x1b[{y + 1};{x + 1}H{text}")
+
+        # 사라진 줄 지우기 (프레임 밖 줄 + 이전에 셀이 있었는데 이번엔 빈 줄)
+        drawn = {y for y, _ in cells}
+        cleared = {y for y, _ in self._cells if y not in drawn}
+        cleared.update(range(len(frame), self._rows))
+        for y in sorted(cleared):
+            chunks.append(f"\x1b[{y + 1};1H\x1b[2K")
+
+        self._cells = cells
+        self._rows = min(len(frame), size.lines)
+        if chunks:
+            self.out.write("".join(chunks))
+            self.out.flush()
+        return len(chunks)
+
+    def invalidate(self):
+        self._size = None
+
+    def resized(self) -> bool:
+        return shutil.get_terminal_size() != self._size
+
+
+class KeyReader:
+    """논블로킹 키 입력 (POSIX: termios cbreak, Windows: msvcrt)"""
+
+    def __init__(self):
+        self._saved = None
+        self._fd = None
+
+    def __enter__(self):
+        if sys.platform != "win32" and sys.stdin.isatty():
+            import termios
+            import tty
+
+            self._fd = sys.stdin.fileno()
+            self._saved = termios.tcgetattr(self._fd)
+            tty.setcbreak(self._fd)
+        return self
+
+    def __exit__(self, *exc):
+        if self._saved is not None:
+            import termios
+
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._saved)
+            self._saved = None
+
+    def read(self) -> list[str]:
+        """대기 중인 키 목록 (방향키는 "up"/"down"/"pgup"/"pgdn")"""
+        if sys.platform == "win32":
+            import msvcrt
+
+            keys = []
+            while msvcrt.kbhit():
+                ch = msvcrt.getwch()
+                if ch in ("\x00", "\xe0"):
+                    ch = {"H": "up", "P": "down", "I": "pgup", "Q": "pgdn"}.get(msvcrt.getwch(), "")
+                keys.append(ch)
+            return keys
+
+        if self._fd is None:
+            return []
+        import select
+
+        data = ""
+        while select.select([self._fd], [], [], 0)[0]:
+            chunk = os.read(self._fd, 64)
+            if not chunk:
+                break
+            data += chunk.decode(errors="ignore")
+
+        keys = []
+        escapes = {"\x1b[A": "up", "\x1b[B": "down", "\x1b[5~": "pgup", "\x1b[6~": "pgdn"}
+        i = 0
+        while i < len(data):
+            for seq, name in escapes.items():
+                if data.startswith(seq, i):
+                    keys.append(name)
+                    i += len(seq)
+                    break
+            else:
+                keys.append(data[i])
+                i += 1
+        return keys
+
+
+class TerminalDashboard:
+    """실시간 티커 표
+
+    update() 는 데이터만 교체하고, run() 이 최대 fps 로 화면을 그린다
+    (조회 루프와 분리). 숫자 키로 정렬 컬럼 선택, 같은 키/r 로 방향 전환,
+    j/k·방향키로 한 줄, 스페이스/b·PgDn/PgUp 으로 한 화면 이동, q 로 종료.
+    """
+
+    HEADER_LINES = 3
+    FOOTER_LINES = 1
+
+    def __init__(self, fps: float = 4.0, sort: str = "dominance", out=None):
+        self.fps = max(fps, 0.5)
+        self.sort_key = sort if sort in {c.key for c in COLUMNS} else "dominance"
+        self.reverse = True
+        self.rows: dict[str, TableRow] = {}
+        self.stopped = False
+        self.status = ""
+        self._out = out or sys.stdout
+        self._renderer = CellRenderer(self._out)
+        self._order: list[str] = []
+        self._order_dirty = True
+        self._dirty = True
+        self._offset = 0
+        self._cycle_at = 0.0
+
+    # --- 데이터 ---
+
+    def update(self, result: DominanceResult, premium: PremiumSnapshot = None):
+        """결과 1건 반영 (그리기는 run 루프에서)"""
+        prev = self.rows.get(result.ticker)
+        self.rows[result.ticker] = TableRow(
+            ticker=result.ticker,
+            dominance=result.korean_dominance,
+            change=result.korean_dominance - prev.dominance if prev else 0.0,
+            korean_volume=result.korean_volume_usd,
+            total_volume=result.total_volume_usd,
+            premium=premium.premium if premium else None,
+            zscore=premium.zscore if premium else None,
+            updated=result.timestamp,
+        )
+        self._cycle_at = max(self._cycle_at, result.timestamp)
+        self._order_dirty = True
+        self._dirty = True
+
+    def retain(self, tickers):
+        """이번 사이클 결과에 없는 티커 행 제거 (설정에서 빠졌거나 더 이상 조회되지 않는 티커)"""
+        keep = set(tickers)
+        removed = [ticker for ticker in self.rows if ticker not in keep]
+        for ticker in removed:
+            del self.rows[ticker]
+        if removed:
+            self._order_dirty = True
+            self._dirty = True
+
+    def notify(self, message: str):
+        """상태줄 메시지 (알림 등)"""
+        self.status = f"{datetime.now().strftime('%H:%M:%S')} {message}"
+        self._dirty = True
+
+    # --- 입력 ---
+
+    def handle_key(self, key: str):
+        page = max(self._viewport() - 1, 1)
+        if key == "q":
+            self.stopped = True
+        elif key.isdigit() and 1 <= int(key) <= len(COLUMNS):
+            column = COLUMNS[int(key) - 1].key
+            if column == self.sort_key:
+                self.reverse = not self.reverse
+            else:
+                self.sort_key, self.reverse = column, column != "ticker"
+            self._order_dirty = True
+        elif key == "r":
+            self.reverse = not self.reverse
+            self._order_dirty = True
+        elif key in ("j", "down"):
+            self._offset += 1
+        elif key in ("k", "up"):
+            self._offset -= 1
+        elif key in (" ", "pgdn"):
+            self._offset += page
+        elif key in ("b", "pgup"):
+            self._offset -= page
+        else:
+            return
+        self._dirty = True
+
+    # --- 그리기 ---
+
+    def _viewport(self) -> int:
+        return max(shutil.get_terminal_size().lines - self.HEADER_LINES - self.FOOTER_LINES, 1)
+
+    def _sorted(self) -> list[str]:
+        if self._order_dirty:
+            self._order = sorted(
+                self.rows,
+                key=lambda t: self.rows[t].sort_value(self.sort_key),
+                reverse=self.reverse,
+            )
+            self._order_dirty = False
+        return self._order
+
+    def build_frame(self) -> list[list[tuple[int, str]]]:
+        """현재 상태 -> 줄별 셀 목록"""
+        order = self._sorted()
+        viewport = self._viewport()
+        self._offset = max(0, min(self._offset, len(order) - viewport))
+
+        positions = []
+        x = 1
+        for column in COLUMNS:
+            positions.append(x)
+            x += column.width + 1
+        table_width = x
+
+        cycle = datetime.fromtimestamp(self._cycle_at).strftime("%H:%M:%S") if self._cycle_at else "-"
+        frame = [[(0, _fit(f" CEX DOMINANCE  |  {len(order)}개 티커  |  최근 갱신 {cycle}", table_width))]]
+
+        header = []
+        for i, (column, pos) in enumerate(zip(COLUMNS, positions)):
+            mark = ("▼" if self.reverse else "▲") if column.key == self.sort_key else ""
+            header.append((pos, _fit(f"{i + 1}:{column.title}{mark}", column.width, column.align)))
+        frame.append(header)
+        frame.append([(0, "─" * table_width)])
+
+        for ticker in order[self._offset:self._offset + viewport]:
+            cells = self.rows[ticker].cells()
+            frame.append([
+                (pos, _fit(text, column.width, column.align))
+                for column, pos, text in zip(COLUMNS, positions, cells)
+            ])
+
+        # 상태줄은 화면 맨 아래 고정
+        while len(frame) < self.HEADER_LINES + viewport:
+            frame.append([])
+        shown = f"{self._offset + 1}-{min(self._offset + viewport, len(order))}/{len(order)}" if order else "0/0"
+        footer = f" [{shown}] 1-{len(COLUMNS)} 정렬 r 방향 j/k 이동 space/b 페이지 q 종료  {self.status}"
+        frame.append([(0, _fit(footer, max(table_width, shutil.get_terminal_size().columns)))])
+        return frame
+
+    async def run(self):
+        """최대 fps 로 다시 그리기 (q 또는 stop() 까지)"""
+        interval = 1.0 / self.fps
+        self._out.write("\x1b[?1049h\x1b[?25l")  # 대체 화면, 커서 숨김
+        if sys.platform == "win32":
+            os.system("")  # Windows 콘솔 ANSI 활성화
+        self._renderer.invalidate()
+        try:
+            with KeyReader() as keys:
+                while not self.stopped:
+                    started = time.monotonic()
+                    for key in keys.read():
+                        self.handle_key(key)
+                    if self._dirty or self._renderer.resized():
+                        self._dirty = False
+                        self._renderer.render(self.build_frame())
+                    await asyncio.sleep(max(interval - (time.monotonic() - started), 0))
+        finally:
+            self._out.write("\x1b[?25h\x1b[?1049l")
+            self._out.flush()
+
+    def stop(self):
+        self.stopped = True
@@ -0,0 +1,174 @@
+"""
+Validation Module
+집계 전 거래소별 거래량 이상치 / 자전거래 의심 값 검증
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from dominance import ExchangeVolume
+
+logger = logging.getLogger(__name__)
+
+# MAD -> 표준편차 환산 계수 (정규분포)
+MAD_SCALE = 1.4826
+
+MODES = ("flag", "clamp", "drop")
+
+
+class VolumeValidator:
+    """(거래소, 티커, 기간)별 로그 거래량 분포 추적 + 이상치 처리
+
+    상태는 쌍당 고정 크기 (지수가중 중앙값 추정치, 지수가중 절대편차, 표본 수)
+    numpy 배열 3개에 보관하고, 한 사이클의 거래소 목록을 한 번에 계산한다.
+
+    검사:
+      - 이동 분포 대비 강건 z-score (|log v - 중앙값| / MAD) 가 threshold 초과
+      - 보고된 quoteVolume 과 baseVolume × 현재가 비율이 cross_ratio 배 이상 차이
+    처리 (mode):
+      - flag: 값 유지, 표시만
+      - clamp: 분포 경계 / baseVolume × 현재가 로 보정
+      - drop: 집계에서 제외
+    """
+
+    def __init__(
+        self,
+        mode: str = "flag",
+        threshold: float = 4.0,
+        alpha: float = 0.05,
+        min_samples: int = 10,
+        min_spread: float = 0.25,
+        cross_ratio: float = 3.0,
+        max_keys: int = 20000,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"지원하지 않는 검증 모드: {mode}")
+        self.mode = mode
+        self.threshold = threshold
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.min_spread = min_spread  # 로그 거래량 최소 분산 폭 (작은 변동까지 이상치로 보지 않도록)
+        self.log_cross = np.log(cross_ratio)
+        self.max_keys = max_keys
+
+        # 키 -> 상태 배열 위치 (최근 사용 순, max_keys 초과 시 가장 오래된 키의 위치 재사용)
+        self._index: OrderedDict[tuple[str, str, str], int] = OrderedDict()
+        self._center = np.zeros(64)
+        self._spread = np.zeros(64)
+        self._count = np.zeros(64, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _slots(self, keys: list[tuple[str, str, str]]) -> np.ndarray:
+        """키 -> 상태 배열 위치 (새 키는 배열 끝 또는 밀려난 키 자리에 할당)"""
+        slots = np.empty(len(keys), dtype=np.int64)
+        for i, key in enumerate(keys):
+            slot = self._index.get(key)
+            if slot is not None:
+                self._index.move_to_end(key)
+            elif len(self._index) >= self.max_keys:
+                _, slot = self._index.popitem(last=False)
+                self._index[key] = slot
+                self._count[slot] = 0
+            else:
+                slot = self._index[key] = len(self._index)
+                if slot >= len(self._center):
+                    size = len(self._center) * 2
+                    self._center = np.resize(self._center, size)
+                    self._spread = np.resize(self._spread, size)
+                    self._count = np.resize(self._count, size)
+                self._count[slot] = 0
+            slots[i] = slot
+        return slots
+
+    def validate(
+        self,
+        volumes: list[ExchangeVolume],
+        prices_usd: list[float],
+        period: str = "24h",
+    ) -> list[ExchangeVolume]:
+        """검증 후 집계에 넣을 거래량 목록 (prices_usd: 거래소별 USD 현재가)"""
+        if not volumes:
+            return volumes
+
+        slots = self._slots([(v.exchange, v.ticker, period) for v in volumes])
+        usd = np.array([v.volume_usd for v in volumes], dtype=float)
+        base = np.array([v.base_volume for v in volumes], dtype=float)
+        price = np.asarray(prices_usd, dtype=float)
+
+        # 1) baseVolume × 현재가 교차 검증
+        implied = base * price
+        checkable = (implied > 0) & (usd > 0)
+        log_ratio = np.zeros_like(usd)
+        log_ratio[checkable] = np.log(usd[checkable] / implied[checkable])
+        mismatch = checkable & (np.abs(log_ratio) > self.log_cross)
+
+        # 불일치 값은 baseVolume × 현재가 기준으로 분포 검사
+        x = np.log(np.where(mismatch, implied, usd))
+
+        # 2) 이동 분포 대비 강건 z-score
+        center = self._center[slots]
+        spread = np.maximum(self._spread[slots] * MAD_SCALE, self.min_spread)
+        warm = self._count[slots] >= self.min_samples
+        z = np.where(warm, (x - center) / spread, 0.0)
+        outlier = np.abs(z) > self.threshold
+
+        # 상태 갱신: 이상치는 경계값으로 반영해 분포 오염 방지
+        bounded = np.where(outlier, center + np.sign(z) * self.threshold * spread, x)
+        new = self._count[slots] == 0
+        deviation = np.abs(bounded - center)
+        # 중앙값 추정: 편차 부호 방향으로 분산 폭에 비례해 이동
+        self._center[slots] = np.where(new, bounded, center + self.alpha * spread * np.sign(bounded - center))
+        self._spread[slots] = np.where(new, 0.0, self._spread[slots] + self.alpha * (deviation - self._spread[slots]))
+        self._count[slots] += 1
+
+        if self.mode == "flag":
+            corrected = usd
+        else:
+            corrected = np.exp(bounded)
+
+        result = []
+        for i, v in enumerate(volumes):
+            reasons = []
+            if mismatch[i]:
+                reasons.append(f"base×price 불일치 {np.exp(log_ratio[i]):.2f}x")
+            if outlier[i]:
+                reasons.append(f"z {z[i]:+.1f}")
+            if not reasons:
+                result.append(v)
+                continue
+
+            flag = ", ".join(reasons)
+            logger.warning(
+                f"거래량 이상치 ({v.exchange}/{v.ticker} {period}): "
+                f"${v.volume_usd:,.0f} [{flag}]"
+            )
+            if self.mode == "drop":
+                continue
+            if self.mode == "clamp" and v.volume_usd > 0:
+                scale = corrected[i] / v.volume_usd
+                v.volume_24h *= scale
+                v.volume_usd = float(corrected[i])
+            v.flag = flag
+            result.append(v)
+        return result
+
+
+def create_validator(config: Optional[dict], max_keys: int = 20000) -> Optional[VolumeValidator]:
+    """config 의 validation 섹션으로 검증기 생성 (비활성 시 None)"""
+    config = config or {}
+    if not config.get("enabled", False):
+        return None
+    return VolumeValidator(
+        mode=config.get("mode", "flag"),
+        threshold=config.get("threshold", 4.0),
+        alpha=config.get("alpha", 0.05),
+        min_samples=config.get("min_samples", 10),
+        min_spread=config.get("min_spread", 0.25),
+        cross_ratio=config.get("cross_ratio", 3.0),
+        max_keys=max_keys,
+    )
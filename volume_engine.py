@@ -0,0 +1,236 @@
+"""
+Volume Engine Module
+체결(trade) 기반 거래대금 집계 - 거래소 공통 벽시계 윈도우
+"""
+
+import logging
+import time
+from array import array
+from typing import Awaitable, Callable, Optional
+
+from lru import LRUDict
+
+logger = logging.getLogger(__name__)
+
+# 기간별 윈도우 (초)
+PERIOD_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "1h": 3600,
+    "4h": 4 * 3600,
+    "24h": 24 * 3600,
+    "7d": 7 * 86400,
+    "30d": 30 * 86400,
+}
+
+
+def ring_bytes(bucket_seconds: int, horizon_seconds: int) -> int:
+    """QuoteVolumeRing 1개 버퍼 크기 (버킷당 double 1개)"""
+    return 8 * (horizon_seconds // bucket_seconds + 1)
+
+
+class QuoteVolumeRing:
+    """시간 버킷별 누적 거래대금 링 버퍼
+
+    _cum[b % size] = 버킷 b까지의 누적 거래대금 (prefix sum).
+    윈도우 합계는 두 prefix의 차이로 O(1) 계산. 링이 한 바퀴 돌면 밀려난
+    버킷까지의 누적값을 _base 로 보관한다 (_first 이전 prefix).
+    """
+
+    def __init__(self, bucket_seconds: int = 60, horizon_seconds: int = PERIOD_SECONDS["30d"]):
+        self.bucket_ms = bucket_seconds * 1000
+        self.size = horizon_seconds // bucket_seconds + 1
+        self._cum = array("d", bytes(8 * self.size))
+        self._first: Optional[int] = None  # 집계 시작 버킷
+        self._head: Optional[int] = None   # 최신 버킷
+        self._base = 0.0                   # _first - 1 버킷까지의 누적 거래대금
+
+    def mark_start(self, ts_ms: int):
+        """ts_ms 버킷부터 빠짐없이 집계함을 기록 (체결 반영 전, 백필 시작 시각)"""
+        if self._head is None:
+            self._first = self._head = ts_ms // self.bucket_ms
+            self._cum[self._head % self.size] = 0.0
+
+    def add(self, ts_ms: int, quote: float):
+        """체결 1건 반영"""
+        b = ts_ms // self.bucket_ms
+        if self._head is None:
+            self._first = self._head = b
+            self._cum[b % self.size] = quote
+            return
+
+        if b > self._head:
+            last = self._cum[self._head % self.size]
+            first = max(self._first, b - self.size + 1)
+            if first > self._first:
+                # 밀려나는 버킷의 누적값 보관 (덮어쓰기 전에 읽음)
+                self._base = self._cum_at(first - 1)
+            # 빈 버킷은 직전 누적값으로 채움
+            for i in range(self._head + 1, min(b, self._head + self.size) + 1):
+                self._cum[i % self.size] = last
+            self._head = b
+            self._first = first
+            self._cum[b % self.size] += quote
+        elif b >= self._first:
+            # 늦게 도착한 체결: 해당 버킷부터 최신까지 prefix 보정 (드묾)
+            for i in range(b, self._head + 1):
+                self._cum[i % self.size] += quote
+        # 보존 기간보다 오래된 체결은 무시
+
+    def _cum_at(self, b: int) -> float:
+        if self._head is None:
+            return 0.0
+        if b < self._first:
+            return self._base
+        if b >= self._head:
+            return self._cum[self._head % self.size]
+        return self._cum[b % self.size]
+
+    def covers(self, start_ms: int) -> bool:
+        """start_ms 이후 구간이 모두 집계되어 있는지"""
+        return self._first is not None and self._first <= start_ms // self.bucket_ms
+
+    def window(self, seconds: int, now_ms: Optional[int] = None) -> float:
+        """[now - seconds, now) 구간 거래대금 (완료된 버킷 경계 기준)"""
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        end = now_ms // self.bucket_ms            # 진행 중 버킷 제외
+        start = end - seconds * 1000 // self.bucket_ms
+        return self._cum_at(end - 1) - self._cum_at(start - 1)
+
+
+class TradeVolumeEngine:
+    """(거래소, 심볼)별 체결 거래대금 엔진
+
+    ingest()는 스트림(ccxt.pro watch_trades 등)이나 fetch_trades 페이지
+    어느 쪽에서 온 체결이든 받는다. 윈도우 거래대금은 수집이 해당 윈도우
+    끝까지 따라잡은 뒤에만 돌려준다 (sync() 가 기록, 스트림은 mark_synced()).
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int = 60,
+        horizon_seconds: int = PERIOD_SECONDS["30d"],
+        page_limit: int = 1000,
+        max_pages: int = 50,
+        max_keys: int = 2000,
+    ):
+        self.bucket_seconds = bucket_seconds
+        self.horizon_seconds = horizon_seconds
+        self.page_limit = page_limit
+        self.max_pages = max_pages
+        # (거래소, 심볼) 쌍 수 상한: 조회가 끊긴 쌍부터 버림 (다시 조회하면 백필)
+        self._rings: LRUDict = LRUDict(max_keys)
+        # (마지막 체결 시각, 해당 시각 체결 ID들, 마지막 체결가)
+        self._cursor: LRUDict = LRUDict(max_keys)
+        # 빠짐없이 수집된 마지막 시각 (ms) - 백필이 페이지 한도에서 멈추면 갱신하지 않음
+        self._synced: LRUDict = LRUDict(max_keys)
+
+    def ingest(self, exchange: str, symbol: str, trades: list[dict]) -> int:
+        """체결 목록 반영 (중복 제거) -> 반영 건수"""
+        key = (exchange, symbol)
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = QuoteVolumeRing(self.bucket_seconds, self.horizon_seconds)
+        else:
+            self._rings.move_to_end(key)
+        last_ts, last_ids, last_price = self._cursor.get(key, (0, set(), 0.0))
+
+        added = 0
+        for t in trades:
+            ts = t.get("timestamp")
+            if ts is None or ts < last_ts:
+                continue
+            trade_id = t.get("id")
+            if ts == last_ts and trade_id is not None and trade_id in last_ids:
+                continue
+            quote = t.get("cost")
+            if quote is None:
+                quote = (t.get("amount") or 0) * (t.get("price") or 0)
+            ring.add(ts, quote)
+            added += 1
+
+            if ts > last_ts:
+                last_ts, last_ids = ts, set()
+            if trade_id is not None:
+                last_ids.add(trade_id)
+            last_price = t.get("price") or last_price
+
+        self._cursor[key] = (last_ts, last_ids, last_price)
+        return added
+
+    def volume(self, exchange: str, symbol: str, seconds: int, now_ms: Optional[int] = None) -> Optional[float]:
+        """윈도우 거래대금 (윈도우 전체가 집계되지 않았으면 None)"""
+        key = (exchange, symbol)
+        ring = self._rings.get(key)
+        if ring is None:
+            return None
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        if not ring.covers(now_ms - seconds * 1000):
+            return None
+        # 윈도우 끝 (완료된 버킷 경계) 까지 수집이 따라잡지 못했으면 부분 합계
+        bucket_ms = self.bucket_seconds * 1000
+        if self._synced.get(key, 0) < now_ms // bucket_ms * bucket_ms:
+            return None
+        return ring.window(seconds, now_ms)
+
+    def mark_synced(self, exchange: str, symbol: str, ts_ms: int):
+        """ts_ms 까지 체결을 빠짐없이 반영했음을 기록"""
+        key = (exchange, symbol)
+        if ts_ms > self._synced.get(key, 0):
+            self._synced[key] = ts_ms
+
+    def last_price(self, exchange: str, symbol: str) -> float:
+        return self._cursor.get((exchange, symbol), (0, None, 0.0))[2]
+
+    async def sync(
+        self,
+        client,
+        exchange: str,
+        symbol: str,
+        window_seconds: int,
+        throttle: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> int:
+        """fetch_trades 페이지네이션으로 마지막 커서 이후 체결 수집"""
+        key = (exchange, symbol)
+        now_ms = int(time.time() * 1000)
+        bucket_ms = self.bucket_seconds * 1000
+        backfill = not (key in self._cursor and key in self._rings)
+        if backfill:
+            # 첫 조회: 윈도우 시작 버킷부터 백필 (링/커서 새로 시작)
+            since = (now_ms - window_seconds * 1000) // bucket_ms * bucket_ms - bucket_ms
+            self._rings[key] = QuoteVolumeRing(self.bucket_seconds, self.horizon_seconds)
+            self._cursor.pop(key, None)
+            self._synced.pop(key, None)
+        else:
+            since = self._cursor[key][0]
+
+        total = 0
+        for _ in range(self.max_pages):
+            if throttle:
+                await throttle()
+            trades = await client.fetch_trades(symbol, since=since, limit=self.page_limit)
+            if backfill:
+                backfill = False
+                # 집계 시작 = 백필 since (첫 체결이 늦어도 그 사이는 체결 없음).
+                # 단, 첫 페이지가 가득 찼는데 since 보다 늦게 시작하면 거래소가 since 를
+                # 무시하고 최근 체결만 준 것일 수 있으므로 첫 체결 버킷부터로 본다.
+                first_ts = trades[0].get("timestamp") if trades else None
+                if len(trades) < self.page_limit or (first_ts is not None and first_ts < since + bucket_ms):
+                    self._rings[key].mark_start(since)
+            if not trades:
+                self.mark_synced(exchange, symbol, now_ms)
+                break
+            total += self.ingest(exchange, symbol, trades)
+            newest = trades[-1].get("timestamp") or since
+            if len(trades) < self.page_limit or newest >= now_ms:
+                # 마지막 페이지 (또는 조회 시작 시각 이후 체결까지 도달)
+                self.mark_synced(exchange, symbol, now_ms)
+                break
+            # 같은 ms 체결로 페이지가 가득 차면 1ms 전진
+            since = newest if newest > since else since + 1
+        else:
+            # 다음 사이클에 커서부터 이어서 수집, 그 전까지 윈도우 합계는 미완성
+            logger.debug(f"체결 백필 페이지 한도 도달 ({exchange}/{symbol})")
+        return total